@@ -22,6 +22,7 @@ the classes contained therein.
 
 import collections
 import copy
+import hashlib
 import inspect
 import logging
 import os
@@ -57,24 +58,60 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+# Marks the results of can_access which cover every component.
+_ACCESS_LOADED = '__loaded__'
+
+
+def _access_cache_key(request):
+    """Returns the key of the user's access to the components in the cache.
+
+    The access depends on the user's token, roles, project and on the
+    services available to them. ``None`` is returned when the access
+    isn't cached.
+    """
+    if not getattr(settings, 'NAVIGATION_ACCESS_CACHE_TIMEOUT', 300):
+        return None
+    user = getattr(request, 'user', None)
+    token = getattr(getattr(user, 'token', None), 'id', None)
+    if not token:
+        return None
+    roles = sorted(role['name'] for role in getattr(user, 'roles', None) or [])
+    services = sorted(service.get('type') for service
+                      in getattr(user, 'service_catalog', None) or [])
+    parts = [token, roles, getattr(user, 'project_id', None),
+             getattr(user, 'services_region', None), services]
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return 'horizon.access.%s' % digest
+
+
+def _access_cache():
+    # The settings of Django's cache are read when it is imported, and this
+    # module is imported by settings files.
+    from django.core.cache import cache
+    return cache
+
+
+def _get_access(request):
+    """Returns the results of ``can_access`` known for the request's user.
+
+    They are kept on the request, and are loaded from Django's cache when
+    :meth:`Site.load_access` stored them there for an earlier request.
+    """
+    access = getattr(request, '_horizon_access', None)
+    if access is None:
+        key = _access_cache_key(request)
+        access = (_access_cache().get(key) if key else None) or {}
+        request._horizon_access = access
+    return access
+
+
 def access_cached(func):
     def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
-
+        access = _get_access(context['request'])
         key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        if key not in access:
+            access[key] = bool(func(self, context))
+        return access[key]
     return inner
 
 
@@ -113,15 +150,13 @@ class HorizonComponent(object):
                 urlpatterns = patterns('')
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
+    @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is cached for the user's token, roles,
+        project and services.
         """
         return self.allowed(context)
 
@@ -747,6 +782,29 @@ class Site(Registry, HorizonComponent):
         else:
             return sorted(self._registry.values())
 
+    def load_access(self, context):
+        """Checks the user's access to every dashboard and panel at once.
+
+        The results are stored in Django's cache for
+        ``NAVIGATION_ACCESS_CACHE_TIMEOUT`` seconds, for the user's token,
+        roles, project and services, rather than in the session which may
+        be kept in a cookie. The navigation is then rendered without
+        running the policy checks again on every page.
+        """
+        request = context['request']
+        access = _get_access(request)
+        if access.get(_ACCESS_LOADED):
+            return
+        for dashboard in self.get_dashboards():
+            dashboard.can_access(context)
+            for panel in dashboard.get_panels():
+                panel.can_access(context)
+        access[_ACCESS_LOADED] = True
+        key = _access_cache_key(request)
+        if key:
+            timeout = getattr(settings, 'NAVIGATION_ACCESS_CACHE_TIMEOUT', 300)
+            _access_cache().set(key, access, timeout)
+
     def get_default_dashboard(self):
         """Returns the default :class:`~horizon.Dashboard` instance.
 
@@ -180,6 +180,11 @@ class NotAvailable(HorizonException):
     pass
 
 
+class Timeout(HorizonException):
+    """Exception to be raised when a call does not complete in time."""
+    status_code = 504
+
+
 class WorkflowError(HorizonException):
     """Exception to be raised when something goes wrong in a workflow."""
     pass
@@ -203,7 +208,8 @@ class HandledException(HorizonException):
 UNAUTHORIZED = tuple(HORIZON_CONFIG['exceptions']['unauthorized'])
 UNAUTHORIZED += (NotAuthorized,)
 NOT_FOUND = tuple(HORIZON_CONFIG['exceptions']['not_found'])
-RECOVERABLE = (AlreadyExists, Conflict, NotAvailable, ServiceCatalogException)
+RECOVERABLE = (AlreadyExists, Conflict, NotAvailable, ServiceCatalogException,
+               Timeout)
 RECOVERABLE += tuple(HORIZON_CONFIG['exceptions']['recoverable'])
 
 
@@ -21,102 +21,175 @@ horizon.datatables = {
         $table.removeAttr('decay_constant');
         return;
       }
-      // Trigger the update handlers.
+      // Trigger the update handlers. The rows of each table are coalesced
+      // into a single request; rows which can't be are updated one by one.
+      var requests = [], batches = {};
       $rows_to_update.each(function() {
         var $row = $(this),
-          $table = $row.closest('table.datatable');
-        horizon.ajax.queue({
-          url: $row.attr('data-update-url'),
-          error: function (jqXHR) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var row_count, colspan, template, params;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('th[colspan]').attr('colspan');
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {
-                      "colspan": colspan,
-                      no_items_label: gettext("No items to display.")
-                  };
-                  var empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                // Enable launch action if quota is not exceeded
-                horizon.datatables.update_actions();
-                break;
-              default:
-                console.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
-            }
-          },
-          success: function (data) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('status_unknown')) {
-              var spinner_elm = $new_row.find("td.status_unknown:last");
-              var imagePath = $new_row.find('.btn-action-required').length > 0 ?
-                "dashboard/img/action_required.png":
-                "dashboard/img/loading.gif";
-
-              imagePath = window.STATIC_URL + imagePath;
-              spinner_elm.prepend(
-                $("<div>")
-                  .addClass("loading_gif")
-                  .append($("<img>").attr("src", imagePath)));
-            }
-
-            // Only replace row if the html content has changed
-            if($new_row.html() !== $row.html()) {
-              if($row.find('.table-row-multi-select:checkbox').is(':checked')) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select:checkbox').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-              // Check that quicksearch is enabled for this table
-              // Reset quicksearch's data cache.
-              if ($table.attr('id') in horizon.datatables.qs) {
-                horizon.datatables.qs[$table.attr('id')].cache();
-              }
-            }
-          },
-          complete: function () {
-            // Revalidate the button check for the updated table
-            horizon.datatables.validate_button();
-            rows_to_update--;
-            // Schedule next poll when all the rows are updated
-            if ( rows_to_update === 0 ) {
-              // Set interval decay to this table, and increase if it already exist
-              if(decay_constant === undefined) {
-                decay_constant = 1;
-              } else {
-                decay_constant++;
-              }
-              $table.attr('decay_constant', decay_constant);
-              // Poll until there are no rows in an "unknown" state on the page.
-              var next_poll = interval * decay_constant;
-              // Limit the interval to 30 secs
-              if(next_poll > 30 * 1000) { next_poll = 30 * 1000; }
-              setTimeout(horizon.datatables.update, next_poll);
-            }
+          url = $row.attr('data-update-rows-url');
+        if (url === undefined) {
+          requests.push($row);
+        } else {
+          if (!(url in batches)) {
+            batches[url] = [];
+            requests.push(batches[url]);
           }
-        });
+          batches[url].push($row);
+        }
       });
+      var pending = requests.length;
+      var complete = function () {
+        // Revalidate the button check for the updated table
+        horizon.datatables.validate_button();
+        pending--;
+        // Schedule next poll when all the rows are updated
+        if ( pending === 0 ) {
+          // Set interval decay to this table, and increase if it already exist
+          if(decay_constant === undefined) {
+            decay_constant = 1;
+          } else {
+            decay_constant++;
+          }
+          $table.attr('decay_constant', decay_constant);
+          // Poll until there are no rows in an "unknown" state on the page.
+          var next_poll = interval * decay_constant;
+          // Limit the interval to 30 secs
+          if(next_poll > 30 * 1000) { next_poll = 30 * 1000; }
+          setTimeout(horizon.datatables.update, next_poll);
+        }
+      };
+      $.each(requests, function (index, rows) {
+        if ($.isArray(rows)) {
+          horizon.datatables.update_rows(rows, complete);
+        } else {
+          horizon.datatables.update_row(rows, complete);
+        }
+      });
+    }
+  },
+
+  update_rows: function ($rows, complete) {
+    var obj_ids = $.map($rows, function ($row) {
+      return $row.attr('data-object-id');
+    }), pending_rows;
+    horizon.ajax.queue({
+      url: $rows[0].attr('data-update-rows-url'),
+      data: {obj_id: obj_ids},
+      dataType: 'json',
+      traditional: true,
+      error: function () {
+        // Fall back to updating the rows one at a time.
+        pending_rows = $rows.length;
+        $.each($rows, function (index, $row) {
+          horizon.datatables.update_row($row, function () {
+            pending_rows--;
+            if (pending_rows === 0) { complete(); }
+          });
+        });
+      },
+      success: function (data) {
+        var rows = {};
+        $.each($rows, function (index, $row) {
+          rows[$row.attr('data-object-id')] = $row;
+        });
+        $.each(data.deleted, function (index, obj_id) {
+          if (rows[obj_id] !== undefined) {
+            horizon.datatables.remove_row(rows[obj_id]);
+          }
+        });
+        $.each(data.rows, function (index, html) {
+          var $new_row = $(html),
+            $row = rows[$new_row.attr('data-object-id')];
+          if ($row !== undefined) {
+            horizon.datatables.replace_row($row, $new_row);
+          }
+        });
+        complete();
+      }
+    });
+  },
+
+  update_row: function ($row, complete) {
+    horizon.ajax.queue({
+      url: $row.attr('data-update-url'),
+      error: function (jqXHR) {
+        switch (jqXHR.status) {
+          // A 404 indicates the object is gone, and should be removed from the table
+          case 404:
+            horizon.datatables.remove_row($row);
+            break;
+          default:
+            console.log(gettext("An error occurred while updating."));
+            $row.removeClass("ajax-update");
+            $row.find("i.ajax-updating").remove();
+            break;
+        }
+      },
+      success: function (data) {
+        horizon.datatables.replace_row($row, $(data));
+      },
+      complete: complete
+    });
+  },
+
+  remove_row: function ($row) {
+    var $table = $row.closest('table.datatable');
+    // Update the footer count and reset to default empty row if needed
+    var row_count, colspan, template, params;
+
+    // existing count minus one for the row we're removing
+    row_count = horizon.datatables.update_footer_count($table, -1);
+
+    if(row_count === 0) {
+      colspan = $table.find('th[colspan]').attr('colspan');
+      template = horizon.templates.compiled_templates["#empty_row_template"];
+      params = {
+          "colspan": colspan,
+          no_items_label: gettext("No items to display.")
+      };
+      var empty_row = template.render(params);
+      $row.replaceWith(empty_row);
+    } else {
+      $row.remove();
+    }
+    // Reset tablesorter's data cache.
+    $table.trigger("update");
+    // Enable launch action if quota is not exceeded
+    horizon.datatables.update_actions();
+  },
+
+  replace_row: function ($row, $new_row) {
+    var $table = $row.closest('table.datatable');
+
+    if ($new_row.hasClass('status_unknown')) {
+      var spinner_elm = $new_row.find("td.status_unknown:last");
+      var imagePath = $new_row.find('.btn-action-required').length > 0 ?
+        "dashboard/img/action_required.png":
+        "dashboard/img/loading.gif";
+
+      imagePath = window.STATIC_URL + imagePath;
+      spinner_elm.prepend(
+        $("<div>")
+          .addClass("loading_gif")
+          .append($("<img>").attr("src", imagePath)));
+    }
+
+    // Only replace row if the html content has changed
+    if($new_row.html() !== $row.html()) {
+      if($row.find('.table-row-multi-select:checkbox').is(':checked')) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find('.table-row-multi-select:checkbox').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+      // Check that quicksearch is enabled for this table
+      // Reset quicksearch's data cache.
+      if ($table.attr('id') in horizon.datatables.qs) {
+        horizon.datatables.qs[$table.attr('id')].cache();
+      }
     }
   },
 
@@ -14,6 +14,7 @@
 
 from collections import defaultdict
 from collections import OrderedDict
+import functools
 import logging
 import types
 import warnings
@@ -32,6 +33,7 @@ import six
 from horizon import messages
 from horizon.utils import functions
 from horizon.utils import html
+from horizon.utils import parallel
 
 
 LOG = logging.getLogger(__name__)
@@ -159,7 +161,7 @@ class BaseAction(html.HTMLElement):
         """
         if self.datum is not None:
             bits = (self.table.name,
-                    "row_%s" % self.table.get_object_id(self.datum),
+                    "row_%s" % self.table._cached_object_id(self.datum),
                     "action_%s" % self.name)
         else:
             bits = (self.table.name, "action_%s" % self.name)
@@ -394,7 +396,7 @@ class LinkAction(BaseAction):
             return self.url(datum, **self.kwargs)
         try:
             if datum:
-                obj_id = self.table.get_object_id(datum)
+                obj_id = self.table._cached_object_id(datum)
                 return urlresolvers.reverse(self.url, args=(obj_id,))
             else:
                 return urlresolvers.reverse(self.url)
@@ -649,6 +651,21 @@ class BatchAction(Action):
 
        Optional message for providing an appropriate help text for
        the horizon user.
+
+    .. method:: actions
+
+       Optional. Accepts a list of object ids and performs the action on all
+       of them at once, for APIs which can act on many objects in a single
+       call. When it is defined it is used instead of :meth:`action`, and
+       the objects all fail together if it raises an exception.
+
+    .. attribute:: max_workers
+
+       Optional. The maximum number of objects :meth:`action` is taken on at
+       the same time. ``None`` uses the ``PARALLEL_API_MAX_WORKERS`` setting.
+       Defaults to ``1``: the action is taken on each object right after
+       :meth:`allowed` was called for it, which actions that remember
+       something about the object in :meth:`allowed` rely on.
     """
 
     help_text = _("This action cannot be undone.")
@@ -701,6 +718,7 @@ class BatchAction(Action):
         self.use_action_method = action_methods
 
         self.success_url = kwargs.get('success_url', None)
+        self.max_workers = kwargs.get('max_workers', 1)
         # If setting a default name, don't initialize it too early
         self.verbose_name = kwargs.get('verbose_name', self._get_action_name)
         self.verbose_name_plural = kwargs.get(
@@ -803,10 +821,57 @@ class BatchAction(Action):
         attrs.update({'data-batch-action': 'true'})
         return attrs
 
+    def _take_actions(self, request, obj_ids):
+        """Takes the action on the objects with the given ids.
+
+        Returns what each action raised, or ``None`` where it succeeded.
+        """
+        if not obj_ids:
+            return []
+        if hasattr(self, 'actions'):
+            try:
+                self.actions(request, obj_ids)
+            except Exception as ex:
+                return [ex] * len(obj_ids)
+            return [None] * len(obj_ids)
+        results = parallel.map_parallel(
+            functools.partial(self.action, request), obj_ids,
+            max_workers=self.max_workers)
+        return [result.exception for result in results]
+
     def handle(self, table, request, obj_ids):
         action_success = []
         action_failure = []
         action_not_allowed = []
+
+        def take_actions(items):
+            obj_ids = [datum_id for datum_id, datum, datum_display in items]
+            errors = self._take_actions(request, obj_ids)
+            for (datum_id, datum, datum_display), ex in zip(items, errors):
+                if ex is None:
+                    # Call update to invoke changes if needed
+                    self.update(request, datum)
+                    action_success.append(datum_display)
+                    self.success_ids.append(datum_id)
+                    LOG.info(u'%s: "%s"' %
+                             (self._get_action_name(past=True), datum_display))
+                else:
+                    # Handle the exception but silence it since we'll display
+                    # an aggregate error message later. Otherwise we'd get
+                    # multiple error messages displayed to the user.
+                    action_failure.append(datum_display)
+                    action_description = (
+                        self._get_action_name(past=True).lower(),
+                        datum_display)
+                    LOG.warning(
+                        'Action %(action)s Failed for %(reason)s', {
+                            'action': action_description, 'reason': ex})
+
+        # Actions taken one object after the other may rely on what allowed()
+        # found out about the object, so each is taken right after its check.
+        one_by_one = (not hasattr(self, 'actions') and
+                      parallel.get_max_workers(self.max_workers) == 1)
+        allowed = []
         for datum_id in obj_ids:
             datum = table.get_object_by_id(datum_id)
             datum_display = table.get_object_display(datum) or datum_id
@@ -816,24 +881,11 @@ class BatchAction(Action):
                             (self._get_action_name(past=True).lower(),
                              datum_display))
                 continue
-            try:
-                self.action(request, datum_id)
-                # Call update to invoke changes if needed
-                self.update(request, datum)
-                action_success.append(datum_display)
-                self.success_ids.append(datum_id)
-                LOG.info(u'%s: "%s"' %
-                         (self._get_action_name(past=True), datum_display))
-            except Exception as ex:
-                # Handle the exception but silence it since we'll display
-                # an aggregate error message later. Otherwise we'd get
-                # multiple error messages displayed to the user.
-                action_failure.append(datum_display)
-                action_description = (
-                    self._get_action_name(past=True).lower(), datum_display)
-                LOG.warning(
-                    'Action %(action)s Failed for %(reason)s', {
-                        'action': action_description, 'reason': ex})
+            allowed.append((datum_id, datum, datum_display))
+            if one_by_one:
+                take_actions(allowed)
+                allowed = []
+        take_actions(allowed)
 
         # Begin with success message class, downgrade to info if problems.
         success_message_level = messages.success
@@ -913,9 +965,15 @@ class DeleteAction(BatchAction):
         NOTE: data_type_singular and data_type_plural attributes are bad for
         translations and should be avoided. Please use the action_present and
         action_past methods. This form is kept for legacy.
+
+    .. attribute:: max_workers
+
+        The maximum number of objects deleted at the same time.
+        Defaults to ``None``, the ``PARALLEL_API_MAX_WORKERS`` setting.
     """
 
     name = "delete"
+    max_workers = None
 
     def __init__(self, **kwargs):
         super(DeleteAction, self).__init__(**kwargs)
@@ -14,6 +14,7 @@
 
 import collections
 import copy
+import functools
 import json
 import logging
 from operator import attrgetter
@@ -41,6 +42,7 @@ from horizon import messages
 from horizon.tables.actions import FilterAction  # noqa
 from horizon.tables.actions import LinkAction  # noqa
 from horizon.utils import html
+from horizon.utils import parallel
 
 
 LOG = logging.getLogger(__name__)
@@ -373,7 +375,7 @@ class Column(html.HTMLElement):
         or the return value of the attr:`~horizon.tables.Column.transform`
         method for this column.
         """
-        datum_id = self.table.get_object_id(datum)
+        datum_id = self.table._cached_object_id(datum)
 
         if datum_id in self.table._data_cache[self]:
             return self.table._data_cache[self][datum_id]
@@ -425,7 +427,7 @@ class Column(html.HTMLElement):
             data_type = getattr(datum, data_type_name, None)
             if data_type and (data_type not in self.allowed_data_types):
                 return None
-        obj_id = self.table.get_object_id(datum)
+        obj_id = self.table._cached_object_id(datum)
         if callable(self.link):
             return self.link(datum)
         try:
@@ -467,6 +469,11 @@ class Row(html.HTMLElement):
     object appropriate for consumption by the table (effectively the "get"
     lookup versus the table's "list" lookup).
 
+    All the rows of a table which are waiting for an update are polled with
+    a single request, which is answered by the ``get_data_for_ids`` method.
+    By default it calls ``get_data`` for each row concurrently; override it
+    to fetch the data for all the rows with a single "list" call instead.
+
     The automatic update interval is configurable by setting the key
     ``ajax_poll_interval`` in the ``HORIZON_CONFIG`` dictionary.
     Default: ``2500`` (measured in milliseconds).
@@ -509,6 +516,13 @@ class Row(html.HTMLElement):
         updates. Generally you won't need to change this value.
         Default: ``"row_update"``.
 
+    .. attribute:: ajax_rows_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value.
+        Default: ``"rows_update"``.
+
     .. attribute:: ajax_cell_action_name
 
         String that is used for the query parameter key to request AJAX
@@ -518,6 +532,7 @@ class Row(html.HTMLElement):
     """
     ajax = False
     ajax_action_name = "row_update"
+    ajax_rows_action_name = "rows_update"
     ajax_cell_action_name = "cell_update"
 
     def __init__(self, table, datum=None):
@@ -560,15 +575,17 @@ class Row(html.HTMLElement):
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
             self.attrs['data-update-interval'] = interval
             self.attrs['data-update-url'] = self.get_ajax_update_url()
+            self.attrs['data-update-rows-url'] = (
+                self.get_ajax_rows_update_url())
             self.classes.append("ajax-update")
 
-        self.attrs['data-object-id'] = table.get_object_id(datum)
+        self.attrs['data-object-id'] = table._cached_object_id(datum)
 
         # Add the row's status class and id to the attributes to be rendered.
         self.classes.append(self.status_class)
         id_vals = {"table": self.table.name,
                    "sep": STRING_SEPARATOR,
-                   "id": table.get_object_id(datum)}
+                   "id": table._cached_object_id(datum)}
         self.id = "%(table)s%(sep)srow%(sep)s%(id)s" % id_vals
         self.attrs['id'] = self.id
 
@@ -612,7 +629,15 @@ class Row(html.HTMLElement):
         params = urlencode(collections.OrderedDict([
             ("action", self.ajax_action_name),
             ("table", self.table.name),
-            ("obj_id", self.table.get_object_id(self.datum))
+            ("obj_id", self.table._cached_object_id(self.datum))
+        ]))
+        return "%s?%s" % (table_url, params)
+
+    def get_ajax_rows_update_url(self):
+        table_url = self.table.get_absolute_url()
+        params = urlencode(collections.OrderedDict([
+            ("action", self.ajax_rows_action_name),
+            ("table", self.table.name)
         ]))
         return "%s?%s" % (table_url, params)
 
@@ -628,6 +653,27 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_for_ids(self, request, obj_ids):
+        """Fetches the updated data for the rows with the given object ids.
+
+        Returns a list of data objects; the objects which are not part of it
+        are considered to have been deleted. By default ``get_data`` is
+        called for each of the ids concurrently, and ids for which it raises
+        a "not found" error are left out.
+        """
+        results = parallel.map_parallel(
+            functools.partial(self.get_data, request), obj_ids)
+        data = []
+        for result in results:
+            try:
+                data.append(result.get())
+            except Exception:
+                exc_info = sys.exc_info()
+                error = exceptions.handle(request, ignore=True)
+                if getattr(error, 'status_code', None) != 404:
+                    six.reraise(*exc_info)
+        return data
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -668,10 +714,11 @@ class Cell(html.HTMLElement):
             if row.can_be_selected(datum):
                 widget = forms.CheckboxInput(check_test=lambda value: False)
                 # Convert value to string to avoid accidental type conversion
+                obj_id = table._cached_object_id(datum)
                 data = widget.render('object_ids',
-                                     six.text_type(table.get_object_id(datum)),
+                                     six.text_type(obj_id),
                                      {'class': 'table-row-multi-select'})
-            table._data_cache[column][table.get_object_id(datum)] = data
+            table._data_cache[column][table._cached_object_id(datum)] = data
         elif column.auto == "form_field":
             widget = column.form_field
             if issubclass(widget.__class__, forms.Field):
@@ -679,7 +726,7 @@ class Cell(html.HTMLElement):
 
             widget_name = "%s__%s" % \
                 (column.name,
-                 six.text_type(table.get_object_id(datum)))
+                 six.text_type(table._cached_object_id(datum)))
 
             # Create local copy of attributes, so it don't change column
             # class form_field_attributes
@@ -697,10 +744,10 @@ class Cell(html.HTMLElement):
                 data = widget.render(widget_name,
                                      column.get_data(datum),
                                      form_field_attributes)
-            table._data_cache[column][table.get_object_id(datum)] = data
+            table._data_cache[column][table._cached_object_id(datum)] = data
         elif column.auto == "actions":
             data = table.render_row_actions(datum, pull_right=False)
-            table._data_cache[column][table.get_object_id(datum)] = data
+            table._data_cache[column][table._cached_object_id(datum)] = data
         else:
             data = column.get_data(datum)
             if column.cell_attributes_getter:
@@ -716,7 +763,7 @@ class Cell(html.HTMLElement):
     @property
     def id(self):
         return ("%s__%s" % (self.column.name,
-                six.text_type(self.row.table.get_object_id(self.datum))))
+                six.text_type(self.row.table._cached_object_id(self.datum))))
 
     @property
     def value(self):
@@ -809,7 +856,7 @@ class Cell(html.HTMLElement):
             ("action", self.row.ajax_cell_action_name),
             ("table", column.table.name),
             ("cell_name", column.name),
-            ("obj_id", column.table.get_object_id(self.datum))
+            ("obj_id", column.table._cached_object_id(self.datum))
         ]))
 
         return "%s?%s" % (table_url, params)
@@ -1159,6 +1206,7 @@ class DataTable(object):
     def __init__(self, request, data=None, needs_form_wrapper=None, **kwargs):
         self.request = request
         self.data = data
+        self._object_ids = {}
         self.kwargs = kwargs
         self._needs_form_wrapper = needs_form_wrapper
         self._no_data_message = self._meta.no_data_message
@@ -1324,22 +1372,52 @@ class DataTable(object):
         """
         if not isinstance(lookup, six.text_type):
             lookup = six.text_type(str(lookup), 'utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, six.text_type):
-                obj_id = six.text_type(str(obj_id), 'utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
-        if len(matches) > 1:
-            raise ValueError("Multiple matches were returned for that id: %s."
-                             % matches)
+        matches = self._get_object_index().get(lookup)
+        if not matches:
+            # The data may have been changed in place since it was indexed.
+            self._object_index = None
+            matches = self._get_object_index().get(lookup)
         if not matches:
             raise exceptions.Http302(self.get_absolute_url(),
                                      _('No match returned for the id "%s".')
                                      % lookup)
+        if len(matches) > 1:
+            raise ValueError("Multiple matches were returned for that id: %s."
+                             % matches)
         return matches[0]
 
+    def _get_object_index(self):
+        """Returns the table's data objects by their unicode ids.
+
+        The index is built once for the table's data, so that looking up
+        many objects doesn't go through all the data each time.
+        """
+        index = getattr(self, '_object_index', None)
+        if index is None or index[0] is not self.data:
+            objects = collections.defaultdict(list)
+            for datum in self.data or []:
+                obj_id = self._cached_object_id(datum)
+                if not isinstance(obj_id, six.text_type):
+                    obj_id = six.text_type(str(obj_id), 'utf-8')
+                objects[obj_id].append(datum)
+            index = self._object_index = (self.data, objects)
+        return index[1]
+
+    def _cached_object_id(self, datum):
+        """Returns :meth:`get_object_id` for ``datum``, computed only once.
+
+        Rendering a row needs its object's id for every cell, and
+        :meth:`get_object_id` may be expensive to override.
+        """
+        object_ids = self._object_ids
+        # The object is kept along with its id, so that an object created
+        # after another one was freed can't be mistaken for it.
+        cached = object_ids.get(id(datum))
+        if cached is None or cached[0] is not datum:
+            cached = object_ids[id(datum)] = (datum,
+                                              self.get_object_id(datum))
+        return cached[1]
+
     @property
     def has_actions(self):
         """Boolean. Indicates whether there are any available actions on this
@@ -1438,7 +1516,7 @@ class DataTable(object):
         row_actions_template = template.loader.get_template(template_path)
         bound_actions = self.get_row_actions(datum)
         extra_context = {"row_actions": bound_actions,
-                         "row_id": self.get_object_id(datum),
+                         "row_id": self._cached_object_id(datum),
                          "pull_right": pull_right}
         context = template.RequestContext(self.request, extra_context)
         return row_actions_template.render(context)
@@ -1524,7 +1602,7 @@ class DataTable(object):
             if new_row.ajax and new_row.ajax_action_name == action_name:
                 try:
                     datum = new_row.get_data(request, obj_id)
-                    if self.get_object_id(datum) == self.current_item_id:
+                    if self._cached_object_id(datum) == self.current_item_id:
                         self.selected = True
                         new_row.classes.append('current_selected')
                     new_row.load_cells(datum)
@@ -1537,6 +1615,10 @@ class DataTable(object):
                         return HttpResponse(new_row.render())
                     else:
                         return HttpResponse(status=error.status_code)
+            elif new_row.ajax and new_row.ajax_rows_action_name == action_name:
+                if request.is_ajax():
+                    return self.rows_update_handle(
+                        request, request.GET.getlist('obj_id'), new_row)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1553,6 +1635,36 @@ class DataTable(object):
                             return handled
         return None
 
+    def rows_update_handle(self, request, obj_ids, new_row):
+        """AJAX update handler for several rows.
+
+        Responds with the re-rendered rows and the ids of the objects which
+        no longer exist, as JSON.
+        """
+        try:
+            data = new_row.get_data_for_ids(request, obj_ids)
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return HttpResponse(status=error.status_code)
+        rows = []
+        found = set()
+        for datum in data:
+            datum_id = self._cached_object_id(datum)
+            obj_id = six.text_type(datum_id)
+            if obj_id not in obj_ids or obj_id in found:
+                continue
+            found.add(obj_id)
+            row = self._meta.row_class(self, datum)
+            if datum_id == self.current_item_id:
+                self.selected = True
+                row.classes.append('current_selected')
+            rows.append(row.render())
+        response = {'rows': rows,
+                    'deleted': [obj_id for obj_id in obj_ids
+                                if obj_id not in found]}
+        return HttpResponse(json.dumps(response),
+                            content_type="application/json")
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -1772,7 +1884,7 @@ class DataTable(object):
         try:
             for datum in self.filtered_data:
                 row = self._meta.row_class(self, datum)
-                if self.get_object_id(datum) == self.current_item_id:
+                if self._cached_object_id(datum) == self.current_item_id:
                     self.selected = True
                     row.classes.append('current_selected')
                 rows.append(row)
@@ -104,7 +104,7 @@ class FormsetDataTableMixin(object):
             for column in self.columns.values():
                 value = column.get_data(datum)
                 form_data[column.name] = value
-            form_data['id'] = self.get_object_id(datum)
+            form_data['id'] = self._cached_object_id(datum)
             data.append(form_data)
         return data
 
@@ -140,7 +140,7 @@ class FormsetDataTableMixin(object):
             for datum, form in itertools.izip_longest(self.filtered_data,
                                                       formset):
                 row = self._meta.row_class(self, datum, form)
-                if self.get_object_id(datum) == self.current_item_id:
+                if self._cached_object_id(datum) == self.current_item_id:
                     self.selected = True
                     row.classes.append('current_selected')
                 rows.append(row)
@@ -44,6 +44,27 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
+def _in_nav(component, context):
+    if callable(component.nav):
+        return component.nav(context)
+    return component.nav
+
+
+def _allowed_panel_groups(context, dashboard):
+    """Returns the dashboard's panel groups with the panels to be shown.
+
+    Groups without any panel to show are left out.
+    """
+    groups = []
+    for group in dashboard.get_panel_groups().values():
+        allowed_panels = [panel for panel in group
+                          if _in_nav(panel, context) and
+                          panel.can_access(context)]
+        if allowed_panels:
+            groups.append((group, allowed_panels))
+    return groups
+
+
 @register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
@@ -51,28 +72,14 @@ def horizon_nav(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     current_panel_group = None
     current_panel = context['request'].horizon.get('panel', None)
+    Horizon.load_access(context)
     dashboards = []
     for dash in Horizon.get_dashboards():
-        panel_groups = dash.get_panel_groups()
-        non_empty_groups = []
-        for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                if panel == current_panel:
-                    current_panel_group = group.slug
-            if allowed_panels:
-                non_empty_groups.append((group, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, OrderedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
+        for group in dash.get_panel_groups().values():
+            if current_panel in group:
+                current_panel_group = group.slug
+        if _in_nav(dash, context) and dash.can_access(context):
+            non_empty_groups = _allowed_panel_groups(context, dash)
             dashboards.append((dash, OrderedDict(non_empty_groups)))
     return {'components': dashboards,
             'user': context['request'].user,
@@ -88,13 +95,11 @@ def horizon_main_nav(context):
     if 'request' not in context:
         return {}
     current_dashboard = context['request'].horizon.get('dashboard', None)
-    dashboards = []
-    for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
-            if callable(dash.nav) and dash.nav(context):
-                dashboards.append(dash)
-            elif dash.nav:
-                dashboards.append(dash)
+    Horizon.load_access(context)
+    # Unlike the sidebar, the main nav lists dashboards whose nav is a
+    # callable whatever it returns.
+    dashboards = [dash for dash in Horizon.get_dashboards()
+                  if dash.can_access(context) and dash.nav]
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -107,23 +112,13 @@ def horizon_dashboard_nav(context):
     if 'request' not in context:
         return {}
     dashboard = context['request'].horizon['dashboard']
-    panel_groups = dashboard.get_panel_groups()
+    Horizon.load_access(context)
     non_empty_groups = []
-
-    for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-        if allowed_panels:
-            if group.name is None:
-                non_empty_groups.append((dashboard.name, allowed_panels))
-            else:
-                non_empty_groups.append((group.name, allowed_panels))
+    for group, allowed_panels in _allowed_panel_groups(context, dashboard):
+        if group.name is None:
+            non_empty_groups.append((dashboard.name, allowed_panels))
+        else:
+            non_empty_groups.append((group.name, allowed_panels))
 
     return {'components': OrderedDict(non_empty_groups),
             'user': context['request'].user,
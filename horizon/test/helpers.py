@@ -20,6 +20,7 @@ import django
 import logging
 import os
 import socket
+import threading
 import time
 
 from django.contrib.auth.middleware import AuthenticationMiddleware  # noqa
@@ -28,6 +29,7 @@ from django.contrib.auth.models import User  # noqa
 from django.contrib.contenttypes.models import ContentType  # noqa
 from django.contrib.messages.storage import default_storage  # noqa
 from django.contrib.sessions.backends.base import SessionBase  # noqa
+from django.core.cache import cache
 from django.core.handlers import wsgi
 from django import http
 from django import test as django_test
@@ -67,6 +69,19 @@ from horizon import middleware
 # Makes output of failing mox tests much easier to read.
 wsgi.WSGIRequest.__repr__ = lambda self: "<class 'django.http.HttpRequest'>"
 
+# API calls are made from the worker threads of horizon.utils.parallel, but
+# mox doesn't guard its queues of expected calls against concurrent calls.
+_mox_lock = threading.Lock()
+_verify_method_call = mox.MockMethod._VerifyMethodCall
+
+
+def _locked_verify_method_call(self):
+    with _mox_lock:
+        return _verify_method_call(self)
+
+
+mox.MockMethod._VerifyMethodCall = _locked_verify_method_call
+
 
 class SessionStore(SessionBase):
     """Dict like object for simulating sessions in unittests."""
@@ -128,6 +143,8 @@ class TestCase(django_test.TestCase):
     """
     def setUp(self):
         super(TestCase, self).setUp()
+        # Responses cached across requests must not leak between tests.
+        cache.clear()
         self.mox = mox.Mox()
         self._setup_test_data()
         self._setup_factory()
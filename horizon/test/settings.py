@@ -140,10 +140,23 @@ HORIZON_CONFIG = {
     'help_url': "http://example.com",
 }
 
+# The default cache is cleared before every test, so keep the (expensive to
+# rebuild) compressor output in a cache of its own.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'compressor': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'compressor',
+    },
+}
+
 COMPRESS_ENABLED = True
 COMPRESS_OFFLINE = False
 COMPRESS_ROOT = "/tmp/"
 COMPRESS_PARSER = 'compressor.parser.HtmlParser'
+COMPRESS_CACHE_BACKEND = 'compressor'
 
 STATICFILES_FINDERS = (
     'django.contrib.staticfiles.finders.FileSystemFinder',
@@ -17,11 +17,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from django.conf import settings
 from django.contrib.auth.models import User  # noqa
 from django.core.exceptions import ImproperlyConfigured  # noqa
 from django.core import urlresolvers
+from django.test.utils import override_settings
 from django.utils.importlib import import_module  # noqa
+from mox3 import mox
 from six import moves
 
 import six
@@ -525,3 +529,44 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    def _token_request(self, roles):
+        request = self.factory.get('/')
+        request.user.token = collections.namedtuple('Token', 'id')('token')
+        request.user.roles = [{'name': role} for role in roles]
+        request.user.project_id = 'project'
+        return request
+
+    def test_access_cached_across_requests(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(mox.IsA(dict)).AndReturn(True)
+        RbacYesAccessPanel.allowed(mox.IsA(dict)).AndReturn(False)
+        self.mox.ReplayAll()
+
+        dogs = horizon.get_dashboard("dogs")
+        context = {'request': self._token_request(['member'])}
+        base.Horizon.load_access(context)
+        self.assertTrue(dogs.can_access(context))
+
+        # The policies are not checked again for the same user...
+        context = {'request': self._token_request(['member'])}
+        base.Horizon.load_access(context)
+        self.assertTrue(dogs.can_access(context))
+
+        # ...but they are once the roles change.
+        context = {'request': self._token_request(['member', 'admin'])}
+        base.Horizon.load_access(context)
+        self.assertFalse(dogs.can_access(context))
+
+    @override_settings(NAVIGATION_ACCESS_CACHE_TIMEOUT=0)
+    def test_access_cache_disabled(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(mox.IsA(dict)).AndReturn(True)
+        RbacYesAccessPanel.allowed(mox.IsA(dict)).AndReturn(False)
+        self.mox.ReplayAll()
+
+        dogs = horizon.get_dashboard("dogs")
+        for allowed in (True, False):
+            context = {'request': self._token_request(['member'])}
+            base.Horizon.load_access(context)
+            self.assertEqual(allowed, dogs.can_access(context))
@@ -15,6 +15,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import threading
+import time
+
 from django.core.urlresolvers import reverse
 from django import forms
 from django import http
@@ -24,6 +28,7 @@ from django.template import defaultfilters
 from mox3.mox import IsA  # noqa
 import six
 
+from horizon import exceptions
 from horizon import tables
 from horizon.tables import formset as table_formset
 from horizon.tables import views as table_views
@@ -126,6 +131,13 @@ class MyRow(tables.Row):
         return TEST_DATA_2[0]
 
 
+class MyListRow(tables.Row):
+    ajax = True
+
+    def get_data_for_ids(self, request, obj_ids):
+        return [datum for datum in TEST_DATA if datum.id in obj_ids]
+
+
 class MyBatchAction(tables.BatchAction):
     name = "batch"
     action_present = "Batch"
@@ -165,6 +177,31 @@ class MyToggleAction(tables.BatchAction):
             self.current_past_action = 1
 
 
+class MyRecordingToggleAction(MyToggleAction):
+    name = "record_toggle"
+
+    def action(self, request, object_id):
+        self.taken.append((object_id, self.down))
+
+
+class MyBulkAction(MyBatchAction):
+    name = "bulk"
+    action_present = "Bulk"
+    action_past = "Bulked"
+
+    def actions(self, request, object_ids):
+        pass
+
+
+class MyDeleteAction(tables.DeleteAction):
+    data_type_singular = "Item"
+    data_type_plural = "Items"
+
+    def delete(self, request, obj_id):
+        if obj_id == '2':
+            raise Exception('Expected failure.')
+
+
 class MyDisabledAction(MyToggleAction):
     def allowed(self, request, obj=None):
         return False
@@ -277,6 +314,14 @@ class MyTableSelectable(MyTable):
         multi_select = True
 
 
+class MyTableListRows(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'status')
+        row_class = MyListRow
+        status_columns = ["status"]
+
+
 class MyTableNotAllowedInlineEdit(MyTable):
     name = tables.Column(get_name,
                          verbose_name="Verbose Name",
@@ -325,6 +370,16 @@ class DisabledActionsTable(tables.DataTable):
         multi_select = True
 
 
+class BulkActionsTable(tables.DataTable):
+    id = tables.Column('id')
+    name = tables.Column('name')
+
+    class Meta(object):
+        name = "bulk_actions_table"
+        table_actions = (MyBulkAction, MyDeleteAction)
+        row_actions = (MyRecordingToggleAction,)
+
+
 class DataTableTests(test.TestCase):
     def test_table_instantiation(self):
         """Tests everything that happens when the table is instantiated."""
@@ -613,6 +668,8 @@ class DataTableTests(test.TestCase):
         self.assertContains(resp, 'id="my_table__row__3"', 1)
         update_string = "action=row_update&amp;table=my_table&amp;obj_id="
         self.assertContains(resp, update_string, 4)
+        self.assertContains(resp, 'data-update-rows-url="?action=rows_update'
+                                  '&amp;table=my_table"', 4)
         self.assertContains(resp, "data-update-interval", 4)
         # Verify no table heading
         self.assertNotContains(resp, "<h3 class='table_title'")
@@ -1039,6 +1096,38 @@ class DataTableTests(test.TestCase):
         self.assertEqual("Log In",
                          six.text_type(row_actions[1].verbose_name))
 
+    def test_rows_update(self):
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_id": ["1"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual([], data['deleted'])
+        self.assertEqual(1, len(data['rows']))
+        self.assertIn('my_table__row__1', data['rows'][0])
+        self.assertIn('status_down', data['rows'][0])
+
+        # Objects missing from the data are reported as deleted
+        params['obj_id'] = ["1", "3", "5"]
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTableListRows(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        data = json.loads(resp.content.decode('utf-8'))
+        self.assertEqual(["5"], data['deleted'])
+        self.assertEqual(2, len(data['rows']))
+        self.assertIn('my_table__row__1', data['rows'][0])
+        self.assertIn('my_table__row__3', data['rows'][1])
+
+        # Only AJAX requests are answered
+        req = self.factory.get('/my_url/', params)
+        self.table = MyTableListRows(req)
+        self.assertIsNone(self.table.maybe_preempt())
+
     def test_server_filtering(self):
         filter_value_param = "my_table__filter__q"
         filter_field_param = '%s_field' % filter_value_param
@@ -1273,6 +1362,108 @@ class DataTableTests(test.TestCase):
         self.assertEqual(u"Downed Item: 1",
                          list(req._messages)[0].message)
 
+    def test_batch_action_bulk(self):
+        req = self.factory.post('/my_url/', {
+            'action': 'bulk_actions_table__bulk',
+            'object_ids': ['1', '2', '3']})
+        self.table = BulkActionsTable(req, TEST_DATA)
+        self.mox.StubOutWithMock(self.table.base_actions['bulk'], 'actions')
+        self.table.base_actions['bulk'].actions(req, ['1', '2', '3'])
+        self.mox.ReplayAll()
+
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+        self.assertEqual(u"Bulked Items: object_1, object_2, object_3",
+                         list(req._messages)[0].message)
+
+    def test_batch_action_bulk_failure(self):
+        req = self.factory.post('/my_url/', {
+            'action': 'bulk_actions_table__bulk',
+            'object_ids': ['1', '3']})
+        self.table = BulkActionsTable(req, TEST_DATA)
+        self.mox.StubOutWithMock(self.table.base_actions['bulk'], 'actions')
+        self.table.base_actions['bulk'].actions(req, ['1', '3']) \
+            .AndRaise(Exception('Expected failure.'))
+        self.mox.ReplayAll()
+
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+        self.assertEqual(u"Unable to bulk items: object_1, object_3",
+                         list(req._messages)[0].message)
+
+    def test_delete_action_concurrent(self):
+        threads = []
+        all_started = threading.Condition()
+
+        class ConcurrentDeleteAction(MyDeleteAction):
+            def delete(self, request, obj_id):
+                # Every deletion waits for the others to start, which they
+                # only can if they run at the same time.
+                deadline = time.time() + 5
+                with all_started:
+                    threads.append(threading.current_thread().ident)
+                    all_started.notify_all()
+                    while len(threads) < 3 and time.time() < deadline:
+                        all_started.wait(deadline - time.time())
+                super(ConcurrentDeleteAction, self).delete(request, obj_id)
+
+        class ConcurrentTable(tables.DataTable):
+            id = tables.Column('id')
+            name = tables.Column('name')
+
+            class Meta(object):
+                name = "bulk_actions_table"
+                table_actions = (ConcurrentDeleteAction,)
+
+        req = self.factory.post('/my_url/', {
+            'action': 'bulk_actions_table__delete',
+            'object_ids': ['1', '2', '3']})
+        self.table = ConcurrentTable(req, TEST_DATA)
+
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+        self.assertEqual(3, len(set(threads)))
+        self.assertEqual([u"Unable to delete item: object_2",
+                          u"Deleted Items: object_1, object_3"],
+                         [m.message for m in req._messages])
+
+    def test_batch_action_taken_after_its_check(self):
+        req = self.factory.post('/my_url/', {
+            'action': 'bulk_actions_table__record_toggle',
+            'object_ids': ['1', '2', '3']})
+        self.table = BulkActionsTable(req, TEST_DATA)
+        action = self.table.base_actions['record_toggle']
+        action.taken = []
+
+        self.table.maybe_handle()
+        self.assertEqual([('1', False), ('2', True), ('3', False)],
+                         action.taken)
+
+    def test_get_object_by_id(self):
+        data = list(TEST_DATA)
+        self.table = MyTable(self.request, data)
+        self.assertIs(TEST_DATA[1], self.table.get_object_by_id('2'))
+        self.assertIs(TEST_DATA[1], self.table.get_object_by_id(2))
+
+        # The data can change after it was indexed.
+        data.append(FakeObject('5', 'object_5', 'value_5', 'up'))
+        self.assertIs(data[-1], self.table.get_object_by_id('5'))
+        data.append(FakeObject('5', 'object_5', 'value_5', 'up'))
+        self.table.data = list(data)
+        self.assertRaises(ValueError, self.table.get_object_by_id, '5')
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '6')
+
+    def test_object_ids_computed_once(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.mox.StubOutWithMock(self.table, 'get_object_id')
+        for datum in TEST_DATA:
+            self.table.get_object_id(datum).AndReturn(datum.id)
+        self.mox.ReplayAll()
+
+        self.table.render()
+        self.assertIs(TEST_DATA[2], self.table.get_object_by_id('3'))
+
     def test_table_column_can_be_selected(self):
         self.table = MyTableSelectable(self.request, TEST_DATA_6)
         # non selectable row
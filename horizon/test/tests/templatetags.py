@@ -22,6 +22,7 @@ from django.conf import settings
 from django.template import Context  # noqa
 from django.template import Template  # noqa
 from django.utils.text import normalize_newlines  # noqa
+import mock
 
 from horizon.test import helpers as test
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa
@@ -128,3 +129,13 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def test_horizon_main_nav_callable_nav(self):
+        # A dashboard whose nav is a callable is listed whatever it returns.
+        text = "{% horizon_main_nav %}"
+        with mock.patch.object(Dogs, 'nav', mock.Mock(return_value=False)):
+            rendered_str = self.render_template(
+                tag_require='horizon', template_text=text,
+                context={'request': self.request})
+        self.assertIn('/cats/', rendered_str)
+        self.assertIn('/dogs/', rendered_str)
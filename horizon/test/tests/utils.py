@@ -14,18 +14,26 @@
 
 import datetime
 import os
+import threading
 
+from concurrent import futures
 from django.core.exceptions import ValidationError  # noqa
+from django.core import urlresolvers
 import django.template
 from django.template import defaultfilters
+from django.test import utils as test_utils
+import mock
 
+from horizon import exceptions
 from horizon import forms
 from horizon.test import helpers as test
+from horizon.utils import csvbase
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa
 from horizon.utils import functions
 from horizon.utils import memoized
+from horizon.utils import parallel
 from horizon.utils import secret_key
 from horizon.utils import units
 from horizon.utils import validators
@@ -372,6 +380,183 @@ class MemoizedTests(test.TestCase):
             cache_calls(1)
         self.assertEqual(1, len(values_list))
 
+    def test_memoized_cache_info(self):
+        @memoized.memoized
+        def double(value):
+            return value * 2
+
+        double(1)
+        double(1)
+        double(2)
+        self.assertEqual((1, 2, 0, 2, None), double.cache_info())
+        double.cache_clear()
+        self.assertEqual(0, double.cache_info().size)
+
+    def test_memoized_max_size_evicts_least_recently_used(self):
+        values_list = []
+
+        @memoized.memoized(max_size=2)
+        def cache_calls(value):
+            values_list.append(value)
+            return value
+
+        cache_calls(1)
+        cache_calls(2)
+        cache_calls(1)
+        # 2 is the least recently used, so it is evicted.
+        cache_calls(3)
+        cache_calls(1)
+        cache_calls(2)
+        self.assertEqual([1, 2, 3, 2], values_list)
+        info = cache_calls.cache_info()
+        self.assertEqual(2, info.evictions)
+        self.assertEqual(2, info.size)
+        self.assertEqual(2, info.max_size)
+
+    def test_memoized_timeout(self):
+        values_list = []
+
+        @memoized.memoized(timeout=60)
+        def cache_calls(value):
+            values_list.append(value)
+            return value
+
+        with mock.patch('time.time', return_value=1000):
+            cache_calls(1)
+            cache_calls(1)
+        with mock.patch('time.time', return_value=1061):
+            cache_calls(1)
+        self.assertEqual([1, 1], values_list)
+
+    def test_memoized_removes_entries_of_dead_arguments(self):
+        class Argument(object):
+            pass
+
+        @memoized.memoized
+        def cache_calls(arg):
+            return True
+
+        arg = Argument()
+        cache_calls(arg)
+        self.assertEqual(1, cache_calls.cache_info().size)
+        del arg
+        self.assertEqual(0, cache_calls.cache_info().size)
+
+    def test_memoized_cache_stats(self):
+        @memoized.memoized
+        def stats_calls(value):
+            return value
+
+        stats_calls(1)
+        stats_calls(1)
+        stats = memoized.cache_stats()
+        name = '%s.stats_calls' % __name__
+        self.assertEqual(1, stats[name].hits)
+        self.assertEqual(1, stats[name].misses)
+
+
+class ParallelTests(test.TestCase):
+    def test_call_parallel_collects_values_and_errors(self):
+        def fail():
+            raise exceptions.NotFound('not there')
+
+        results = parallel.call_parallel({'value': lambda: 42,
+                                          'error': fail})
+        self.assertEqual(42, results['value'].get())
+        self.assertFalse(results['value'].failed)
+        self.assertTrue(results['error'].failed)
+        self.assertIsInstance(results['error'].exception, exceptions.NotFound)
+        self.assertRaises(exceptions.NotFound, results['error'].get)
+
+    def test_map_parallel_runs_concurrently_and_keeps_order(self):
+        barrier = threading.Event()
+        started = []
+
+        def call(item):
+            started.append(item)
+            if len(started) == 3:
+                barrier.set()
+            # Only returns if all three calls are running at the same time.
+            barrier.wait(5)
+            return item * 2
+
+        results = parallel.map_parallel(call, [1, 2, 3], max_workers=3)
+        self.assertTrue(barrier.is_set())
+        self.assertEqual([2, 4, 6], [result.get() for result in results])
+
+    def test_map_parallel_single_worker_runs_inline(self):
+        threads = []
+        results = parallel.map_parallel(
+            lambda item: threads.append(threading.current_thread()),
+            [1, 2], max_workers=1)
+        self.assertEqual(2, len(results))
+        self.assertEqual([threading.current_thread()] * 2, threads)
+
+    def test_map_parallel_timeout(self):
+        event = threading.Event()
+        results = parallel.map_parallel(lambda wait: event.wait(wait),
+                                        [0, 5], timeout=0.1, max_workers=2)
+        event.set()
+        self.assertFalse(results[0].failed)
+        self.assertIsInstance(results[1].exception, exceptions.Timeout)
+
+    def test_map_parallel_keeps_script_prefix(self):
+        urlresolvers.set_script_prefix('/dashboard/')
+        try:
+            results = parallel.map_parallel(
+                lambda item: urlresolvers.get_script_prefix(),
+                [1, 2], max_workers=2)
+        finally:
+            urlresolvers.set_script_prefix('/')
+        self.assertEqual(['/dashboard/'] * 2,
+                         [result.get() for result in results])
+
+    def test_submit_to_shared_executor(self):
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        urlresolvers.set_script_prefix('/dashboard/')
+        try:
+            fs = [parallel.submit(executor, urlresolvers.get_script_prefix),
+                  parallel.submit(executor, int, 'x')]
+            results = parallel.wait_for(fs)
+        finally:
+            urlresolvers.set_script_prefix('/')
+            executor.shutdown()
+        self.assertEqual('/dashboard/', results[0].get())
+        self.assertIsInstance(results[1].exception, ValueError)
+
+
+class CsvStreamingTests(test.TestCase):
+    class Renderer(csvbase.BaseCsvStreamingResponse):
+        columns = ['Name', 'Value']
+
+        def get_row_data(self):
+            for i in range(100):
+                yield ('row%02d' % i, i)
+
+    def _render(self, **kwargs):
+        request = self.factory.get('/')
+        return self.Renderer(request, None, {}, 'text/csv', **kwargs)
+
+    def test_rows_are_buffered(self):
+        self.Renderer.buffer_size = 100
+        try:
+            chunks = list(self._render().streaming_content)
+        finally:
+            self.Renderer.buffer_size = None
+        self.assertTrue(1 < len(chunks) < 101)
+        self.assertTrue(all(len(chunk) >= 100 for chunk in chunks[:-1]))
+        content = b''.join(chunks)
+        self.assertNotIn(b'\x00', content)
+        lines = content.decode('utf-8').splitlines()
+        self.assertEqual('Name,Value', lines[0])
+        self.assertEqual(['row%02d,%d' % (i, i) for i in range(100)],
+                         lines[1:])
+
+    @test_utils.override_settings(CSV_STREAMING_BUFFER_SIZE=1024 * 1024)
+    def test_buffer_size_setting(self):
+        chunks = list(self._render(filename='x.csv').streaming_content)
+        self.assertEqual(1, len(chunks))
+
 
 class GetPageSizeTests(test.TestCase):
     def test_bad_session_value(self):
@@ -16,6 +16,7 @@ from csv import DictWriter  # noqa
 from csv import writer  # noqa
 
 
+from django.conf import settings
 from django.http import HttpResponse  # noqa
 from django.http import StreamingHttpResponse  # noqa
 from django import template as django_template
@@ -24,6 +25,9 @@ import six
 from six import StringIO
 
 
+DEFAULT_STREAMING_BUFFER_SIZE = 64 * 1024
+
+
 class CsvDataMixin(object):
 
     """CSV data Mixin - provides handling for CSV data.
@@ -105,7 +109,15 @@ class BaseCsvResponse(CsvDataMixin, HttpResponse):
 
 class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
-    """Base CSV Streaming class. Provides streaming response for CSV data."""
+    """Base CSV Streaming class. Provides streaming response for CSV data.
+
+    .. attribute:: buffer_size
+
+        The number of bytes of CSV data collected before a chunk is sent to
+        the client. Defaults to the ``CSV_STREAMING_BUFFER_SIZE`` setting, or
+        64KB. Optional.
+    """
+    buffer_size = None
 
     def __init__(self, request, template, context, content_type, **kwargs):
         super(BaseCsvStreamingResponse, self).__init__()
@@ -120,13 +132,18 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
             context = django_template.RequestContext(request, self.context)
             self.header = header_template.render(context)
 
+        if self.buffer_size is None:
+            self.buffer_size = getattr(settings, 'CSV_STREAMING_BUFFER_SIZE',
+                                       DEFAULT_STREAMING_BUFFER_SIZE)
+
         self._closable_objects.append(self.out)
 
         self.streaming_content = self.get_content()
 
     def buffer(self):
         buf = self.out.getvalue()
-        self.out.truncate(0)
+        self.out.seek(0)
+        self.out.truncate()
         return buf
 
     def get_content(self):
@@ -134,11 +151,15 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
             self.out.write(self.encode(self.header))
 
         self.write_csv_header()
-        yield self.buffer()
 
         for row in self.get_row_data():
             self.write_csv_row(row)
-            yield self.buffer()
+            if self.out.tell() >= self.buffer_size:
+                yield self.buffer()
+
+        buf = self.buffer()
+        if buf:
+            yield buf
 
     def get_row_data(self):
         return []
@@ -12,7 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
+import threading
+import time
 import warnings
 import weakref
 
@@ -23,6 +26,14 @@ class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
 
 
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'size', 'max_size'])
+
+# Every memoized function, for cache_stats(). Functions which are garbage
+# collected drop out of it on their own.
+_memoized_functions = weakref.WeakSet()
+
+
 def _try_weakref(arg, remove_callback):
     """Return a weak reference to arg if possible, or arg itself if not."""
     try:
@@ -46,7 +57,86 @@ def _get_key(args, kwargs, remove_callback):
     return weak_args, weak_kwargs
 
 
-def memoized(func):
+class _Cache(object):
+    """The cache of a single memoized function.
+
+    It is safe to use from several threads. Entries are kept in the order
+    they were last used, so that the least recently used one is evicted
+    first when ``max_size`` is reached, and expire ``timeout`` seconds after
+    they were stored, if a timeout is given.
+    """
+
+    def __init__(self, max_size=None, timeout=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = self.misses = self.evictions = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # Keys whose weakly referenced arguments died while the cache was in
+        # use. The weakref callback may run at any point, including while
+        # the cache is being changed in the same thread, so they are removed
+        # on the next call instead.
+        self._dead_keys = []
+
+    def discard(self, key):
+        if self._lock.acquire(False):
+            try:
+                self._data.pop(key, None)
+            finally:
+                self._lock.release()
+        else:
+            self._dead_keys.append(key)
+
+    def _purge(self):
+        while self._dead_keys:
+            self._data.pop(self._dead_keys.pop(), None)
+
+    def get(self, key):
+        """Return the cached value for ``key``; raise KeyError if missing."""
+        with self._lock:
+            self._purge()
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            if expires is not None and expires <= time.time():
+                del self._data[key]
+                self.misses += 1
+                raise KeyError(key)
+            if self.max_size is not None:
+                # Move the entry to the end, as the most recently used.
+                del self._data[key]
+                self._data[key] = (value, expires)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires = None
+        if self.timeout is not None:
+            expires = time.time() + self.timeout
+        with self._lock:
+            self._purge()
+            self._data.pop(key, None)
+            self._data[key] = (value, expires)
+            if self.max_size is not None:
+                while len(self._data) > self.max_size:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            del self._dead_keys[:]
+
+    def info(self):
+        with self._lock:
+            self._purge()
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             len(self._data), self.max_size)
+
+
+def memoized(func=None, max_size=None, timeout=None):
     """Decorator that caches function calls.
 
     Caches the decorated function's return value the first time it is called
@@ -55,11 +145,29 @@ def memoized(func):
 
     The cache uses weak references to the passed arguments, so it doesn't keep
     them alive in memory forever.
+
+    Arguments which can't be weakly referenced, such as strings, keep their
+    entry alive for the life of the process. Functions which are called with
+    many of them can bound their cache with ``max_size``, in which case the
+    least recently used entries are evicted, and/or ``timeout``, the number
+    of seconds after which an entry expires::
+
+        @memoized(max_size=100, timeout=60)
+        def get_thing(name):
+            ...
+
+    The decorated function has a ``cache_info()`` method returning its
+    hits, misses, evictions and current size, and a ``cache_clear()``
+    method. :func:`cache_stats` reports on every memoized function.
     """
-    # The dictionary in which all the data will be cached. This is a separate
+    if func is None:
+        return functools.partial(memoized, max_size=max_size,
+                                 timeout=timeout)
+
+    # The cache in which all the data will be stored. This is a separate
     # instance for every decorated function, and it's stored in a closure of
     # the wrapped function.
-    cache = {}
+    cache = _Cache(max_size=max_size, timeout=timeout)
 
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
@@ -70,13 +178,8 @@ def memoized(func):
 
         def remove(ref):
             """A callback to remove outdated items from cache."""
-            try:
-                # The key here is from closure, and is calculated later.
-                del cache[key]
-            except KeyError:
-                # Some other weak reference might have already removed that
-                # key -- in that case we don't need to do anything.
-                pass
+            # The key here is from closure, and is calculated later.
+            cache.discard(key)
 
         key = _get_key(args, kwargs, remove)
         try:
@@ -85,9 +188,10 @@ def memoized(func):
             # happen once and likely calls some external API, database, or
             # some other slow thing. That's why the hit is in straightforward
             # code, and the miss is in an exception.
-            value = cache[key]
+            value = cache.get(key)
         except KeyError:
-            value = cache[key] = func(*args, **kwargs)
+            value = func(*args, **kwargs)
+            cache.set(key, value)
         except TypeError:
             # The calculated key may be unhashable when an unhashable object,
             # such as a list, is passed as one of the arguments. In that case,
@@ -98,9 +202,33 @@ def memoized(func):
                 UnhashableKeyWarning, 2)
             value = func(*args, **kwargs)
         return value
+
+    wrapped.cache_info = cache.info
+    wrapped.cache_clear = cache.clear
+    _memoized_functions.add(wrapped)
     return wrapped
 
 # We can use @memoized for methods now too, because it uses weakref and so
 # it doesn't keep the instances in memory forever. We might want to separate
 # them in the future, however.
 memoized_method = memoized
+
+
+def cache_stats():
+    """Return the :class:`CacheInfo` of every memoized function.
+
+    The result maps the dotted name of each function to its statistics;
+    functions which share a name have theirs added up.
+    """
+    stats = {}
+    for func in list(_memoized_functions):
+        name = '%s.%s' % (func.__module__, func.__name__)
+        info = func.cache_info()
+        if name in stats:
+            other = stats[name]
+            info = info._replace(hits=info.hits + other.hits,
+                                 misses=info.misses + other.misses,
+                                 evictions=info.evictions + other.evictions,
+                                 size=info.size + other.size)
+        stats[name] = info
+    return stats
@@ -0,0 +1,200 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Helpers for running independent blocking calls concurrently.
+
+Views frequently need data from several services whose responses do not
+depend on each other. Calling them one after another makes the page as slow
+as all of the backends added together; fanning them out over a small,
+bounded pool of threads makes it only as slow as the slowest one.
+
+Exceptions raised by a call are captured rather than propagated, so that
+the caller can handle every failure in its own ``try``/``except`` block
+exactly as it would for a serial call::
+
+    results = parallel.call_parallel({
+        'flavors': functools.partial(api.nova.flavor_list, request),
+        'images': functools.partial(api.glance.image_list_detailed, request),
+    })
+    try:
+        flavors = results['flavors'].get()
+    except Exception:
+        flavors = []
+        exceptions.handle(request, ignore=True)
+"""
+
+import sys
+import time
+
+from concurrent import futures
+from django.conf import settings
+from django.core import urlresolvers
+from django.utils import translation
+import six
+
+from horizon import exceptions
+
+
+DEFAULT_MAX_WORKERS = 10
+
+
+class CallResult(object):
+    """The outcome of a single call made through this module."""
+
+    def __init__(self, value=None, exc_info=None):
+        self.value = value
+        self.exc_info = exc_info
+
+    @property
+    def failed(self):
+        return self.exc_info is not None
+
+    @property
+    def exception(self):
+        if self.exc_info is None:
+            return None
+        return self.exc_info[1]
+
+    def get(self):
+        """Return the value of the call, or re-raise what it raised.
+
+        The original traceback is preserved, so the result can be passed
+        straight to :func:`horizon.exceptions.handle`.
+        """
+        if self.exc_info is not None:
+            six.reraise(*self.exc_info)
+        return self.value
+
+
+def get_max_workers(max_workers=None):
+    if max_workers is None:
+        max_workers = getattr(settings, 'PARALLEL_API_MAX_WORKERS',
+                              DEFAULT_MAX_WORKERS)
+    return max(int(max_workers or 1), 1)
+
+
+def get_timeout(timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, 'PARALLEL_API_TIMEOUT', None)
+    return timeout
+
+
+def _call(func, *args, **kwargs):
+    try:
+        return CallResult(value=func(*args, **kwargs))
+    except Exception:
+        return CallResult(exc_info=sys.exc_info())
+
+
+def _timed_out(timeout):
+    try:
+        raise exceptions.Timeout(
+            "Call did not complete within %s seconds." % timeout)
+    except exceptions.Timeout:
+        return CallResult(exc_info=sys.exc_info())
+
+
+def bind_context(func):
+    """Wrap ``func`` so it runs with the calling thread's request context.
+
+    Django keeps the active language, the script prefix and the URLconf in
+    thread-local storage; without them a worker thread would translate
+    strings and reverse URLs as if the site were mounted at ``/``.
+    """
+    language = translation.get_language()
+    script_prefix = urlresolvers.get_script_prefix()
+    urlconf = urlresolvers.get_urlconf()
+
+    def wrapped(*args, **kwargs):
+        old_script_prefix = urlresolvers.get_script_prefix()
+        old_urlconf = urlresolvers.get_urlconf()
+        urlresolvers.set_script_prefix(script_prefix)
+        urlresolvers.set_urlconf(urlconf)
+        try:
+            with translation.override(language):
+                return func(*args, **kwargs)
+        finally:
+            urlresolvers.set_script_prefix(old_script_prefix)
+            urlresolvers.set_urlconf(old_urlconf)
+    return wrapped
+
+
+def submit(executor, func, *args, **kwargs):
+    """Schedule ``func`` on ``executor`` with the request's context bound.
+
+    This is meant for executors shared between requests. The returned future
+    resolves to a :class:`CallResult`, ready to be passed to
+    :func:`wait_for`.
+    """
+    return executor.submit(_call, bind_context(func), *args, **kwargs)
+
+
+def wait_for(fs, timeout=None):
+    """Collect :class:`CallResult` objects from futures running ``_call``.
+
+    Futures which have not finished ``timeout`` seconds after this function
+    is entered are cancelled if possible and reported as having raised
+    :class:`horizon.exceptions.Timeout`.
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    results = []
+    for future in fs:
+        remaining = None
+        if deadline is not None:
+            remaining = max(deadline - time.time(), 0)
+        try:
+            results.append(future.result(timeout=remaining))
+        except futures.TimeoutError:
+            future.cancel()
+            results.append(_timed_out(timeout))
+        except futures.CancelledError:
+            results.append(_timed_out(timeout))
+    return results
+
+
+def map_parallel(func, items, timeout=None, max_workers=None):
+    """Call ``func`` once for every item in ``items`` concurrently.
+
+    At most ``max_workers`` calls (``PARALLEL_API_MAX_WORKERS`` by default)
+    run at the same time. The pool only lives for the duration of this
+    call. When a single worker would do, the calls are simply made inline.
+
+    Returns a list of :class:`CallResult` in the same order as ``items``.
+    """
+    items = list(items)
+    timeout = get_timeout(timeout)
+    workers = min(len(items), get_max_workers(max_workers))
+    if workers <= 1:
+        return [_call(func, item) for item in items]
+
+    func = bind_context(func)
+    executor = futures.ThreadPoolExecutor(max_workers=workers)
+    try:
+        fs = [executor.submit(_call, func, item) for item in items]
+        return wait_for(fs, timeout)
+    finally:
+        # Don't hold the request hostage to calls which have timed out;
+        # their threads finish (and are discarded) in the background.
+        executor.shutdown(wait=False)
+
+
+def call_parallel(calls, timeout=None, max_workers=None):
+    """Run the callables in the ``calls`` dict concurrently.
+
+    Every value of ``calls`` must be callable without arguments (bind them
+    with ``functools.partial``). Returns a dict mapping the same keys to a
+    :class:`CallResult` for each call.
+    """
+    keys = list(calls)
+    results = map_parallel(lambda key: calls[key](), keys,
+                           timeout=timeout, max_workers=max_workers)
+    return dict(zip(keys, results))
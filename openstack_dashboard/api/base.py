@@ -17,9 +17,14 @@
 #    under the License.
 
 from collections import Sequence  # noqa
+import functools
+import hashlib
+import json
 import logging
+import uuid
 
 from django.conf import settings
+from django.core.cache import cache
 
 from horizon import exceptions
 
@@ -355,3 +360,94 @@ def _get_endpoint_region(endpoint):
     both Keystone V2 and V3.
     """
     return endpoint.get('region_id') or endpoint.get('region')
+
+
+def _api_cache_key(*parts):
+    # Region names and arguments may contain characters memcached doesn't
+    # accept in keys, so the key is a digest of all of its parts.
+    data = json.dumps(parts, sort_keys=True, default=repr)
+    digest = hashlib.md5(data.encode('utf-8'))
+    return 'api:%s' % digest.hexdigest()
+
+
+def _api_cache_generation(request, name):
+    """Return the current generation of the cached results of ``name``.
+
+    Invalidating the results of a call replaces its generation, which is
+    part of the key of every entry, whatever project or roles it is scoped
+    to.
+    """
+    key = _api_cache_key('generation', name, request.user.services_region)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def invalidate_api_cache(request, *names):
+    """Discard the cached results of the ``names`` calls in this region."""
+    for name in names:
+        key = _api_cache_key('generation', name,
+                             request.user.services_region)
+        cache.set(key, uuid.uuid4().hex, None)
+
+
+def cached_api_call(name, scope=(), service=None, dump=None, load=None):
+    """Decorator caching the result of an API call across requests.
+
+    The result is kept in Django's cache for ``API_RESPONSE_CACHE_TIMEOUT``
+    seconds, separately for each region and set of arguments. ``scope``
+    lists what else the result depends on: ``'project'`` and/or
+    ``'roles'`` of the user. If ``service`` is given, the result is also
+    kept separately for each endpoint of that service type. Calls which
+    change the result must discard it with :func:`invalidate_api_cache`.
+
+    Cached values must be picklable. ``dump(result)`` converts the result
+    to the data which is cached and ``load(request, data)`` builds the
+    result back from it.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            timeout = getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300)
+            if not timeout:
+                return func(request, *args, **kwargs)
+
+            parts = [name, _api_cache_generation(request, name),
+                     request.user.services_region, args, kwargs]
+            if 'project' in scope:
+                parts.append(request.user.project_id)
+            if 'roles' in scope:
+                parts.append(sorted(role['name']
+                                    for role in request.user.roles))
+            if service:
+                parts.append(url_for(request, service))
+            key = _api_cache_key(*parts)
+
+            data = cache.get(key)
+            if data is not None:
+                return load(request, data) if load else data
+            result = func(request, *args, **kwargs)
+            cache.set(key, dump(result) if dump else result, timeout)
+            return result
+        return wrapped
+    return decorator
+
+
+def dump_resources(resources):
+    """Return the raw data of API client resources, to be cached."""
+    return [resource._info for resource in resources]
+
+
+def resource_loader(get_manager):
+    """Return a function building API client resources from their raw data.
+
+    ``get_manager(request)`` must return the manager of the resources.
+    """
+    def load(request, data):
+        manager = get_manager(request)
+        return [manager.resource_class(manager, info, loaded=True)
+                for info in data]
+    return load
@@ -15,11 +15,13 @@ import logging
 import threading
 
 from ceilometerclient import client as ceilometer_client
+from concurrent import futures
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import keystone
@@ -27,6 +29,9 @@ from openstack_dashboard.api import nova
 
 LOG = logging.getLogger(__name__)
 
+_STATISTICS_EXECUTOR = None
+_STATISTICS_EXECUTOR_LOCK = threading.Lock()
+
 
 def get_flavor_names(request):
     # TODO(lsmola) The flavors can be set per project,
@@ -309,23 +314,36 @@ def statistic_list(request, meter_name, query=None, period=None):
     return [Statistic(s) for s in statistics]
 
 
-class ThreadedUpdateResourceWithStatistics(threading.Thread):
-    """Multithread wrapper for update_with_statistics method of
-    resource_usage.
+def _statistics_executor():
+    """Returns the thread pool all requests fetch statistics with.
+
+    Its size, ``CEILOMETER_STATISTICS_MAX_WORKERS``, bounds the number of
+    threads the statistics of any number of resources can take in a
+    process.
+    """
+    global _STATISTICS_EXECUTOR
+    with _STATISTICS_EXECUTOR_LOCK:
+        if _STATISTICS_EXECUTOR is None:
+            workers = getattr(settings, 'CEILOMETER_STATISTICS_MAX_WORKERS',
+                              parallel.DEFAULT_MAX_WORKERS)
+            _STATISTICS_EXECUTOR = futures.ThreadPoolExecutor(
+                max_workers=max(int(workers or 1), 1))
+    return _STATISTICS_EXECUTOR
 
-    A join logic is placed in process_list class method. All resources
-    will have its statistics attribute filled in separate threads.
 
-    The resource_usage object is shared between threads. Each thread is
-    updating one Resource.
+class ThreadedUpdateResourceWithStatistics(object):
+    """Fills in the statistics of many resources concurrently.
+
+    The statistics of every (resource, meter) pair are fetched on the
+    process wide pool of ``CEILOMETER_STATISTICS_MAX_WORKERS`` threads, see
+    :meth:`CeilometerUsage.update_list_with_statistics`, rather than in a
+    thread per resource.
 
     :Parameters:
-      - `resource`: Resource or ResourceAggregate object, that will
-                    be filled by statistic data.
-      - `resources`: List of Resource or ResourceAggregate object,
-                     that will be filled by statistic data.
       - `resource_usage`: Wrapping resource usage object, that holds
                           all statistics data.
+      - `resources`: List of Resource or ResourceAggregate object,
+                     that will be filled by statistic data.
       - `meter_names`: List of meter names of the statistics we want.
       - `period`: In seconds. If no period is given, only one aggregate
                   statistic is returned. If given, a faceted result will be
@@ -341,40 +359,13 @@ class ThreadedUpdateResourceWithStatistics(threading.Thread):
     # and group-by, so all of this optimization will not be necessary.
     # It is planned somewhere to I.
 
-    def __init__(self, resource_usage, resource, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        super(ThreadedUpdateResourceWithStatistics, self).__init__()
-        self.resource_usage = resource_usage
-        self.resource = resource
-        self.meter_names = meter_names
-        self.period = period
-        self.stats_attr = stats_attr
-        self.additional_query = additional_query
-
-    def run(self):
-        # Run the job
-        self.resource_usage.update_with_statistics(
-            self.resource,
-            meter_names=self.meter_names, period=self.period,
-            stats_attr=self.stats_attr, additional_query=self.additional_query)
-
     @classmethod
     def process_list(cls, resource_usage, resources, meter_names=None,
                      period=None, filter_func=None, stats_attr=None,
                      additional_query=None):
-        threads = []
-
-        for resource in resources:
-            # add statistics data into resource
-            thread = cls(resource_usage, resource, meter_names=meter_names,
-                         period=period, stats_attr=stats_attr,
-                         additional_query=additional_query)
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+        resource_usage.update_list_with_statistics(
+            resources, meter_names=meter_names, period=period,
+            stats_attr=stats_attr, additional_query=additional_query)
 
 
 class CeilometerUsage(object):
@@ -561,6 +552,65 @@ class CeilometerUsage(object):
             raise ValueError("meter_names and resources must be defined to be "
                              "able to obtain the statistics.")
 
+        query = self._statistics_query(resource, additional_query)
+        for meter in meter_names:
+            statistics = statistic_list(self._request, meter,
+                                        query=query, period=period)
+            self._set_statistics(resource, meter, statistics, stats_attr)
+
+        return resource
+
+    def update_list_with_statistics(self, resources, meter_names=None,
+                                    period=None, stats_attr=None,
+                                    additional_query=None, timeout=None):
+        """Adding statistical data into many Resources concurrently.
+
+        The statistics of every meter of every resource are fetched as
+        separate jobs on a thread pool shared by all requests, see
+        :meth:`update_with_statistics` for the parameters. Jobs that have
+        not finished within ``timeout`` seconds (by default
+        ``CEILOMETER_STATISTICS_TIMEOUT``, or ``PARALLEL_API_TIMEOUT``) are
+        cancelled, as are the queued ones if waiting for them is
+        interrupted, and their meters are left empty.
+        """
+        if not meter_names:
+            raise ValueError("meter_names and resources must be defined to be "
+                             "able to obtain the statistics.")
+        if timeout is None:
+            timeout = getattr(settings, 'CEILOMETER_STATISTICS_TIMEOUT', None)
+
+        jobs = []
+        for resource in resources:
+            query = self._statistics_query(resource, additional_query)
+            jobs.extend((resource, meter, query) for meter in meter_names)
+
+        def fetch(meter, query):
+            return statistic_list(self._request, meter,
+                                  query=query, period=period)
+
+        executor = _statistics_executor()
+        fs = [parallel.submit(executor, fetch, meter, query)
+              for resource, meter, query in jobs]
+        try:
+            results = parallel.wait_for(fs, parallel.get_timeout(timeout))
+        finally:
+            # Don't keep the pool busy for a request which stopped waiting.
+            for future in fs:
+                future.cancel()
+
+        for (resource, meter, query), result in zip(jobs, results):
+            if result.failed:
+                LOG.warning("Unable to retrieve statistics of meter %s: %s",
+                            meter, result.exception)
+                statistics = None
+            else:
+                statistics = result.value
+            self._set_statistics(resource, meter, statistics, stats_attr)
+
+        return resources
+
+    @staticmethod
+    def _statistics_query(resource, additional_query=None):
         # query for identifying one resource in meters
         query = resource.query
         if additional_query:
@@ -568,29 +618,22 @@ class CeilometerUsage(object):
                 raise ValueError("Additional query must be list of"
                                  " conditions. See the docs for format.")
             query = query + additional_query
-
-        # TODO(lsmola) thread for each meter will be probably overkill
-        # but I should test lets say thread pool with 100 of threads
-        # and apply it only to this code.
-        # Though I do expect Ceilometer will support bulk requests,
-        # so all of this optimization will not be necessary.
-        for meter in meter_names:
-            statistics = statistic_list(self._request, meter,
-                                        query=query, period=period)
-            meter = meter.replace(".", "_")
-            if statistics:
-                if stats_attr:
-                    # I want to load only a specific attribute
-                    resource.set_meter(
-                        meter,
-                        getattr(statistics[0], stats_attr, None))
-                else:
-                    # I want a dictionary of all statistics
-                    resource.set_meter(meter, statistics)
+        return query
+
+    @staticmethod
+    def _set_statistics(resource, meter, statistics, stats_attr=None):
+        meter = meter.replace(".", "_")
+        if statistics:
+            if stats_attr:
+                # I want to load only a specific attribute
+                resource.set_meter(
+                    meter,
+                    getattr(statistics[0], stats_attr, None))
             else:
-                resource.set_meter(meter, None)
-
-        return resource
+                # I want a dictionary of all statistics
+                resource.set_meter(meter, statistics)
+        else:
+            resource.set_meter(meter, None)
 
     def resources(self, query=None, filter_func=None,
                   with_users_and_tenants=False):
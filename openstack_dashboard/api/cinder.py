@@ -30,6 +30,7 @@ from cinderclient.exceptions import ClientException  # noqa
 from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
+from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
@@ -192,21 +193,59 @@ def volume_list(request, search_opts=None):
     """To see all volumes in the cloud as an admin you can pass in a special
     search option: {'all_tenants': 1}
     """
+    volumes, has_more_data, has_prev_data = volume_list_paged(
+        request, search_opts=search_opts)
+    return volumes
 
-    c_client = cinderclient(request)
-    if c_client is None:
-        return []
 
-    # build a dictionary of volume_id -> transfer
-    transfers = {t.volume_id: t
-                 for t in transfer_list(request, search_opts=search_opts)}
+def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
+                      sort_dir="desc"):
+    """To see all volumes in the cloud as an admin you can pass in a special
+    search option: {'all_tenants': 1}
+
+    With ``paginate`` a single page of volumes, sorted by creation time and
+    starting after ``marker``, is requested from Cinder. Returns a tuple of
+    the volumes and whether there are more and previous pages.
+    """
+    has_more_data = False
+    has_prev_data = False
 
-    volumes = []
-    for v in c_client.volumes.list(search_opts=search_opts):
+    c_client = cinderclient(request)
+    if c_client is None:
+        return [], has_more_data, has_prev_data
+
+    if VERSIONS.active > 1 and paginate:
+        page_size = utils.get_page_size(request)
+        volumes = c_client.volumes.list(search_opts=search_opts,
+                                        limit=page_size + 1,
+                                        marker=marker,
+                                        sort='created_at:' + sort_dir)
+        # first and middle page condition
+        if len(volumes) > page_size:
+            volumes.pop(-1)
+            has_more_data = True
+            # middle page condition
+            if marker is not None:
+                has_prev_data = True
+        # first page condition when reached via prev back
+        elif sort_dir == 'asc' and marker is not None:
+            has_more_data = True
+        # last page condition
+        elif marker is not None:
+            has_prev_data = True
+    else:
+        volumes = c_client.volumes.list(search_opts=search_opts)
+
+    # Only volumes awaiting a transfer can have one, so the transfers are
+    # only listed when there are such volumes.
+    transfers = {}
+    if any(v.status == 'awaiting-transfer' for v in volumes):
+        transfers = {t.volume_id: t
+                     for t in transfer_list(request, search_opts=search_opts)}
+
+    for v in volumes:
         v.transfer = transfers.get(v.id)
-        volumes.append(Volume(v))
-
-    return volumes
+    return [Volume(v) for v in volumes], has_more_data, has_prev_data
 
 
 def volume_get(request, volume_id):
@@ -471,18 +510,27 @@ def default_quota_update(request, **kwargs):
     cinderclient(request).quota_classes.update(DEFAULT_QUOTA_NAME, **kwargs)
 
 
+@base.cached_api_call(
+    'cinder.volume_type_list', scope=('project', 'roles'),
+    dump=base.dump_resources,
+    load=base.resource_loader(
+        lambda request: cinderclient(request).volume_types))
 def volume_type_list(request):
     return cinderclient(request).volume_types.list()
 
 
 def volume_type_create(request, name, description=None):
-    return cinderclient(request).volume_types.create(name, description)
+    volume_type = cinderclient(request).volume_types.create(name, description)
+    base.invalidate_api_cache(request, 'cinder.volume_type_list')
+    return volume_type
 
 
 def volume_type_update(request, volume_type_id, name=None, description=None):
-    return cinderclient(request).volume_types.update(volume_type_id,
-                                                     name,
-                                                     description)
+    volume_type = cinderclient(request).volume_types.update(volume_type_id,
+                                                            name,
+                                                            description)
+    base.invalidate_api_cache(request, 'cinder.volume_type_list')
+    return volume_type
 
 
 def volume_type_default(request):
@@ -490,7 +538,9 @@ def volume_type_default(request):
 
 
 def volume_type_delete(request, volume_type_id):
-    return cinderclient(request).volume_types.delete(volume_type_id)
+    result = cinderclient(request).volume_types.delete(volume_type_id)
+    base.invalidate_api_cache(request, 'cinder.volume_type_list')
+    return result
 
 
 def volume_type_get(request, volume_type_id):
@@ -527,12 +577,16 @@ def volume_type_extra_set(request, type_id, metadata):
     vol_type = volume_type_get(request, type_id)
     if not metadata:
         return None
-    return vol_type.set_keys(metadata)
+    extras = vol_type.set_keys(metadata)
+    base.invalidate_api_cache(request, 'cinder.volume_type_list')
+    return extras
 
 
 def volume_type_extra_delete(request, type_id, keys):
     vol_type = volume_type_get(request, type_id)
-    return vol_type.unset_keys([keys])
+    result = vol_type.unset_keys([keys])
+    base.invalidate_api_cache(request, 'cinder.volume_type_list')
+    return result
 
 
 def qos_spec_list(request):
@@ -604,11 +658,22 @@ def service_list(request):
     return cinderclient(request).services.list()
 
 
+@base.cached_api_call(
+    'cinder.availability_zone_list', scope=('roles',),
+    dump=base.dump_resources,
+    load=base.resource_loader(
+        lambda request: cinderclient(request).availability_zones))
 def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
 @memoized
+@base.cached_api_call(
+    'cinder.list_extensions', scope=('roles',),
+    dump=base.dump_resources,
+    load=base.resource_loader(
+        lambda request: cinder_list_extensions.ListExtManager(
+            cinderclient(request))))
 def list_extensions(request):
     return cinder_list_extensions.ListExtManager(cinderclient(request))\
         .show_all()
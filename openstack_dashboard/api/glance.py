@@ -19,29 +19,49 @@
 from __future__ import absolute_import
 
 import collections
+import functools
 import itertools
 import json
 import logging
 import os
+import threading
+import time
+import uuid
 
 
+from concurrent import futures
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.utils.translation import ugettext_lazy as _
 
 
 import glanceclient as glance_client
-from six.moves import _thread as thread
+from glanceclient import exc as glance_exceptions
+import six
 
+from horizon import exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 from openstack_dashboard.api import base
 
 
 LOG = logging.getLogger(__name__)
 VERSIONS = base.APIVersionManager("image", preferred_version=2)
 
+DEFAULT_UPLOAD_MAX_WORKERS = 4
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# How often (in seconds) the progress of an upload is recorded, and for how
+# long the last record is kept.
+UPLOAD_PROGRESS_INTERVAL = 1
+UPLOAD_PROGRESS_TIMEOUT = 3600
+
+_UPLOAD_EXECUTOR = None
+_UPLOAD_SLOTS = None
+_UPLOAD_EXECUTOR_LOCK = threading.Lock()
+
 
 @memoized
 def glanceclient(request, version='1'):
@@ -52,7 +72,47 @@ def glanceclient(request, version='1'):
                                 insecure=insecure, cacert=cacert)
 
 
+def _image_generation_key(request, image_id):
+    return 'glance:image-generation:%s:%s' % (base.url_for(request, 'image'),
+                                              image_id)
+
+
+def _image_cache_generations(request, image_ids):
+    """Returns a dict mapping image IDs to the current generation of their
+    cached details.
+
+    The details are cached per project, since projects don't see the same
+    images. Clearing an image replaces its generation, which is part of the
+    key of the details cached for every project.
+    """
+    keys = dict((_image_generation_key(request, image_id), image_id)
+                for image_id in image_ids)
+    cached = cache.get_many(list(keys))
+    generations = {}
+    for key, image_id in keys.items():
+        generation = cached.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not cache.add(key, generation, None):
+                generation = cache.get(key, generation)
+        generations[image_id] = generation
+    return generations
+
+
+def _image_cache_key(request, image_id, generation):
+    return 'glance:image:%s:%s:%s:%s' % (base.url_for(request, 'image'),
+                                         request.user.tenant_id, image_id,
+                                         generation)
+
+
+def _image_cache_clear(request, image_id):
+    cache.set(_image_generation_key(request, image_id), uuid.uuid4().hex,
+              None)
+    base.invalidate_api_cache(request, 'glance.public_images')
+
+
 def image_delete(request, image_id):
+    _image_cache_clear(request, image_id)
     return glanceclient(request).images.delete(image_id)
 
 
@@ -107,7 +167,75 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
     return (images, has_more_data, has_prev_data)
 
 
+@base.cached_api_call(
+    'glance.public_images',
+    scope=('roles',),
+    service='image',
+    dump=base.dump_resources,
+    load=base.resource_loader(lambda request: glanceclient(request).images))
+def public_image_list_detailed(request, filters=None):
+    """Returns the public images matching ``filters``.
+
+    The images are the same for every project, so the list is cached across
+    requests, see ``API_RESPONSE_CACHE_TIMEOUT``. It is cached per set of
+    roles, as Glance may hide image properties from some roles.
+    """
+    filters = dict(filters or {}, is_public=True)
+    images, _more, _prev = image_list_detailed(request, filters=filters)
+    return images
+
+
+def image_get_by_ids(request, image_ids):
+    """Returns a dict mapping the given image IDs to their images.
+
+    Rather than listing every image visible to the project, only the
+    requested images are fetched from Glance (concurrently, since the v1 API
+    has no way to filter a listing by ID). Their details are remembered in
+    the shared cache for ``IMAGE_CACHE_TIMEOUT`` seconds, so rendering the
+    next page of instances usually needs no Glance call at all. Images
+    which no longer exist are left out of the result.
+    """
+    generations = _image_cache_generations(
+        request, set(image_id for image_id in image_ids if image_id))
+    keys = dict((_image_cache_key(request, image_id, generation), image_id)
+                for image_id, generation in generations.items())
+    cached = cache.get_many(list(keys))
+    images = {}
+    missing = []
+    for key, image_id in keys.items():
+        if key not in cached:
+            missing.append(image_id)
+        elif cached[key]:
+            images[image_id] = base.APIDictWrapper(cached[key])
+
+    results = parallel.map_parallel(functools.partial(image_get, request),
+                                    missing)
+    fetched = {}
+    failures = []
+    for image_id, result in zip(missing, results):
+        key = _image_cache_key(request, image_id, generations[image_id])
+        if not result.failed:
+            info = result.value.to_dict()
+            info.setdefault('name', None)
+            images[image_id] = base.APIDictWrapper(info)
+            fetched[key] = info
+        elif isinstance(result.exception, glance_exceptions.HTTPNotFound):
+            # Remember deleted images too, so we don't ask for them again.
+            fetched[key] = {}
+        else:
+            failures.append(result)
+    if fetched:
+        cache.set_many(fetched, getattr(settings, 'IMAGE_CACHE_TIMEOUT', 300))
+    if failures:
+        if not images:
+            failures[0].get()
+        LOG.warning('Unable to retrieve %d of %d images: %s',
+                    len(failures), len(keys), failures[0].exception)
+    return images
+
+
 def image_update(request, image_id, **kwargs):
+    _image_cache_clear(request, image_id)
     image_data = kwargs.get('data', None)
     try:
         return glanceclient(request).images.update(image_id, **kwargs)
@@ -125,6 +253,98 @@ def image_update(request, image_id, **kwargs):
                 LOG.warn(msg)
 
 
+def _upload_executor():
+    """Returns the thread pool image data is uploaded to Glance with, and
+    the semaphore counting its free workers.
+
+    ``IMAGE_UPLOAD_MAX_WORKERS`` bounds the number of uploads a process runs
+    at the same time; further uploads are refused rather than queued, as
+    each of them holds on to a possibly very large file.
+    """
+    global _UPLOAD_EXECUTOR, _UPLOAD_SLOTS
+    with _UPLOAD_EXECUTOR_LOCK:
+        if _UPLOAD_EXECUTOR is None:
+            workers = getattr(settings, 'IMAGE_UPLOAD_MAX_WORKERS',
+                              DEFAULT_UPLOAD_MAX_WORKERS)
+            workers = max(int(workers or 1), 1)
+            _UPLOAD_EXECUTOR = futures.ThreadPoolExecutor(max_workers=workers)
+            _UPLOAD_SLOTS = threading.BoundedSemaphore(workers)
+    return _UPLOAD_EXECUTOR, _UPLOAD_SLOTS
+
+
+def _upload_progress_key(image_id):
+    return 'glance:upload:%s' % image_id
+
+
+def _set_upload_progress(image_id, status, transferred, size):
+    cache.set(_upload_progress_key(image_id),
+              {'status': status, 'transferred': transferred, 'size': size},
+              UPLOAD_PROGRESS_TIMEOUT)
+
+
+def image_upload_progress(image_id):
+    """Returns the progress of an upload started by :func:`image_create`.
+
+    The result is a dict with the ``status`` of the upload (``'queued'``,
+    ``'uploading'``, ``'finished'`` or ``'failed'``) and the number of bytes
+    ``transferred`` out of its ``size``, or ``None`` if this dashboard has
+    no record of an upload of the image.
+    """
+    return cache.get(_upload_progress_key(image_id))
+
+
+class _UploadProgressFile(object):
+    """Wraps uploaded image data to record how much of it has been read.
+
+    Glance client reads the data in chunks; none of them is larger than
+    ``UPLOAD_CHUNK_SIZE``.
+    """
+
+    def __init__(self, image_id, data):
+        self.image_id = image_id
+        self.data = data
+        self.transferred = 0
+        self._recorded = time.time()
+
+    @property
+    def file(self):
+        return self.data.file
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > UPLOAD_CHUNK_SIZE:
+            size = UPLOAD_CHUNK_SIZE
+        chunk = self.data.read(size)
+        self.transferred += len(chunk)
+        now = time.time()
+        if now - self._recorded >= UPLOAD_PROGRESS_INTERVAL:
+            self._recorded = now
+            _set_upload_progress(self.image_id, 'uploading',
+                                 self.transferred, self.data.size)
+        return chunk
+
+    def seek(self, *args):
+        return self.data.seek(*args)
+
+    def tell(self):
+        return self.data.tell()
+
+
+def _upload_image_data(request, image_id, data, slots):
+    progress = _UploadProgressFile(image_id, data)
+    try:
+        _set_upload_progress(image_id, 'uploading', 0, data.size)
+        image_update(request, image_id, data=progress, purge_props=False)
+    except Exception:
+        LOG.exception("Failed to upload the data of image %s", image_id)
+        _set_upload_progress(image_id, 'failed', progress.transferred,
+                             data.size)
+    else:
+        _set_upload_progress(image_id, 'finished', progress.transferred,
+                             data.size)
+    finally:
+        slots.release()
+
+
 def image_create(request, **kwargs):
     """Create image.
 
@@ -139,32 +359,48 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a seperate thread.
+    some time and is handed off to a worker thread; its progress can be
+    followed with :func:`image_upload_progress`. If all workers are busy,
+    :class:`horizon.exceptions.NotAvailable` is raised before the image is
+    created.
     """
     data = kwargs.pop('data', None)
 
-    image = glanceclient(request).images.create(**kwargs)
+    if data:
+        executor, slots = _upload_executor()
+        if not slots.acquire(False):
+            raise exceptions.NotAvailable(
+                _("Too many images are being uploaded at the moment. "
+                  "Please try again later."))
+
+    try:
+        image = glanceclient(request).images.create(**kwargs)
+    except Exception:
+        if data:
+            slots.release()
+        raise
+    base.invalidate_api_cache(request, 'glance.public_images')
 
     if data:
         if isinstance(data, TemporaryUploadedFile):
             # Hack to fool Django, so we can keep file open in the new thread.
             data.file.close_called = True
         if isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
-        thread.start_new_thread(image_update,
-                                (request, image.id),
-                                {'data': data,
-                                 'purge_props': False})
+            # Django closes the uploaded file when the request ends: move
+            # its buffer to a new file object, instead of copying it.
+            data_file, data.file = data.file, six.BytesIO()
+            data = InMemoryUploadedFile(data_file, data.field_name,
+                                        data.name, data.content_type,
+                                        data.size, data.charset)
+        _set_upload_progress(image.id, 'queued', 0, data.size)
+        executor.submit(_upload_image_data, request, image.id, data, slots)
 
     return image
 
 
 def image_update_properties(request, image_id, remove_props=None, **kwargs):
     """Add or update a custom property of an image."""
+    _image_cache_clear(request, image_id)
     return glanceclient(request, '2').images.update(image_id,
                                                     remove_props,
                                                     **kwargs)
@@ -172,6 +408,7 @@ def image_update_properties(request, image_id, remove_props=None, **kwargs):
 
 def image_delete_properties(request, image_id, keys):
     """Delete custom properties for an image."""
+    _image_cache_clear(request, image_id)
     return glanceclient(request, '2').images.update(image_id, keys)
 
 
@@ -193,6 +430,19 @@ class BaseGlanceMetadefAPIResourceWrapper(base.APIResourceWrapper):
         return self._apiresource
 
 
+class _MetadefModel(dict):
+    """A metadata definition read back from the cache.
+
+    Like the models of glanceclient, its items are accessible as attributes.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
 class Namespace(BaseGlanceMetadefAPIResourceWrapper):
 
     _attrs = ['namespace', 'display_name', 'description',
@@ -227,6 +477,21 @@ def metadefs_namespace_get(request, namespace, resource_type=None, wrap=False):
         return namespace
 
 
+def _dump_namespaces(result):
+    namespaces, has_more_data, has_prev_data = result
+    return ([dict(namespace.to_dict()) for namespace in namespaces],
+            has_more_data, has_prev_data)
+
+
+def _load_namespaces(request, data):
+    namespaces, has_more_data, has_prev_data = data
+    return ([Namespace(_MetadefModel(namespace)) for namespace in namespaces],
+            has_more_data, has_prev_data)
+
+
+@base.cached_api_call('glance.metadefs_namespace_list',
+                      scope=('project', 'roles'),
+                      dump=_dump_namespaces, load=_load_namespaces)
 def metadefs_namespace_list(request,
                             filters={},
                             sort_dir='asc',
@@ -310,17 +575,25 @@ def metadefs_namespace_full_list(request, resource_type, filters={},
 
 
 def metadefs_namespace_create(request, namespace):
-    return glanceclient(request, '2').metadefs_namespace.create(**namespace)
+    namespace = glanceclient(request, '2').metadefs_namespace.create(
+        **namespace)
+    base.invalidate_api_cache(request, 'glance.metadefs_namespace_list')
+    return namespace
 
 
 def metadefs_namespace_update(request, namespace_name, **properties):
-    return glanceclient(request, '2').metadefs_namespace.update(
+    namespace = glanceclient(request, '2').metadefs_namespace.update(
         namespace_name,
         **properties)
+    base.invalidate_api_cache(request, 'glance.metadefs_namespace_list')
+    return namespace
 
 
 def metadefs_namespace_delete(request, namespace_name):
-    return glanceclient(request, '2').metadefs_namespace.delete(namespace_name)
+    result = glanceclient(request, '2').metadefs_namespace.delete(
+        namespace_name)
+    base.invalidate_api_cache(request, 'glance.metadefs_namespace_list')
+    return result
 
 
 def metadefs_resource_types_list(request):
@@ -338,8 +611,10 @@ def metadefs_namespace_resource_types(request, namespace_name):
 def metadefs_namespace_add_resource_type(request,
                                          namespace_name,
                                          resource_type):
-    return glanceclient(request, '2').metadefs_resource_type.associate(
+    association = glanceclient(request, '2').metadefs_resource_type.associate(
         namespace_name, **resource_type)
+    base.invalidate_api_cache(request, 'glance.metadefs_namespace_list')
+    return association
 
 
 def metadefs_namespace_remove_resource_type(request,
@@ -347,3 +622,4 @@ def metadefs_namespace_remove_resource_type(request,
                                             resource_type_name):
     glanceclient(request, '2').metadefs_resource_type.deassociate(
         namespace_name, resource_type_name)
+    base.invalidate_api_cache(request, 'glance.metadefs_namespace_list')
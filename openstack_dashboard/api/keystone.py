@@ -18,6 +18,7 @@
 #    under the License.
 
 import collections
+import functools
 import logging
 
 from django.conf import settings
@@ -33,6 +34,7 @@ from openstack_auth import utils as auth_utils
 from horizon import exceptions
 from horizon import messages
 from horizon.utils import functions as utils
+from horizon.utils import parallel
 
 from openstack_dashboard.api import base
 from openstack_dashboard import policy
@@ -256,7 +258,9 @@ def tenant_get(request, project, admin=True):
 
 def tenant_delete(request, project):
     manager = VERSIONS.get_project_manager(request, admin=True)
-    return manager.delete(project)
+    result = manager.delete(project)
+    base.invalidate_api_cache(request, 'keystone.tenant_name')
+    return result
 
 
 def tenant_list(request, paginate=False, marker=None, domain=None, user=None,
@@ -291,18 +295,47 @@ def tenant_list(request, paginate=False, marker=None, domain=None, user=None,
     return (tenants, has_more_data)
 
 
+@base.cached_api_call('keystone.tenant_name')
+def _tenant_name(request, project_id):
+    return getattr(tenant_get(request, project_id, admin=True), 'name', None)
+
+
+def tenant_names_get(request, project_ids):
+    """Returns a dict mapping the given project IDs to the project names.
+
+    Only the projects referenced are fetched, concurrently, and their names
+    are cached across requests for ``API_RESPONSE_CACHE_TIMEOUT`` seconds.
+    Projects which have been deleted are left out; any other failure is
+    raised.
+    """
+    project_ids = list(set(project_ids))
+    results = parallel.map_parallel(functools.partial(_tenant_name, request),
+                                    project_ids)
+    names = {}
+    for project_id, result in zip(project_ids, results):
+        if result.failed and isinstance(result.exception,
+                                        keystone_exceptions.NotFound):
+            LOG.debug("Project %s no longer exists", project_id)
+        else:
+            names[project_id] = result.get()
+    return names
+
+
 def tenant_update(request, project, name=None, description=None,
                   enabled=None, domain=None, **kwargs):
     manager = VERSIONS.get_project_manager(request, admin=True)
     try:
         if VERSIONS.active < 3:
-            return manager.update(project, name, description, enabled,
-                                  **kwargs)
+            result = manager.update(project, name, description, enabled,
+                                    **kwargs)
         else:
-            return manager.update(project, name=name, description=description,
-                                  enabled=enabled, domain=domain, **kwargs)
+            result = manager.update(project, name=name,
+                                    description=description,
+                                    enabled=enabled, domain=domain, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    base.invalidate_api_cache(request, 'keystone.tenant_name')
+    return result
 
 
 def user_list(request, project=None, domain=None, group=None, filters=None):
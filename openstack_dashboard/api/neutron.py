@@ -20,11 +20,13 @@
 from __future__ import absolute_import
 
 import collections
+import functools
 import logging
 
 import netaddr
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 from neutronclient.common import exceptions as neutron_exc
 from neutronclient.v2_0 import client as neutron_client
@@ -32,6 +34,7 @@ import six
 
 from horizon import messages
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
 from openstack_dashboard.api import nova
@@ -440,8 +443,10 @@ class FloatingIpManager(network_base.FloatingIpManager):
                                     and (p.device_id in gw_routers))])
         # we have to include any shared subnets as well because we may not
         # have permission to see the router interface to infer connectivity
-        shared = set([s.id for n in network_list(self.request, shared=True)
-                      for s in n.subnets])
+        shared = set([subnet_id for n in network_list(self.request,
+                                                      shared=True,
+                                                      expand_subnet=False)
+                      for subnet_id in n.subnets])
         return reachable_subnets | shared
 
     def list_targets(self):
@@ -540,6 +545,84 @@ def neutronclient(request):
     return c
 
 
+# How long the longest filter a listing call accepted is remembered.
+MAX_FILTER_LEN_CACHE_TIMEOUT = 3600
+
+
+def _max_filter_len_key(list_method, filter_attr, params):
+    # The length is learned separately for each Neutron endpoint, as they
+    # may accept URIs of different lengths.
+    request = params.get('request')
+    endpoint = base.url_for(request, 'network') if request else ''
+    return 'neutron:max_filter_len:%s:%s.%s:%s' % (
+        endpoint, list_method.__module__, list_method.__name__, filter_attr)
+
+
+def _filter_len(filter_attr, filter_values):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    # The length will be key_len + value_len + 2
+    return sum(len(filter_attr) + len(val) + 2 for val in filter_values)
+
+
+def _list_chunk(list_method, filter_attr, params, chunk):
+    params = dict(params)
+    params[filter_attr] = chunk
+    return list_method(**params)
+
+
+def _list_resources_in_chunks(list_method, filter_attr, filter_values,
+                              params, relearn=True):
+    # We consider only the filter condition from (filter_attr,
+    # filter_values) and do not consider other filter conditions
+    # which may be specified in **params.
+    if isinstance(filter_values, (list, tuple, set, frozenset)):
+        values = list(filter_values)
+    else:
+        values = [filter_values]
+    cache_key = _max_filter_len_key(list_method, filter_attr, params)
+    max_filter_len = cache.get(cache_key)
+
+    if (max_filter_len is None or
+            _filter_len(filter_attr, values) <= max_filter_len):
+        try:
+            return _list_chunk(list_method, filter_attr, params,
+                               filter_values)
+        except neutron_exc.RequestURITooLong as uri_len_exc:
+            # The URI is too long because of too many filter values.
+            # Use the excess attribute of the exception to know how many
+            # filter values can be inserted into a single request, and
+            # remember it so that the next calls are split up front.
+            max_filter_len = (_filter_len(filter_attr, values) -
+                              uri_len_exc.excess)
+            cache.set(cache_key, max_filter_len,
+                      MAX_FILTER_LEN_CACHE_TIMEOUT)
+
+    val_maxlen = max(len(val) for val in values)
+    filter_maxlen = len(filter_attr) + val_maxlen + 2
+    chunk_size = max(max_filter_len // filter_maxlen, 1)
+    chunks = [values[i:i + chunk_size]
+              for i in range(0, len(values), chunk_size)]
+
+    results = parallel.map_parallel(
+        functools.partial(_list_chunk, list_method, filter_attr, params),
+        chunks)
+    resources = []
+    try:
+        for result in results:
+            resources.extend(result.get())
+    except neutron_exc.RequestURITooLong:
+        if not relearn:
+            raise
+        # The limit was learned from a call whose other parameters made
+        # for a shorter URI; learn it again from this one.
+        cache.delete(cache_key)
+        return _list_resources_in_chunks(list_method, filter_attr,
+                                         filter_values, params,
+                                         relearn=False)
+    return resources
+
+
 def list_resources_with_long_filters(list_method,
                                      filter_attr, filter_values, **params):
     """List neutron resources with handling RequestURITooLong exception.
@@ -547,7 +630,10 @@ def list_resources_with_long_filters(list_method,
     If filter parameters are long, list resources API request leads to
     414 error (URL is too long). For such case, this method split
     list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
+    and call the specified list_method for each chunk concurrently.
+
+    The longest filter accepted is remembered, so that later calls with
+    too many filter values are split up front instead of failing first.
 
     :param list_method: Method used to retrieve resource list.
     :param filter_attr: attribute name to be filtered. The value corresponding
@@ -562,50 +648,34 @@ def list_resources_with_long_filters(list_method,
         without any changes. You can specify more filter conditions
         in addition to a pair of filter_attr and filter_values.
     """
-    try:
-        params[filter_attr] = filter_values
-        return list_method(**params)
-    except neutron_exc.RequestURITooLong as uri_len_exc:
-        # The URI is too long because of too many filter values.
-        # Use the excess attribute of the exception to know how many
-        # filter values can be inserted into a single request.
-
-        # We consider only the filter condition from (filter_attr,
-        # filter_values) and do not consider other filter conditions
-        # which may be specified in **params.
-        if type(filter_values) != list:
-            filter_values = [filter_values]
-
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
-        allowed_filter_len = all_filter_len - uri_len_exc.excess
-
-        val_maxlen = max(len(val) for val in filter_values)
-        filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len / filter_maxlen
-
-        resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
-        return resources
-
-
-def network_list(request, **params):
+    return _list_resources_in_chunks(list_method, filter_attr,
+                                     filter_values, params)
+
+
+def network_list(request, expand_subnet=True, **params):
+    """Return a list of networks.
+
+    Unless ``expand_subnet`` is False, the subnet IDs of each network are
+    replaced with the subnets themselves. Only the subnets referenced by the
+    returned networks are retrieved. Callers which only need the names or
+    IDs of the networks should pass ``expand_subnet=False``.
+    """
     LOG.debug("network_list(): params=%s", params)
     networks = neutronclient(request).list_networks(**params).get('networks')
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
-    subnet_dict = dict([(s['id'], s) for s in subnets])
-    # Expand subnet list from subnet_id to values.
-    for n in networks:
-        # Due to potential timing issues, we can't assume the subnet_dict data
-        # is in sync with the network data.
-        n['subnets'] = [subnet_dict[s] for s in n.get('subnets', []) if
-                        s in subnet_dict]
+    if expand_subnet:
+        # Get the referenced subnets to expand subnet info in network list.
+        subnet_ids = set(s for n in networks for s in n.get('subnets', []))
+        subnets = []
+        if subnet_ids:
+            subnets = list_resources_with_long_filters(
+                subnet_list, 'id', list(subnet_ids), request=request)
+        subnet_dict = dict([(s['id'], s) for s in subnets])
+        # Expand subnet list from subnet_id to values.
+        for n in networks:
+            # Due to potential timing issues, we can't assume the subnet_dict
+            # data is in sync with the network data.
+            n['subnets'] = [subnet_dict[s] for s in n.get('subnets', []) if
+                            s in subnet_dict]
     return [Network(n) for n in networks]
 
 
@@ -614,6 +684,7 @@ def network_list_for_tenant(request, tenant_id, **params):
 
     The list contains networks owned by the tenant and public networks.
     If requested_networks specified, it searches requested_networks only.
+    ``expand_subnet`` is passed on to :func:`network_list`.
     """
     LOG.debug("network_list_for_tenant(): tenant_id=%s, params=%s"
               % (tenant_id, params))
@@ -1010,6 +1081,16 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(neutronclient(request).show_quota(tenant_id)['quota'])
 
 
+def tenant_quota_detail_get(request, tenant_id):
+    """Returns the limit, usage and reservations of each quota of a tenant.
+
+    The result maps every quota name to a dict with ``limit``, ``used`` and
+    ``reserved`` keys. This requires the ``quota_details`` extension.
+    """
+    client = neutronclient(request)
+    return client.get(client.quota_path % tenant_id + '/details')['quota']
+
+
 def tenant_quota_update(request, tenant_id, **kwargs):
     quotas = {'quota': kwargs}
     return neutronclient(request).update_quota(tenant_id, quotas)
@@ -1060,9 +1141,10 @@ def servers_update_addresses(request, servers, all_tenants=False):
                 all_tenants=all_tenants)
         else:
             floating_ips = []
+        # Only the names of the networks are needed.
         networks = list_resources_with_long_filters(
             network_list, 'id', set([port.network_id for port in ports]),
-            request=request)
+            request=request, expand_subnet=False)
     except Exception:
         error_message = _('Unable to connect to Neutron.')
         LOG.error(error_message)
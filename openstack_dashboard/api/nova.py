@@ -20,6 +20,7 @@
 
 from __future__ import absolute_import
 
+import functools
 import logging
 
 from django.conf import settings
@@ -38,6 +39,7 @@ from novaclient.v2 import servers as nova_servers
 from horizon import conf
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
@@ -483,6 +485,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 flavorid=flavorid,
                                                 ephemeral=ephemeral,
                                                 swap=swap, is_public=is_public)
+    base.invalidate_api_cache(request, 'nova.flavor_list')
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -490,6 +493,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    base.invalidate_api_cache(request, 'nova.flavor_list')
 
 
 def flavor_get(request, flavor_id, get_extras=False):
@@ -499,10 +503,18 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
+@base.cached_api_call(
+    'nova.flavor_list', scope=('project', 'roles'),
+    dump=base.dump_resources,
+    load=base.resource_loader(lambda request: novaclient(request).flavors))
+def _flavor_list(request, is_public):
+    return novaclient(request).flavors.list(is_public=is_public)
+
+
 @memoized
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
-    flavors = novaclient(request).flavors.list(is_public=is_public)
+    flavors = _flavor_list(request, is_public)
     if get_extras:
         for flavor in flavors:
             flavor.extras = flavor_get_extras(request, flavor.id, True, flavor)
@@ -517,14 +529,18 @@ def flavor_access_list(request, flavor=None):
 
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return novaclient(request).flavor_access.add_tenant_access(
+    access = novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
+    base.invalidate_api_cache(request, 'nova.flavor_list')
+    return access
 
 
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return novaclient(request).flavor_access.remove_tenant_access(
+    access = novaclient(request).flavor_access.remove_tenant_access(
         flavor=flavor, tenant=tenant)
+    base.invalidate_api_cache(request, 'nova.flavor_list')
+    return access
 
 
 def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
@@ -600,6 +616,27 @@ def server_get(request, instance_id):
     return Server(novaclient(request).servers.get(instance_id), request)
 
 
+def server_get_by_ids(request, instance_ids):
+    """Returns a dict mapping the given instance IDs to their servers.
+
+    Nova cannot filter a listing by several IDs, so rather than listing every
+    server of the project the requested ones are fetched concurrently.
+    Servers which have been deleted are left out; any other failure is
+    raised.
+    """
+    instance_ids = list(set(instance_ids))
+    results = parallel.map_parallel(functools.partial(server_get, request),
+                                    instance_ids)
+    servers = {}
+    for instance_id, result in zip(instance_ids, results):
+        if result.failed and isinstance(result.exception,
+                                        nova_exceptions.NotFound):
+            LOG.debug("Instance %s no longer exists", instance_id)
+        else:
+            servers[instance_id] = result.get()
+    return servers
+
+
 def server_list(request, search_opts=None, all_tenants=False):
     page_size = utils.get_page_size(request)
     c = novaclient(request)
@@ -871,6 +908,11 @@ def tenant_absolute_limits(request, reserved=False):
     return limits_dict
 
 
+@base.cached_api_call(
+    'nova.availability_zone_list', scope=('roles',),
+    dump=base.dump_resources,
+    load=base.resource_loader(
+        lambda request: novaclient(request).availability_zones))
 def availability_zone_list(request, detailed=False):
     return novaclient(request).availability_zones.list(detailed=detailed)
 
@@ -880,15 +922,19 @@ def service_list(request, binary=None):
 
 
 def service_enable(request, host, binary):
-    return novaclient(request).services.enable(host, binary)
+    service = novaclient(request).services.enable(host, binary)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return service
 
 
 def service_disable(request, host, binary, reason=None):
     if reason:
-        return novaclient(request).services.disable_log_reason(host,
-                                                               binary, reason)
+        service = novaclient(request).services.disable_log_reason(
+            host, binary, reason)
     else:
-        return novaclient(request).services.disable(host, binary)
+        service = novaclient(request).services.disable(host, binary)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return service
 
 
 def aggregate_details_list(request):
@@ -900,11 +946,15 @@ def aggregate_details_list(request):
 
 
 def aggregate_create(request, name, availability_zone=None):
-    return novaclient(request).aggregates.create(name, availability_zone)
+    aggregate = novaclient(request).aggregates.create(name, availability_zone)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return aggregate
 
 
 def aggregate_delete(request, aggregate_id):
-    return novaclient(request).aggregates.delete(aggregate_id)
+    result = novaclient(request).aggregates.delete(aggregate_id)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return result
 
 
 def aggregate_get(request, aggregate_id):
@@ -912,7 +962,9 @@ def aggregate_get(request, aggregate_id):
 
 
 def aggregate_update(request, aggregate_id, values):
-    return novaclient(request).aggregates.update(aggregate_id, values)
+    aggregate = novaclient(request).aggregates.update(aggregate_id, values)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return aggregate
 
 
 def aggregate_set_metadata(request, aggregate_id, metadata):
@@ -924,11 +976,15 @@ def host_list(request):
 
 
 def add_host_to_aggregate(request, aggregate_id, host):
-    return novaclient(request).aggregates.add_host(aggregate_id, host)
+    aggregate = novaclient(request).aggregates.add_host(aggregate_id, host)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return aggregate
 
 
 def remove_host_from_aggregate(request, aggregate_id, host):
-    return novaclient(request).aggregates.remove_host(aggregate_id, host)
+    aggregate = novaclient(request).aggregates.remove_host(aggregate_id, host)
+    base.invalidate_api_cache(request, 'nova.availability_zone_list')
+    return aggregate
 
 
 def interface_attach(request,
@@ -943,6 +999,16 @@ def interface_detach(request, server, port_id):
     return novaclient(request).servers.interface_detach(server, port_id)
 
 
+@base.cached_api_call(
+    'nova.list_extensions', scope=('roles',),
+    dump=base.dump_resources,
+    load=base.resource_loader(
+        lambda request: nova_list_extensions.ListExtManager(
+            novaclient(request))))
+def _list_extensions(request):
+    return nova_list_extensions.ListExtManager(novaclient(request)).show_all()
+
+
 @memoized
 def list_extensions(request):
     """List all nova extensions, except the ones in the blacklist."""
@@ -950,8 +1016,7 @@ def list_extensions(request):
     blacklist = set(getattr(settings,
                             'OPENSTACK_NOVA_EXTENSIONS_BLACKLIST', []))
     return [
-        extension for extension in
-        nova_list_extensions.ListExtManager(novaclient(request)).show_all()
+        extension for extension in _list_extensions(request)
         if extension.name not in blacklist
     ]
 
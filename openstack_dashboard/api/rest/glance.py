@@ -71,7 +71,7 @@ class Images(generic.View):
     """
     url_regex = r'glance/images/$'
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(stream=True)
     def get(self, request):
         """Get a list of images.
 
@@ -23,6 +23,9 @@ class NaNJSONEncoder(json.JSONEncoder):
         self.inf_str = inf_str
         super(NaNJSONEncoder, self).__init__(**kwargs)
 
+    def _markers(self):
+        return {} if self.check_circular else None
+
     def iterencode(self, o, _one_shot=False):
         """The sole purpose of defining a custom JSONEncoder class is to
         override floatstr() inner function, or more specifically the
@@ -31,11 +34,6 @@ class NaNJSONEncoder(json.JSONEncoder):
         convince Javascript JSON.parse() to create a Javascript Infinity
         object if we feed a token `1e+999` to it.
         """
-        if self.check_circular:
-            markers = {}
-        else:
-            markers = None
-
         if self.ensure_ascii:
             _encoder = encoder.encode_basestring_ascii
         else:
@@ -69,8 +67,22 @@ class NaNJSONEncoder(json.JSONEncoder):
 
             return text
 
+        if (_one_shot and encoder.c_make_encoder is not None
+                and self.indent is None and not self.sort_keys):
+            # Hardly any data contains NaN or Infinity values, so first try
+            # the much faster C encoder, told to refuse them. Only when it
+            # does is the data encoded again by the pure-Python encoder.
+            c_iterencode = encoder.c_make_encoder(
+                self._markers(), self.default, _encoder, self.indent,
+                self.key_separator, self.item_separator, self.sort_keys,
+                self.skipkeys, False)
+            try:
+                return c_iterencode(o, 0)
+            except ValueError:
+                pass
+
         _iterencode = json.encoder._make_iterencode(
-            markers, self.default, _encoder, self.indent, floatstr,
+            self._markers(), self.default, _encoder, self.indent, floatstr,
             self.key_separator, self.item_separator, self.sort_keys,
             self.skipkeys, _one_shot)
         return _iterencode(o, 0)
@@ -19,6 +19,7 @@ from django.views import generic
 
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import utils as rest_utils
+from openstack_dashboard.usage import quotas
 
 from openstack_dashboard.api.rest import urls
 
@@ -31,7 +32,7 @@ class Networks(generic.View):
     """
     url_regex = r'neutron/networks/$'
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(stream=True)
     def get(self, request):
         """Get a list of networks for a project
 
@@ -66,6 +67,7 @@ class Networks(generic.View):
         if not api.neutron.is_port_profiles_supported():
             request.DATA.pop("net_profile_id", None)
         new_network = api.neutron.network_create(request, **request.DATA)
+        quotas.invalidate_tenant_quota_usages(request)
         return rest_utils.CreatedResponse(
             '/api/neutron/networks/%s' % new_network.id,
             new_network.to_dict()
@@ -112,6 +114,7 @@ class Subnets(generic.View):
 
         """
         new_subnet = api.neutron.subnet_create(request, **request.DATA)
+        quotas.invalidate_tenant_quota_usages(request)
         return rest_utils.CreatedResponse(
             '/api/neutron/subnets/%s' % new_subnet.id,
             new_subnet.to_dict()
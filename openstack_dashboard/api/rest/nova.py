@@ -22,6 +22,7 @@ from openstack_dashboard import api
 from openstack_dashboard.api.rest import json_encoder
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
+from openstack_dashboard.usage import quotas
 
 
 @urls.register
@@ -169,6 +170,7 @@ class Servers(generic.View):
                 kw[name] = request.DATA[name]
 
         new = api.nova.server_create(*args, **kw)
+        quotas.invalidate_tenant_quota_usages(request)
         return rest_utils.CreatedResponse(
             '/api/nova/servers/%s' % utils_http.urlquote(new.id),
             new.to_dict()
@@ -216,7 +218,7 @@ class Flavors(generic.View):
     """
     url_regex = r'nova/flavors/$'
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(stream=True)
     def get(self, request):
         """Get a list of flavors.
 
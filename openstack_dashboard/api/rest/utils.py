@@ -20,11 +20,14 @@ from django import http
 from django.utils import decorators
 
 from oslo_serialization import jsonutils
+import six
 
 from horizon import exceptions
 
 log = logging.getLogger(__name__)
 
+STREAMING_BUFFER_SIZE = 64 * 1024
+
 
 class AjaxError(Exception):
     def __init__(self, http_status, msg):
@@ -63,8 +66,72 @@ class JSONResponse(http.HttpResponse):
         )
 
 
+def iter_json(data, json_encoder=json.JSONEncoder,
+              buffer_size=STREAMING_BUFFER_SIZE, **kwargs):
+    """Encode ``data`` as JSON piece by piece, yielding chunks of about
+    ``buffer_size`` characters.
+
+    The elements of a top-level list, and of the lists held by a top-level
+    dict (such as ``{'items': [...]}``), are encoded one at a time, so the
+    whole document never has to be kept in memory. The output is the same
+    as that of ``jsonutils.dumps(data, cls=json_encoder, **kwargs)``.
+    """
+    encoder = json_encoder(default=jsonutils.to_primitive, **kwargs)
+
+    def encode_list(items):
+        yield '['
+        for i, item in enumerate(items):
+            if i:
+                yield encoder.item_separator
+            yield encoder.encode(item)
+        yield ']'
+
+    def pieces():
+        if isinstance(data, (list, tuple)):
+            for piece in encode_list(data):
+                yield piece
+        elif (isinstance(data, dict) and
+              all(isinstance(key, six.string_types) for key in data)):
+            keys = sorted(data) if encoder.sort_keys else list(data)
+            yield '{'
+            for i, key in enumerate(keys):
+                if i:
+                    yield encoder.item_separator
+                yield encoder.encode(key) + encoder.key_separator
+                if isinstance(data[key], (list, tuple)):
+                    for piece in encode_list(data[key]):
+                        yield piece
+                else:
+                    yield encoder.encode(data[key])
+            yield '}'
+        else:
+            yield encoder.encode(data)
+
+    buf = []
+    size = 0
+    for piece in pieces():
+        buf.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            yield ''.join(buf)
+            buf = []
+            size = 0
+    if buf:
+        yield ''.join(buf)
+
+
+class StreamingJSONResponse(http.StreamingHttpResponse):
+    """A JSON response encoded while it is sent; see :func:`iter_json`."""
+    def __init__(self, data, status=200, json_encoder=json.JSONEncoder):
+        super(StreamingJSONResponse, self).__init__(
+            iter_json(data, json_encoder, sort_keys=settings.DEBUG),
+            status=status,
+            content_type='application/json',
+        )
+
+
 def ajax(authenticated=True, data_required=False,
-         json_encoder=json.JSONEncoder):
+         json_encoder=json.JSONEncoder, stream=False):
     '''Provide a decorator to wrap a view method so that it may exist in an
     entirely AJAX environment:
 
@@ -79,6 +146,9 @@ def ajax(authenticated=True, data_required=False,
     If data_required is true then we'll assert that there is a JSON body
     present.
 
+    If stream is true then JSON serialisable data is encoded while it is sent
+    (see StreamingJSONResponse), which suits methods returning long lists.
+
     The wrapped view method should return either:
 
     - JSON serialisable data
@@ -118,6 +188,9 @@ def ajax(authenticated=True, data_required=False,
                     return data
                 elif data is None:
                     return JSONResponse('', status=204)
+                elif stream:
+                    return StreamingJSONResponse(data,
+                                                 json_encoder=json_encoder)
                 return JSONResponse(data, json_encoder=json_encoder)
             except http_errors as e:
                 # exception was raised with a specific HTTP status
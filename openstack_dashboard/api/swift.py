@@ -16,7 +16,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
 import logging
+import os.path
+import re
 
 from oslo_utils import timeutils
 import six.moves.urllib.parse as urlparse
@@ -140,8 +143,7 @@ def swift_object_exists(request, container_name, object_name):
 def swift_get_containers(request, marker=None):
     limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
     headers, containers = swift_api(request).get_account(limit=limit + 1,
-                                                         marker=marker,
-                                                         full_listing=True)
+                                                         marker=marker)
     container_objs = [Container(c) for c in containers]
     if(len(container_objs) > limit):
         return (container_objs[0:-1], True)
@@ -199,8 +201,8 @@ def swift_update_container(request, name, metadata=({})):
 def swift_delete_container(request, name):
     # It cannot be deleted if it's not empty. The batch remove of objects
     # be done in swiftclient instead of Horizon.
-    objects, more = swift_get_objects(request, name)
-    if objects:
+    objects = swift_iter_objects(request, name, page_size=1)
+    if next(objects, None) is not None:
         error_msg = _("The container cannot be deleted "
                       "since it is not empty.")
         exc = exceptions.Conflict(error_msg)
@@ -212,11 +214,12 @@ def swift_delete_container(request, name):
 def swift_get_objects(request, container_name, prefix=None, marker=None,
                       limit=None):
     limit = limit or getattr(settings, 'API_RESULT_LIMIT', 1000)
+    # A single page is requested; asking swiftclient for the full listing
+    # would download the whole container only to throw most of it away.
     kwargs = dict(prefix=prefix,
                   marker=marker,
                   limit=limit + 1,
-                  delimiter=FOLDER_DELIMITER,
-                  full_listing=True)
+                  delimiter=FOLDER_DELIMITER)
     headers, objects = swift_api(request).get_container(container_name,
                                                         **kwargs)
     object_objs = _objectify(objects, container_name)
@@ -227,39 +230,60 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
         return (object_objs, False)
 
 
+def swift_iter_objects(request, container_name, prefix=None, marker=None,
+                       delimiter=FOLDER_DELIMITER, page_size=None):
+    """Yields the objects of a container, one page of listing at a time.
+
+    The next page is only requested once the previous one has been consumed,
+    so callers which stop early never list the rest of the container.
+    """
+    page_size = page_size or getattr(settings, 'API_RESULT_LIMIT', 1000)
+    while True:
+        headers, items = swift_api(request).get_container(
+            container_name, prefix=prefix, marker=marker, limit=page_size,
+            delimiter=delimiter)
+        for obj in _objectify(items, container_name):
+            yield obj
+        if len(items) < page_size:
+            return
+        last = items[-1]
+        marker = last.get("subdir", None) or last.get("name")
+
+
 def swift_filter_objects(request, filter_string, container_name, prefix=None,
                          marker=None):
-    # FIXME(kewu): Swift currently has no real filtering API, thus the marker
-    # parameter here won't actually help the pagination. For now I am just
-    # getting the largest number of objects from a container and filtering
-    # based on those objects.
-    limit = 9999
-    objects = swift_get_objects(request,
-                                container_name,
-                                prefix=prefix,
-                                marker=marker,
-                                limit=limit)
-    filter_string_list = filter_string.lower().strip().split(' ')
-
-    def matches_filter(obj):
-        for q in filter_string_list:
-            return wildcard_search(obj.name.lower(), q)
-
-    return filter(matches_filter, objects[0])
-
-
-def wildcard_search(string, q):
-    q_list = q.split('*')
-    if all(map(lambda x: x == '', q_list)):
-        return True
-    elif q_list[0] not in string:
-        return False
-    else:
-        if q_list[0] == '':
-            tail = string
-        else:
-            head, delimiter, tail = string.partition(q_list[0])
-        return wildcard_search(tail, '*'.join(q_list[1:]))
+    """Returns the objects of a folder whose names match ``filter_string``.
+
+    Every space separated term of the filter matches the names, relative to
+    the folder, which start with it; ``*`` matches any run of characters.
+    The literal text the terms start with is passed on to Swift as a prefix,
+    and listing stops as soon as ``API_RESULT_LIMIT`` objects matched.
+    """
+    prefix = prefix or ''
+    limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
+    matchers = [_compile_filter(term) for term in filter_string.split()]
+    if not matchers:
+        matchers = [_compile_filter('')]
+    literal = os.path.commonprefix([literal for literal, m in matchers])
+
+    objects = swift_iter_objects(request, container_name,
+                                 prefix=prefix + literal, marker=marker)
+    filtered = []
+    for obj in objects:
+        name = obj.name[len(prefix):]
+        if any(match(name) for literal, match in matchers):
+            filtered.append(obj)
+            if len(filtered) >= limit:
+                break
+    return filtered
+
+
+def _compile_filter(term):
+    """Returns the literal prefix of a filter term and a matcher for it."""
+    parts = term.split('*')
+    pattern = re.compile('.*'.join(re.escape(part) for part in parts),
+                         re.DOTALL | re.UNICODE)
+    return parts[0], pattern.match
 
 
 def swift_copy_object(request, orig_container_name, orig_object_name,
@@ -314,8 +338,9 @@ def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
 
 
 def swift_delete_object(request, container_name, object_name):
-    objects, more = swift_get_objects(request, container_name,
-                                      prefix=object_name)
+    objects = list(itertools.islice(
+        swift_iter_objects(request, container_name, prefix=object_name,
+                           page_size=2), 2))
     # In case the given object is pseudo folder,
     # it can be deleted only if it is empty.
     # swift_get_objects will return at least
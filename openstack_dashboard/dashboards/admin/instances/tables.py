@@ -84,14 +84,27 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
+    all_tenants = True
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
-        tenant = api.keystone.tenant_get(request,
-                                         instance.tenant_id,
-                                         admin=True)
-        instance.tenant_name = getattr(tenant, "name", None)
+        tenant_names = api.keystone.tenant_names_get(request,
+                                                     [instance.tenant_id])
+        instance.tenant_name = tenant_names.get(instance.tenant_id)
         return instance
 
+    def get_data_for_ids(self, request, instance_ids):
+        instances = super(AdminUpdateRow, self).get_data_for_ids(
+            request, instance_ids)
+        if len(instance_ids) < self.min_ids_to_list:
+            # get_data has already looked up their projects one by one.
+            return instances
+        tenant_names = api.keystone.tenant_names_get(
+            request, [instance.tenant_id for instance in instances])
+        for instance in instances:
+            instance.tenant_name = tenant_names.get(instance.tenant_id)
+        return instances
+
 
 class AdminInstanceFilterAction(tables.FilterAction):
     # Change default name of 'filter' to distinguish this one from the
@@ -20,6 +20,7 @@ from django import http
 
 from mox3.mox import IgnoreArg  # noqa
 from mox3.mox import IsA  # noqa
+from mox3.mox import SameElementsAs  # noqa
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -29,26 +30,38 @@ INDEX_URL = reverse('horizon:admin:instances:index')
 
 
 class InstanceViewTest(test.BaseAdminViewTests):
+    @property
+    def image_map(self):
+        return dict((image.id, image) for image in self.images.list())
+
+    @property
+    def tenant_names(self):
+        return dict((tenant.id, tenant.name) for tenant in self.tenants.list())
+
     @test.create_stubs({api.nova: ('flavor_list', 'server_list',
                                    'extension_supported',),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('tenant_names_get',),
+                        api.glance: ('image_get_by_ids',),
                         api.network: ('servers_update_addresses',)})
     def test_index(self):
         servers = self.servers.list()
         flavors = self.flavors.list()
-        tenants = self.tenants.list()
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-            AndReturn([tenants, False])
+        api.keystone.tenant_names_get(
+            IsA(http.HttpRequest),
+            SameElementsAs([s.tenant_id for s in servers])) \
+            .AndReturn(self.tenant_names)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
                              all_tenants=True, search_opts=search_opts) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.flavor_list(IsA(http.HttpRequest)).AndReturn(flavors)
         self.mox.ReplayAll()
 
@@ -57,13 +70,45 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances = res.context['table'].data
         self.assertItemsEqual(instances, servers)
 
+    @test.create_stubs({api.nova: ('flavor_list', 'server_list',
+                                   'extension_supported',),
+                        api.keystone: ('tenant_get',),
+                        api.glance: ('image_get_by_ids',),
+                        api.network: ('servers_update_addresses',)})
+    def test_index_tenant_get_exception(self):
+        servers = self.servers.list()
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        for tenant_id in set(s.tenant_id for s in servers):
+            api.keystone.tenant_get(IsA(http.HttpRequest), tenant_id,
+                                    admin=True).InAnyOrder() \
+                .AndRaise(self.exceptions.keystone)
+        search_opts = {'marker': None, 'paginate': True}
+        api.nova.server_list(IsA(http.HttpRequest),
+                             all_tenants=True, search_opts=search_opts) \
+            .AndReturn([servers, False])
+        api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
+                                             all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL)
+        self.assertTemplateUsed(res, 'admin/instances/index.html')
+        self.assertMessageCount(res, error=1)
+        self.assertItemsEqual(res.context['table'].data, servers)
+
     @test.create_stubs({api.nova: ('flavor_list', 'flavor_get',
                                    'server_list', 'extension_supported',),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('tenant_names_get',),
+                        api.glance: ('image_get_by_ids',),
                         api.network: ('servers_update_addresses',)})
     def test_index_flavor_list_exception(self):
         servers = self.servers.list()
-        tenants = self.tenants.list()
         flavors = self.flavors.list()
         full_flavors = OrderedDict([(f.id, f) for f in flavors])
 
@@ -73,14 +118,18 @@ class InstanceViewTest(test.BaseAdminViewTests):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)). \
             AndRaise(self.exceptions.nova)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-            AndReturn([tenants, False])
+        api.keystone.tenant_names_get(
+            IsA(http.HttpRequest),
+            SameElementsAs([s.tenant_id for s in servers])) \
+            .AndReturn(self.tenant_names)
         for server in servers:
             api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
                 AndReturn(full_flavors[server.flavor["id"]])
@@ -94,12 +143,12 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'flavor_get',
                                    'server_list', 'extension_supported', ),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('tenant_names_get',),
+                        api.glance: ('image_get_by_ids',),
                         api.network: ('servers_update_addresses',)})
     def test_index_flavor_get_exception(self):
         servers = self.servers.list()
         flavors = self.flavors.list()
-        tenants = self.tenants.list()
         # UUIDs generated using indexes are unlikely to match
         # any of existing flavor ids and are guaranteed to be deterministic.
         for i, server in enumerate(servers):
@@ -111,14 +160,18 @@ class InstanceViewTest(test.BaseAdminViewTests):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)). \
             AndReturn(flavors)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-            AndReturn([tenants, False])
+        api.keystone.tenant_names_get(
+            IsA(http.HttpRequest),
+            SameElementsAs([s.tenant_id for s in servers])) \
+            .AndReturn(self.tenant_names)
         for server in servers:
             api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
                 AndRaise(self.exceptions.nova)
@@ -133,6 +186,66 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertMessageCount(res, error=1)
         self.assertItemsEqual(instances, servers)
 
+    @test.create_stubs({api.nova: ('flavor_list', 'server_list',
+                                   'extension_supported',),
+                        api.keystone: ('tenant_list', 'tenant_names_get'),
+                        api.glance: ('image_get_by_ids',),
+                        api.network: ('servers_update_addresses',)})
+    def test_index_project_filter(self):
+        tenant = self.tenants.first()
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == tenant.id]
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.keystone.tenant_list(IsA(http.HttpRequest),
+                                 filters={'name': tenant.name}) \
+            .AndReturn([self.tenants.list(), False])
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        search_opts = {'marker': None, 'paginate': True,
+                       'tenant_id': tenant.id}
+        api.nova.server_list(IsA(http.HttpRequest),
+                             all_tenants=True, search_opts=search_opts) \
+            .AndReturn([servers, False])
+        api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
+                                             all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
+        api.keystone.tenant_names_get(
+            IsA(http.HttpRequest),
+            SameElementsAs([s.tenant_id for s in servers])) \
+            .AndReturn({tenant.id: tenant.name})
+        self.mox.ReplayAll()
+
+        filter_data = {
+            'instances__filter_admin_instances__q_field': 'project',
+            'instances__filter_admin_instances__q': tenant.name}
+        res = self.client.post(INDEX_URL, filter_data, follow=True)
+        self.assertTemplateUsed(res, 'admin/instances/index.html')
+        instances = res.context['table'].data
+        self.assertItemsEqual(instances, servers)
+        for instance in instances:
+            self.assertEqual(tenant.name, instance.tenant_name)
+
+    @test.create_stubs({api.nova: ('flavor_list',),
+                        api.keystone: ('tenant_list',)})
+    def test_index_project_filter_no_match(self):
+        api.keystone.tenant_list(IsA(http.HttpRequest),
+                                 filters={'name': 'nonexistent'}) \
+            .AndReturn([[], False])
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        self.mox.ReplayAll()
+
+        filter_data = {
+            'instances__filter_admin_instances__q_field': 'project',
+            'instances__filter_admin_instances__q': 'nonexistent'}
+        res = self.client.post(INDEX_URL, filter_data, follow=True)
+        self.assertTemplateUsed(res, 'admin/instances/index.html')
+        self.assertEqual(0, len(res.context['table'].data))
+
     @test.create_stubs({api.nova: ('server_list',)})
     def test_index_server_list_exception(self):
         search_opts = {'marker': None, 'paginate': True}
@@ -185,18 +298,23 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'server_list',
                                    'extension_supported', ),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('tenant_names_get',),
+                        api.glance: ('image_get_by_ids',),
                         api.network: ('servers_update_addresses',)})
     def test_index_options_before_migrate(self):
         servers = self.servers.list()
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-            AndReturn([self.tenants.list(), False])
+        api.keystone.tenant_names_get(
+            IsA(http.HttpRequest),
+            SameElementsAs([s.tenant_id for s in servers])) \
+            .AndReturn(self.tenant_names)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
                              all_tenants=True, search_opts=search_opts) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
@@ -212,7 +330,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'server_list',
                                    'extension_supported', ),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('tenant_names_get',),
+                        api.glance: ('image_get_by_ids',),
                         api.network: ('servers_update_addresses',)})
     def test_index_options_after_migrate(self):
         servers = self.servers.list()
@@ -220,8 +339,10 @@ class InstanceViewTest(test.BaseAdminViewTests):
         server1.status = "VERIFY_RESIZE"
         server2 = servers[2]
         server2.status = "VERIFY_RESIZE"
-        api.keystone.tenant_list(IsA(http.HttpRequest)) \
-            .AndReturn([self.tenants.list(), False])
+        api.keystone.tenant_names_get(
+            IsA(http.HttpRequest),
+            SameElementsAs([s.tenant_id for s in servers])) \
+            .AndReturn(self.tenant_names)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
@@ -232,6 +353,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
+        api.glance.image_get_by_ids(IsA(http.HttpRequest), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.flavor_list(IsA(http.HttpRequest)).\
             AndReturn(self.flavors.list())
         self.mox.ReplayAll()
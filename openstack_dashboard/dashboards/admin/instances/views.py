@@ -18,6 +18,8 @@
 #    under the License.
 
 from collections import OrderedDict
+import functools
+
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
@@ -26,6 +28,7 @@ from horizon import exceptions
 from horizon import forms
 from horizon import tables
 from horizon.utils import memoized
+from horizon.utils import parallel
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.admin.instances \
@@ -75,15 +78,31 @@ class AdminIndexView(tables.DataTableView):
         marker = self.request.GET.get(
             project_tables.AdminInstancesTable._meta.pagination_param, None)
         search_opts = self.get_filters({'marker': marker, 'paginate': True})
-        # Gather our tenants to correlate against IDs
-        try:
-            tenants, has_more = api.keystone.tenant_list(self.request)
-        except Exception:
-            tenants = []
-            msg = _('Unable to retrieve instance project information.')
-            exceptions.handle(self.request, msg)
+        # Gather our flavors to correlate against IDs. Unless the instances
+        # have to be filtered by a project name (which needs the project
+        # first), fetch the instances at the same time.
+        calls = {
+            'flavors': functools.partial(api.nova.flavor_list, self.request),
+        }
+        if 'project' in search_opts:
+            calls['tenants'] = functools.partial(
+                api.keystone.tenant_list, self.request,
+                filters={'name': search_opts['project']})
+        else:
+            calls['instances'] = functools.partial(api.nova.server_list,
+                                                   self.request,
+                                                   search_opts=search_opts,
+                                                   all_tenants=True)
+        results = parallel.call_parallel(calls)
 
         if 'project' in search_opts:
+            try:
+                tenants, has_more = results['tenants'].get()
+            except Exception:
+                tenants = []
+                msg = _('Unable to retrieve instance project information.')
+                exceptions.handle(self.request, msg)
+            # Identity v2 can't filter projects by name itself.
             ten_filter_ids = [t.id for t in tenants
                               if t.name == search_opts['project']]
             del search_opts['project']
@@ -94,35 +113,66 @@ class AdminIndexView(tables.DataTableView):
                 return []
 
         try:
-            instances, self._more = api.nova.server_list(
-                self.request,
-                search_opts=search_opts,
-                all_tenants=True)
+            if 'instances' in results:
+                instances, self._more = results['instances'].get()
+            else:
+                instances, self._more = api.nova.server_list(
+                    self.request,
+                    search_opts=search_opts,
+                    all_tenants=True)
         except Exception:
             self._more = False
             exceptions.handle(self.request,
                               _('Unable to retrieve instance list.'))
         if instances:
+            # Only the images used by this page of instances are needed
+            image_ids = [inst.image['id'] for inst in instances
+                         if isinstance(getattr(inst, 'image', None), dict)
+                         and inst.image.get('id')]
+            results.update(parallel.call_parallel({
+                'addresses': functools.partial(
+                    api.network.servers_update_addresses,
+                    self.request, instances, all_tenants=True),
+                'images': functools.partial(api.glance.image_get_by_ids,
+                                            self.request, image_ids),
+                # Only the projects owning this page of instances are needed
+                'tenant_names': functools.partial(
+                    api.keystone.tenant_names_get, self.request,
+                    [inst.tenant_id for inst in instances]),
+            }))
             try:
-                api.network.servers_update_addresses(self.request, instances,
-                                                     all_tenants=True)
+                results['addresses'].get()
             except Exception:
                 exceptions.handle(
                     self.request,
                     message=_('Unable to retrieve IP addresses from Neutron.'),
                     ignore=True)
 
-            # Gather our flavors to correlate against IDs
             try:
-                flavors = api.nova.flavor_list(self.request)
+                image_map = results['images'].get()
+            except Exception:
+                image_map = {}
+                exceptions.handle(self.request, ignore=True)
+
+            try:
+                flavors = results['flavors'].get()
             except Exception:
                 # If fails to retrieve flavor list, creates an empty list.
                 flavors = []
 
+            try:
+                tenant_names = results['tenant_names'].get()
+            except Exception:
+                tenant_names = {}
+                msg = _('Unable to retrieve instance project information.')
+                exceptions.handle(self.request, msg)
+
             full_flavors = OrderedDict([(f.id, f) for f in flavors])
-            tenant_dict = OrderedDict([(t.id, t) for t in tenants])
-            # Loop through instances to get flavor and tenant info.
+            # Loop through instances to get image, flavor and tenant info.
             for inst in instances:
+                if isinstance(getattr(inst, 'image', None), dict):
+                    inst.image = image_map.get(inst.image.get('id'),
+                                               inst.image)
                 flavor_id = inst.flavor["id"]
                 try:
                     if flavor_id in full_flavors:
@@ -135,8 +185,7 @@ class AdminIndexView(tables.DataTableView):
                 except Exception:
                     msg = _('Unable to retrieve instance size information.')
                     exceptions.handle(self.request, msg)
-                tenant = tenant_dict.get(inst.tenant_id, None)
-                inst.tenant_name = getattr(tenant, "name", None)
+                inst.tenant_name = tenant_names.get(inst.tenant_id)
         return instances
 
     def get_filters(self, filters):
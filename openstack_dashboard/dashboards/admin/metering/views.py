@@ -83,6 +83,7 @@ class SamplesView(django.views.generic.TemplateView):
                                                  group_by, meter,
                                                  meter_name, stats_attr, unit)
 
+        series = metering_utils.downsample_series(series)
         series = metering_utils.normalize_series_by_unit(series)
         ret = {'series': series, 'settings': {}}
         return HttpResponse(json.dumps(ret), content_type='application/json')
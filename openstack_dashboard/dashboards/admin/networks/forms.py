@@ -23,6 +23,7 @@ from horizon import forms
 from horizon import messages
 
 from openstack_dashboard import api
+from openstack_dashboard.usage import quotas
 
 
 LOG = logging.getLogger(__name__)
@@ -183,6 +184,7 @@ class CreateNetwork(forms.SelfHandlingForm):
                     params['provider:segmentation_id'] = (
                         data['segmentation_id'])
             network = api.neutron.network_create(request, **params)
+            quotas.invalidate_tenant_quota_usages(request, data['tenant_id'])
             msg = _('Network %s was successfully created.') % data['name']
             LOG.debug(msg)
             messages.success(request, msg)
@@ -26,6 +26,7 @@ from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.networks.subnets \
     import tables as proj_tables
+from openstack_dashboard.usage import quotas
 
 
 LOG = logging.getLogger(__name__)
@@ -51,8 +52,10 @@ class DeleteSubnet(proj_tables.SubnetPolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("network", "delete_subnet"),)
 
     def delete(self, request, obj_id):
+        subnet = self.table.get_object_by_id(obj_id)
         try:
             api.neutron.subnet_delete(request, obj_id)
+            quotas.invalidate_tenant_quota_usages(request, subnet.tenant_id)
         except Exception:
             msg = _('Failed to delete subnet %s') % obj_id
             LOG.info(msg)
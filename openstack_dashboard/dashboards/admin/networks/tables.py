@@ -27,6 +27,7 @@ from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.networks \
     import tables as project_tables
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 
 LOG = logging.getLogger(__name__)
 
@@ -51,8 +52,10 @@ class DeleteNetwork(policy.PolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("network", "delete_network"),)
 
     def delete(self, request, obj_id):
+        network = self.table.get_object_by_id(obj_id)
         try:
             api.neutron.network_delete(request, obj_id)
+            quotas.invalidate_tenant_quota_usages(request, network.tenant_id)
         except Exception:
             msg = _('Failed to delete network %s') % obj_id
             LOG.info(msg)
@@ -39,9 +39,9 @@ class VolumeTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
 
     def get_volumes_data(self):
         volumes = self._get_volumes(search_opts={'all_tenants': True})
-        instances = self._get_instances(search_opts={'all_tenants': True})
+        instances = self._get_instances(volumes)
         volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots(
-            search_opts={'all_tenants': True})
+            volumes, search_opts={'all_tenants': True})
         self._set_volume_attributes(
             volumes, instances, volume_ids_with_snapshots)
 
@@ -61,6 +61,12 @@ class VolumeTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
 
         return volumes
 
+    def has_prev_data(self, table):
+        return self._has_prev_data
+
+    def has_more_data(self, table):
+        return self._has_more_data
+
 
 class VolumeTypesTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
     table_classes = (volume_types_tables.VolumeTypesTable,
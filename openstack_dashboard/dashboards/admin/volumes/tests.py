@@ -23,18 +23,24 @@ from openstack_dashboard.test import helpers as test
 
 
 class VolumeTests(test.BaseAdminViewTests):
-    @test.create_stubs({api.nova: ('server_list',),
-                        cinder: ('volume_list',
+    @test.create_stubs({api.nova: ('server_get_by_ids',),
+                        cinder: ('volume_list_paged',
                                  'volume_snapshot_list'),
                         keystone: ('tenant_list',)})
     def test_index(self):
-        cinder.volume_list(IsA(http.HttpRequest), search_opts={
-            'all_tenants': True}).AndReturn(self.cinder_volumes.list())
-        cinder.volume_snapshot_list(IsA(http.HttpRequest), search_opts={
-            'all_tenants': True}).AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts={
-                             'all_tenants': True}) \
-            .AndReturn([self.servers.list(), False])
+        volumes = self.cinder_volumes.list()
+        servers = dict((s.id, s) for s in self.servers.list()[:2])
+        cinder.volume_list_paged(IsA(http.HttpRequest), marker=None,
+                                 search_opts={'all_tenants': True},
+                                 sort_dir='desc', paginate=True) \
+            .AndReturn([volumes, False, False])
+        for volume in volumes:
+            cinder.volume_snapshot_list(
+                IsA(http.HttpRequest),
+                search_opts={'all_tenants': True, 'volume_id': volume.id}) \
+                .InAnyOrder().AndReturn([])
+        api.nova.server_get_by_ids(IsA(http.HttpRequest), set(servers)) \
+            .AndReturn(servers)
         keystone.tenant_list(IsA(http.HttpRequest)) \
             .AndReturn([self.tenants.list(), False])
 
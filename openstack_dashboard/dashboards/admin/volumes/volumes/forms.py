@@ -29,6 +29,7 @@ from openstack_dashboard.dashboards.admin.volumes.snapshots.forms \
     import populate_status_choices
 from openstack_dashboard.dashboards.project.volumes.volumes \
     import forms as project_forms
+from openstack_dashboard.usage import quotas
 
 
 # This set of states was pulled from cinder's admin_actions.py
@@ -118,6 +119,7 @@ class ManageVolume(forms.SelfHandlingForm):
                                  availability_zone=az,
                                  metadata=metadataDict,
                                  bootable=data['bootable'])
+            quotas.invalidate_tenant_quota_usages(request)
 
             # for success message, use identifier if user does not
             # provide a volume name
@@ -153,6 +155,8 @@ class UnmanageVolume(forms.SelfHandlingForm):
     def handle(self, request, data):
         try:
             cinder.volume_unmanage(request, self.initial['volume_id'])
+            quotas.invalidate_tenant_quota_usages(
+                request, self.initial.get('tenant_id'))
             messages.success(
                 request,
                 _('Successfully sent the request to unmanage volume: %s')
@@ -86,6 +86,10 @@ class UpdateVolumeStatusAction(tables.LinkAction):
                      "volume_extension:volume_admin_actions:reset_status"),)
 
 
+class AdminUpdateRow(volumes_tables.UpdateRow):
+    all_tenants = True
+
+
 class VolumesTable(volumes_tables.VolumesTable):
     name = tables.Column("name",
                          verbose_name=_("Name"),
@@ -97,7 +101,7 @@ class VolumesTable(volumes_tables.VolumesTable):
         name = "volumes"
         verbose_name = _("Volumes")
         status_columns = ["status"]
-        row_class = volumes_tables.UpdateRow
+        row_class = AdminUpdateRow
         table_actions = (ManageVolumeAction,
                          volumes_tables.DeleteVolume,
                          VolumesFilterAction)
@@ -89,7 +89,9 @@ class UnmanageVolumeView(forms.ModalFormView):
         volume = self.get_data()
         return {'volume_id': self.kwargs["volume_id"],
                 'name': volume.name,
-                'host': getattr(volume, "os-vol-host-attr:host")}
+                'host': getattr(volume, "os-vol-host-attr:host"),
+                'tenant_id': getattr(volume, "os-vol-tenant-attr:tenant_id",
+                                     None)}
 
 
 class MigrateVolumeView(forms.ModalFormView):
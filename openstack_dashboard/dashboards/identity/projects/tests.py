@@ -14,6 +14,7 @@
 
 import copy
 import datetime
+import functools
 import logging
 import os
 
@@ -721,6 +722,36 @@ class CreateProjectWorkflowTests(test.BaseAdminViewTests):
         self.test_add_project_missing_field_error()
 
 
+class RoleChangesTests(test.TestCase):
+    def test_selected_role_assignments(self):
+        class FakeStep(object):
+            def get_member_field_name(self, role_id):
+                return USER_ROLE_PREFIX + role_id
+
+        data = {USER_ROLE_PREFIX + '1': ['1', '3'],
+                USER_ROLE_PREFIX + '2': ['1']}
+        assignments = workflows._selected_role_assignments(
+            data, FakeStep(), self.roles.list())
+        self.assertEqual(set([('1', '1'), ('3', '1'), ('1', '2')]),
+                         assignments)
+
+    def test_apply_role_changes_reports_partial_failures(self):
+        made = []
+
+        def grant(user_id):
+            made.append(user_id)
+            if user_id == '2':
+                raise self.exceptions.keystone
+
+        changes = [(user_id, functools.partial(grant, user_id))
+                   for user_id in ('1', '2', '3')]
+        failed = workflows._apply_role_changes(changes)
+        # Every change is attempted; only the failed ones are returned.
+        self.assertItemsEqual(['1', '2', '3'], made)
+        self.assertEqual(['2'], [user_id for user_id, result in failed])
+        self.assertRaises(type(self.exceptions.keystone), failed[0][1].get)
+
+
 class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
     def _get_quota_info(self, quota):
         cinder_quota = self.cinder_quotas.first()
@@ -780,11 +811,12 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             api.keystone.role_assignments_list(IsA(http.HttpRequest),
                                                project=self.tenant.id) \
                .AndReturn(role_assignments)
+            # Role changes are made concurrently, in no particular order.
             # Give user 1 role 2
             api.keystone.add_tenant_user_role(IsA(http.HttpRequest),
                                               project=self.tenant.id,
                                               user='1',
-                                              role='2',)
+                                              role='2',).InAnyOrder()
             # remove role 2 from user 2
             api.keystone.remove_tenant_user_role(IsA(http.HttpRequest),
                                                  project=self.tenant.id,
@@ -795,27 +827,20 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
             api.keystone.add_tenant_user_role(IsA(http.HttpRequest),
                                               project=self.tenant.id,
                                               user='3',
-                                              role='1',)
+                                              role='1',).InAnyOrder()
             api.keystone.group_list(IsA(http.HttpRequest),
                                     domain=self.domain.id,
                                     project=self.tenant.id) \
                 .AndReturn(groups)
-            api.keystone.roles_for_group(IsA(http.HttpRequest),
-                                         group='1',
-                                         project=self.tenant.id) \
-                .AndReturn(roles)
+            for group in groups:
+                api.keystone.roles_for_group(IsA(http.HttpRequest),
+                                             group=group.id,
+                                             project=self.tenant.id) \
+                    .InAnyOrder().AndReturn(roles)
             api.keystone.remove_group_role(IsA(http.HttpRequest),
                                            project=self.tenant.id,
                                            group='1',
                                            role='1')
-            api.keystone.roles_for_group(IsA(http.HttpRequest),
-                                         group='2',
-                                         project=self.tenant.id) \
-                .AndReturn(roles)
-            api.keystone.roles_for_group(IsA(http.HttpRequest),
-                                         group='3',
-                                         project=self.tenant.id) \
-                .AndReturn(roles)
         else:
             api.keystone.user_list(IsA(http.HttpRequest),
                                    project=self.tenant.id) \
@@ -16,6 +16,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
@@ -27,6 +28,7 @@ from horizon import exceptions
 from horizon import forms
 from horizon import messages
 from horizon.utils import memoized
+from horizon.utils import parallel
 from horizon import workflows
 
 from openstack_dashboard import api
@@ -44,6 +46,27 @@ PROJECT_GROUP_MEMBER_SLUG = "update_group_members"
 COMMON_HORIZONTAL_TEMPLATE = "identity/projects/_common_horizontal_form.html"
 
 
+def _selected_role_assignments(data, member_step, roles):
+    """Returns the set of ``(member_id, role_id)`` pairs chosen in a step."""
+    return set((member_id, role.id) for role in roles
+               for member_id in
+               data[member_step.get_member_field_name(role.id)])
+
+
+def _apply_role_changes(changes):
+    """Makes the role grants and revocations in ``changes`` concurrently.
+
+    ``changes`` is a list of ``(member_id, call)`` pairs. At most
+    ``PARALLEL_API_MAX_WORKERS`` calls run at the same time and all of them
+    are attempted, even when some fail. Returns the ``(member_id, result)``
+    pairs of the calls which failed.
+    """
+    results = parallel.map_parallel(lambda change: change[1](), changes)
+    return [(member_id, result)
+            for (member_id, call), result in zip(changes, results)
+            if result.failed]
+
+
 class ProjectQuotaAction(workflows.Action):
     ifcb_label = _("Injected File Content (Bytes)")
     metadata_items = forms.IntegerField(min_value=-1,
@@ -457,23 +480,20 @@ class CreateProject(CommonQuotaWorkflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-            # count how many users are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_to_add += len(role_list)
+            to_add = _selected_role_assignments(data, member_step,
+                                                available_roles)
             # add new users to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                users_added = 0
-                for user in role_list:
-                    api.keystone.add_tenant_user_role(request,
-                                                      project=project_id,
-                                                      user=user,
-                                                      role=role.id)
-                    users_added += 1
-                users_to_add -= users_added
+            changes = [(user_id, functools.partial(
+                api.keystone.add_tenant_user_role, request,
+                project=project_id, user=user_id, role=role_id))
+                for user_id, role_id in sorted(to_add)]
+            users_to_add = len(changes)
+            failed = _apply_role_changes(changes)
+            if failed:
+                # Count the grants which failed; re-raise the first
+                # failure so that it is reported as usual.
+                users_to_add = len(failed)
+                failed[0][1].get()
         except Exception:
             if PROJECT_GROUP_ENABLED:
                 group_msg = _(", add project groups")
@@ -493,24 +513,18 @@ class CreateProject(CommonQuotaWorkflow):
         try:
             available_roles = api.keystone.role_list(request)
             member_step = self.get_step(PROJECT_GROUP_MEMBER_SLUG)
-
-            # count how many groups are to be added
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_to_add += len(role_list)
+            to_add = _selected_role_assignments(data, member_step,
+                                                available_roles)
             # add new groups to project
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                role_list = data[field_name]
-                groups_added = 0
-                for group in role_list:
-                    api.keystone.add_group_role(request,
-                                                role=role.id,
-                                                group=group,
-                                                project=project_id)
-                    groups_added += 1
-                groups_to_add -= groups_added
+            changes = [(group_id, functools.partial(
+                api.keystone.add_group_role, request,
+                role=role_id, group=group_id, project=project_id))
+                for group_id, role_id in sorted(to_add)]
+            groups_to_add = len(changes)
+            failed = _apply_role_changes(changes)
+            if failed:
+                groups_to_add = len(failed)
+                failed[0][1].get()
         except Exception:
             exceptions.handle(request,
                               _('Failed to add %s project groups '
@@ -629,39 +643,6 @@ class UpdateProject(CommonQuotaWorkflow):
             exceptions.handle(request, ignore=True)
             return
 
-    def _add_roles_to_users(self, request, data, project_id, user_id,
-                            role_ids, available_roles):
-        member_step = self.get_step(PROJECT_USER_MEMBER_SLUG)
-        current_role_ids = list(role_ids)
-
-        for role in available_roles:
-            field_name = member_step.get_member_field_name(role.id)
-            # Check if the user is in the list of users with this role.
-            if user_id in data[field_name]:
-                # Add it if necessary
-                if role.id not in current_role_ids:
-                    # user role has changed
-                    api.keystone.add_tenant_user_role(
-                        request,
-                        project=project_id,
-                        user=user_id,
-                        role=role.id)
-                else:
-                    # User role is unchanged, so remove it from the
-                    # remaining roles list to avoid removing it later.
-                    index = current_role_ids.index(role.id)
-                    current_role_ids.pop(index)
-        return current_role_ids
-
-    def _remove_roles_from_user(self, request, project_id, user_id,
-                                current_role_ids):
-        for id_to_delete in current_role_ids:
-            api.keystone.remove_tenant_user_role(
-                request,
-                project=project_id,
-                user=user_id,
-                role=id_to_delete)
-
     def _is_removing_self_admin_role(self, request, project_id, user_id,
                                      available_roles, current_role_ids):
         is_current_user = user_id == request.user.id
@@ -700,41 +681,40 @@ class UpdateProject(CommonQuotaWorkflow):
             # can diff against it.
             users_roles = api.keystone.get_project_users_roles(
                 request, project=project_id)
-            users_to_modify = len(users_roles)
-
-            for user_id in users_roles.keys():
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_role_ids = list(users_roles[user_id])
-                modified_role_ids = self._add_roles_to_users(
-                    request, data, project_id, user_id,
-                    current_role_ids, available_roles)
-                # Prevent admins from doing stupid things to themselves.
-                removing_admin = self._is_removing_self_admin_role(
-                    request, project_id, user_id, available_roles,
-                    modified_role_ids)
-                # Otherwise go through and revoke any removed roles.
-                if not removing_admin:
-                    self._remove_roles_from_user(request, project_id, user_id,
-                                                 modified_role_ids)
-                users_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many users may be added for exception handling.
-                users_to_modify += len(data[field_name])
-            for role in available_roles:
-                users_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for user_id in data[field_name]:
-                    if user_id not in users_roles:
-                        api.keystone.add_tenant_user_role(request,
-                                                          project=project_id,
-                                                          user=user_id,
-                                                          role=role.id)
-                    users_added += 1
-                users_to_modify -= users_added
+            current = set((user_id, role_id)
+                          for user_id, role_ids in users_roles.items()
+                          for role_id in role_ids)
+            selected = _selected_role_assignments(data, member_step,
+                                                  available_roles)
+            to_add = selected - current
+            to_remove = current - selected
+
+            # Prevent admins from doing stupid things to themselves.
+            own_removed_role_ids = [role_id for user_id, role_id in to_remove
+                                    if user_id == request.user.id]
+            if self._is_removing_self_admin_role(
+                    request, project_id, request.user.id, available_roles,
+                    own_removed_role_ids):
+                to_remove = set((user_id, role_id)
+                                for user_id, role_id in to_remove
+                                if user_id != request.user.id)
+
+            changes = [(user_id, functools.partial(
+                api.keystone.add_tenant_user_role, request,
+                project=project_id, user=user_id, role=role_id))
+                for user_id, role_id in sorted(to_add)]
+            changes.extend((user_id, functools.partial(
+                api.keystone.remove_tenant_user_role, request,
+                project=project_id, user=user_id, role=role_id))
+                for user_id, role_id in sorted(to_remove))
+            users_to_modify = len(set(user_id for user_id, call in changes))
+            failed = _apply_role_changes(changes)
+            if failed:
+                # Count the members left partially updated; re-raise the
+                # first failure so that it is reported as usual.
+                users_to_modify = len(set(user_id
+                                          for user_id, result in failed))
+                failed[0][1].get()
             return True
         except Exception:
             if PROJECT_GROUP_ENABLED:
@@ -762,60 +742,31 @@ class UpdateProject(CommonQuotaWorkflow):
             project_groups = api.keystone.group_list(request,
                                                      domain=domain_id,
                                                      project=project_id)
-            groups_to_modify = len(project_groups)
-            for group in project_groups:
-                # Check if there have been any changes in the roles of
-                # Existing project members.
-                current_roles = api.keystone.roles_for_group(
-                    self.request,
-                    group=group.id,
-                    project=project_id)
-                current_role_ids = [role.id for role in current_roles]
-                for role in available_roles:
-                    # Check if the group is in the list of groups with
-                    # this role.
-                    field_name = member_step.get_member_field_name(role.id)
-                    if group.id in data[field_name]:
-                        # Add it if necessary
-                        if role.id not in current_role_ids:
-                            # group role has changed
-                            api.keystone.add_group_role(
-                                request,
-                                role=role.id,
-                                group=group.id,
-                                project=project_id)
-                        else:
-                            # Group role is unchanged, so remove it from
-                            # the remaining roles list to avoid removing it
-                            # later.
-                            index = current_role_ids.index(role.id)
-                            current_role_ids.pop(index)
-
-                # Revoke any removed roles.
-                for id_to_delete in current_role_ids:
-                    api.keystone.remove_group_role(request,
-                                                   role=id_to_delete,
-                                                   group=group.id,
-                                                   project=project_id)
-                groups_to_modify -= 1
-
-            # Grant new roles on the project.
-            for role in available_roles:
-                field_name = member_step.get_member_field_name(role.id)
-                # Count how many groups may be added for error handling.
-                groups_to_modify += len(data[field_name])
-            for role in available_roles:
-                groups_added = 0
-                field_name = member_step.get_member_field_name(role.id)
-                for group_id in data[field_name]:
-                    if not filter(lambda x: group_id == x.id,
-                                  project_groups):
-                        api.keystone.add_group_role(request,
-                                                    role=role.id,
-                                                    group=group_id,
-                                                    project=project_id)
-                    groups_added += 1
-                groups_to_modify -= groups_added
+            group_roles = parallel.map_parallel(
+                lambda group: api.keystone.roles_for_group(
+                    request, group=group.id, project=project_id),
+                project_groups)
+            current = set()
+            for group, roles in zip(project_groups, group_roles):
+                current.update((group.id, role.id) for role in roles.get())
+            selected = _selected_role_assignments(data, member_step,
+                                                  available_roles)
+
+            changes = [(group_id, functools.partial(
+                api.keystone.add_group_role, request,
+                role=role_id, group=group_id, project=project_id))
+                for group_id, role_id in sorted(selected - current)]
+            changes.extend((group_id, functools.partial(
+                api.keystone.remove_group_role, request,
+                role=role_id, group=group_id, project=project_id))
+                for group_id, role_id in sorted(current - selected))
+            groups_to_modify = len(set(group_id
+                                       for group_id, call in changes))
+            failed = _apply_role_changes(changes)
+            if failed:
+                groups_to_modify = len(set(group_id
+                                           for group_id, result in failed))
+                failed[0][1].get()
             return True
         except Exception:
             exceptions.handle(request,
@@ -837,10 +788,6 @@ class UpdateProject(CommonQuotaWorkflow):
             return False
 
     def handle(self, request, data):
-        # FIXME(gabriel): This should be refactored to use Python's built-in
-        # sets and do this all in a single "roles to add" and "roles to remove"
-        # pass instead of the multi-pass thing happening now.
-
         project = self._update_project(request, data)
         if not project:
             return False
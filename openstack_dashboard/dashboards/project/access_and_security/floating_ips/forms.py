@@ -47,6 +47,7 @@ class FloatingIpAllocate(forms.SelfHandlingForm):
 
             fip = api.network.tenant_floating_ip_allocate(request,
                                                           pool=data['pool'])
+            quotas.invalidate_tenant_quota_usages(request)
             messages.success(request,
                              _('Allocated Floating IP %(ip)s.')
                              % {"ip": fip.ip})
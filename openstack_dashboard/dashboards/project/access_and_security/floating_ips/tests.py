@@ -326,11 +326,14 @@ class FloatingIpNeutronViewTests(FloatingIpViewTests):
             .AndReturn(True)
         api.neutron.tenant_quota_get(IsA(http.HttpRequest), self.tenant.id) \
             .AndReturn(self.neutron_quotas.first())
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'quota_details').AndReturn(False)
         api.neutron.router_list(IsA(http.HttpRequest)) \
             .AndReturn(self.routers.list())
         api.neutron.subnet_list(IsA(http.HttpRequest)) \
             .AndReturn(self.subnets.list())
-        api.neutron.network_list(IsA(http.HttpRequest), shared=False) \
+        api.neutron.network_list(IsA(http.HttpRequest), shared=False,
+                                 expand_subnet=False) \
             .AndReturn(self.networks.list())
         api.network.floating_ip_supported(IsA(http.HttpRequest)) \
             .AndReturn(True)
@@ -398,6 +398,10 @@ class DownloadObject(tables.LinkAction):
 
 class ObjectFilterAction(tables.FilterAction):
     def _filtered_data(self, table, filter_string):
+        # The subfolders and the objects tables are filtered from the same
+        # listing, so only fetch it once per filter.
+        if getattr(self, 'filtered_string', None) == filter_string:
+            return self.filtered_data
         request = table.request
         container = self.table.kwargs['container_name']
         subfolder = self.table.kwargs['subfolder_path']
@@ -406,6 +410,7 @@ class ObjectFilterAction(tables.FilterAction):
                                                             filter_string,
                                                             container,
                                                             prefix=prefix)
+        self.filtered_string = filter_string
         return self.filtered_data
 
     def filter_subfolders_data(self, table, objects, filter_string):
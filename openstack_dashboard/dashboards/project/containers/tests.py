@@ -94,12 +94,13 @@ class SwiftTests(test.TestCase):
             handled = table.maybe_handle()
             self.assertEqual(handled['location'], CONTAINER_INDEX_URL)
 
-    @test.create_stubs({api.swift: ('swift_get_objects', )})
+    @test.create_stubs({api.swift: ('swift_iter_objects', )})
     def test_delete_container_nonempty(self):
         container = self.containers.first()
         objects = self.objects.list()
-        api.swift.swift_get_objects(IsA(http.HttpRequest),
-                                    container.name).AndReturn([objects, False])
+        api.swift.swift_iter_objects(IsA(http.HttpRequest),
+                                     container.name,
+                                     page_size=1).AndReturn(iter(objects))
         self.mox.ReplayAll()
 
         action_string = u"containers__delete__%s" % container.name
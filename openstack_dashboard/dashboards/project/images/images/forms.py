@@ -26,6 +26,7 @@ from django.forms import ValidationError  # noqa
 from django.forms.widgets import HiddenInput  # noqa
 from django.template import defaultfilters
 from django.utils.translation import ugettext_lazy as _
+import six
 
 from horizon import exceptions
 from horizon import forms
@@ -262,6 +263,9 @@ class CreateImageForm(forms.SelfHandlingForm):
                              _('Your image %s has been queued for creation.') %
                              meta['name'])
             return image
+        except exceptions.NotAvailable as e:
+            exceptions.handle(request, six.text_type(e))
+            return False
         except Exception as e:
             msg = _('Unable to create new image')
             # TODO(nikunj2512): Fix this once it is fixed in glance client
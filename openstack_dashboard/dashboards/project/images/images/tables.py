@@ -274,6 +274,21 @@ class UpdateRow(tables.Row):
             self.classes.append('category-' + category)
 
 
+class ImageStatusColumn(tables.Column):
+    """Status column showing how far along an upload made through this
+    dashboard is. The row keeps being polled until the image is active.
+    """
+    def get_data(self, image):
+        data = super(ImageStatusColumn, self).get_data(image)
+        if image.status in ("queued", "saving"):
+            progress = api.glance.image_upload_progress(image.id)
+            if (progress and progress['status'] == 'uploading' and
+                    progress['size']):
+                percent = 100 * progress['transferred'] // progress['size']
+                return u"%s (%d%%)" % (data, percent)
+        return data
+
+
 class ImagesTable(tables.DataTable):
     STATUS_CHOICES = (
         ("active", True),
@@ -306,11 +321,11 @@ class ImagesTable(tables.DataTable):
     image_type = tables.Column(get_image_type,
                                verbose_name=_("Type"),
                                display_choices=TYPE_CHOICES)
-    status = tables.Column("status",
-                           verbose_name=_("Status"),
-                           status=True,
-                           status_choices=STATUS_CHOICES,
-                           display_choices=STATUS_DISPLAY_CHOICES)
+    status = ImageStatusColumn("status",
+                               verbose_name=_("Status"),
+                               status=True,
+                               status_choices=STATUS_CHOICES,
+                               display_choices=STATUS_DISPLAY_CHOICES)
     public = tables.Column("is_public",
                            verbose_name=_("Public"),
                            empty_value=False,
@@ -27,6 +27,7 @@ from django.test.utils import override_settings
 
 from mox3.mox import IsA  # noqa
 
+from horizon import exceptions
 from horizon import tables as horizon_tables
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -223,6 +224,23 @@ class ImageViewTests(test.TestCase):
         api_data = {'data': IsA(InMemoryUploadedFile)}
         self._test_image_create(data, api_data)
 
+    @test.create_stubs({api.glance: ('image_create',)})
+    def test_image_create_post_upload_rejected(self):
+        temp_file = tempfile.TemporaryFile()
+        temp_file.write('123')
+        temp_file.flush()
+        temp_file.seek(0)
+
+        data = {'source_type': u'file',
+                'image_file': temp_file}
+
+        api_data = {'data': IsA(InMemoryUploadedFile)}
+        msg = 'Too many images are being uploaded at the moment.'
+        res = self._test_image_create(
+            data, api_data, create_exception=exceptions.NotAvailable(msg))
+        self.assertMessageCount(res, error=1)
+        self.assertContains(res, msg)
+
     @test.create_stubs({api.glance: ('image_create',)})
     def test_image_create_post_with_kernel_ramdisk(self):
         temp_file = tempfile.TemporaryFile()
@@ -241,7 +259,8 @@ class ImageViewTests(test.TestCase):
         self._test_image_create(data, api_data)
 
     @test.create_stubs({api.glance: ('image_list_detailed',)})
-    def _test_image_create(self, extra_form_data, extra_api_data):
+    def _test_image_create(self, extra_form_data, extra_api_data,
+                           create_exception=None):
         data = {
             'name': u'Ubuntu 11.10',
             'description': u'Login with admin/admin',
@@ -275,15 +294,22 @@ class ImageViewTests(test.TestCase):
             IsA(http.HttpRequest), filters=filters).AndReturn(
             [self.images.list(), False, False])
 
-        api.glance.image_create(
-            IsA(http.HttpRequest),
-            **api_data).AndReturn(self.images.first())
+        if create_exception:
+            api.glance.image_create(
+                IsA(http.HttpRequest),
+                **api_data).AndRaise(create_exception)
+        else:
+            api.glance.image_create(
+                IsA(http.HttpRequest),
+                **api_data).AndReturn(self.images.first())
         self.mox.ReplayAll()
 
         url = reverse('horizon:project:images:images:create')
         res = self.client.post(url, data)
 
         self.assertNoFormErrors(res)
+        if create_exception:
+            return res
         self.assertEqual(res.status_code, 302)
 
     @test.create_stubs({api.glance: ('image_get',)})
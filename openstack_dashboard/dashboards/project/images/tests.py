@@ -64,6 +64,22 @@ class ImagesAndSnapshotsTests(test.TestCase):
         row_actions = images_table.get_row_actions(images[2])
         self.assertTrue(len(row_actions), 3)
 
+    @test.create_stubs({api.glance: ('image_list_detailed',)})
+    def test_index_upload_progress(self):
+        images = self.images.list()[:2]
+        images[0].status = 'saving'
+        api.glance._set_upload_progress(images[0].id, 'uploading', 50, 100)
+        api.glance._set_upload_progress(images[1].id, 'uploading', 50, 100)
+        api.glance.image_list_detailed(IsA(http.HttpRequest),
+                                       marker=None,
+                                       paginate=True) \
+            .AndReturn([images, False, False])
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL)
+        # Only images still waiting for their data show the progress.
+        self.assertContains(res, 'Saving (50%)', 1)
+
     @test.create_stubs({api.glance: ('image_list_detailed',)})
     def test_index_no_images(self):
         api.glance.image_list_detailed(IsA(http.HttpRequest),
@@ -137,12 +153,12 @@ class ImagesAndSnapshotsUtilsTests(test.TestCase):
                               not image.is_public)]
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([public_images, False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([private_images, False, False])
 
         self.mox.ReplayAll()
@@ -163,17 +179,17 @@ class ImagesAndSnapshotsUtilsTests(test.TestCase):
                               not image.is_public)]
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([public_images, False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([private_images, False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': 'other-tenant',
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([private_images, False, False])
 
         self.mox.ReplayAll()
@@ -220,18 +236,18 @@ class ImagesAndSnapshotsUtilsTests(test.TestCase):
                               not image.is_public)]
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndRaise(self.exceptions.glance)
         exceptions.handle(IsA(http.HttpRequest),
                           "Unable to retrieve public images.")
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([private_images, False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([public_images, False, False])
 
         self.mox.ReplayAll()
@@ -273,19 +289,19 @@ class ImagesAndSnapshotsUtilsTests(test.TestCase):
                               not image.is_public)]
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([public_images, False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndRaise(self.exceptions.glance)
         exceptions.handle(IsA(http.HttpRequest),
                           "Unable to retrieve images for the current project.")
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([private_images, False, False])
 
         self.mox.ReplayAll()
@@ -316,6 +332,62 @@ class ImagesAndSnapshotsUtilsTests(test.TestCase):
             len(private_images),
             len(images_cache['images_by_project'][self.tenant.id]))
 
+    @test.create_stubs({api.glance: ('image_list_detailed',)})
+    def test_list_image_removes_duplicates(self):
+        public_images = [image for image in self.images.list()
+                         if image.status == 'active' and image.is_public]
+        # The project owns one of the public images.
+        owned_images = [public_images[0]]
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
+            .AndReturn([public_images, False, False])
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'property-owner_id': self.tenant.id,
+                     'status': 'active'}).InAnyOrder() \
+            .AndReturn([owned_images, False, False])
+
+        self.mox.ReplayAll()
+
+        ret = utils.get_available_images(self.request, self.tenant.id)
+
+        expected_ids = [image.id for image in public_images
+                        if image.container_format not in ('ari', 'aki')]
+        self.assertItemsEqual(expected_ids, [image.id for image in ret])
+        self.assertEqual(owned_images[0].id, ret[0].id)
+
+    @test.create_stubs({api.glance: ('image_list_detailed',)})
+    def test_list_image_public_images_cached_across_requests(self):
+        public_images = [image for image in self.images.list()
+                         if image.status == 'active' and image.is_public]
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
+            .AndReturn([public_images, False, False])
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'property-owner_id': self.tenant.id,
+                     'status': 'active'}).InAnyOrder() \
+            .AndReturn([[], False, False])
+        api.glance.image_list_detailed(
+            IsA(http.HttpRequest),
+            filters={'property-owner_id': 'other-tenant',
+                     'status': 'active'}) \
+            .AndReturn([[], False, False])
+
+        self.mox.ReplayAll()
+
+        expected_ids = [image.id for image in public_images
+                        if image.container_format not in ('ari', 'aki')]
+        ret = utils.get_available_images(self.request, self.tenant.id)
+        self.assertEqual(expected_ids, [image.id for image in ret])
+
+        # A new request doesn't share the images_cache, but the public
+        # images are still not fetched again.
+        ret = utils.get_available_images(self.request, 'other-tenant')
+        self.assertEqual(expected_ids, [image.id for image in ret])
+
 
 class SeleniumTests(test.SeleniumTestCase):
     @test.create_stubs({api.glance: ('image_list_detailed',)})
@@ -10,10 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import functools
+import itertools
+
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon.templatetags import sizeformat
+from horizon.utils import parallel
 
 from openstack_dashboard.api import glance
 
@@ -23,36 +27,47 @@ def get_available_images(request, project_id=None, images_cache=None):
     project_id. If project_id is not specified, only public images
     are returned.
 
+    Only the bootable images in the ``active`` state are returned, which is
+    what the launch instance, rebuild and volume creation forms offer. The
+    state is filtered on by Glance. The kernel and ramdisk images are left
+    out by Horizon, as the v1 API can't exclude container formats.
+
     :param images_cache: An optional dict-like object in which to
      cache public and per-project id image metadata.
 
     """
     if images_cache is None:
         images_cache = {}
-    public_images = images_cache.get('public_images', [])
-    images_by_project = images_cache.get('images_by_project', {})
-    if 'public_images' not in images_cache:
-        public = {"is_public": True,
-                  "status": "active"}
-        try:
-            images, _more, _prev = glance.image_list_detailed(
-                request, filters=public)
-            [public_images.append(image) for image in images]
-            images_cache['public_images'] = public_images
-        except Exception:
-            exceptions.handle(request,
-                              _("Unable to retrieve public images."))
+    images_by_project = images_cache.setdefault('images_by_project', {})
 
     # Preempt if we don't have a project_id yet.
     if project_id is None:
         images_by_project[project_id] = []
 
+    # Fetch the public and the project's images at the same time.
+    calls = {}
+    if 'public_images' not in images_cache:
+        public = {"status": "active"}
+        calls['public'] = functools.partial(glance.public_image_list_detailed,
+                                            request, filters=public)
     if project_id not in images_by_project:
         owner = {"property-owner_id": project_id,
                  "status": "active"}
+        calls['owned'] = functools.partial(glance.image_list_detailed,
+                                           request, filters=owner)
+    results = parallel.call_parallel(calls)
+
+    if 'public' in results:
         try:
-            owned_images, _more, _prev = glance.image_list_detailed(
-                request, filters=owner)
+            images_cache['public_images'] = results['public'].get()
+        except Exception:
+            exceptions.handle(request,
+                              _("Unable to retrieve public images."))
+    public_images = images_cache.get('public_images', [])
+
+    if 'owned' in results:
+        try:
+            owned_images, _more, _prev = results['owned'].get()
             images_by_project[project_id] = owned_images
         except Exception:
             owned_images = []
@@ -62,20 +77,16 @@ def get_available_images(request, project_id=None, images_cache=None):
     else:
         owned_images = images_by_project[project_id]
 
-    if 'images_by_project' not in images_cache:
-        images_cache['images_by_project'] = images_by_project
-
-    images = owned_images + public_images
-
-    # Remove duplicate images
-    image_ids = []
+    # Remove duplicate images, and the kernel and ramdisk images which
+    # can't be booted on their own (Glance can't filter those out).
+    image_ids = set()
     final_images = []
-    for image in images:
-        if image.id not in image_ids:
-            image_ids.append(image.id)
+    for image in itertools.chain(owned_images, public_images):
+        if (image.id not in image_ids and
+                image.container_format not in ('aki', 'ari')):
+            image_ids.add(image.id)
             final_images.append(image)
-    return [image for image in final_images
-            if image.container_format not in ('aki', 'ari')]
+    return final_images
 
 
 def image_field_data(request, include_empty_option=False):
@@ -13,6 +13,7 @@
 #    under the License.
 
 
+import functools
 import logging
 
 from django.conf import settings
@@ -35,6 +36,7 @@ from horizon import messages
 from horizon import tables
 from horizon.templatetags import sizeformat
 from horizon.utils import filters
+from horizon.utils import parallel
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.access_and_security.floating_ips \
@@ -45,6 +47,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 
 
 LOG = logging.getLogger(__name__)
@@ -109,7 +112,10 @@ class TerminateInstance(policy.PolicyTargetMixin, tables.BatchAction):
         return not is_deleting(instance)
 
     def action(self, request, obj_id):
+        instance = self.table.get_object_by_id(obj_id)
         api.nova.server_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(
+            request, getattr(instance, 'tenant_id', None))
 
 
 class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -665,6 +671,7 @@ class SimpleAssociateIP(policy.PolicyTargetMixin, tables.Action):
                 request, instance_id).split('_')[0]
 
             fip = api.network.tenant_floating_ip_allocate(request)
+            quotas.invalidate_tenant_quota_usages(request)
             api.network.floating_ip_associate(request, fip.id, target_id)
             messages.success(request,
                              _("Successfully associated floating IP: %s")
@@ -744,6 +751,10 @@ def get_instance_error(instance):
 
 class UpdateRow(tables.Row):
     ajax = True
+    all_tenants = False
+    # Fewer polled instances than this are looked up one by one rather than
+    # by listing a page of instances.
+    min_ids_to_list = 3
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
@@ -760,6 +771,54 @@ class UpdateRow(tables.Row):
             messages.error(request, error)
         return instance
 
+    def get_data_for_ids(self, request, instance_ids):
+        if len(instance_ids) < self.min_ids_to_list:
+            return super(UpdateRow, self).get_data_for_ids(request,
+                                                           instance_ids)
+
+        results = parallel.call_parallel({
+            'instances': functools.partial(api.nova.server_list, request,
+                                           search_opts={'paginate': True},
+                                           all_tenants=self.all_tenants),
+            'flavors': functools.partial(api.nova.flavor_list, request),
+        })
+        instances, has_more = results['instances'].get()
+        instances = [instance for instance in instances
+                     if instance.id in instance_ids]
+        try:
+            flavors = results['flavors'].get()
+        except Exception:
+            flavors = []
+            exceptions.handle(request, ignore=True)
+        full_flavors = dict([(str(flavor.id), flavor) for flavor in flavors])
+
+        for instance in instances:
+            flavor_id = instance.flavor["id"]
+            try:
+                if flavor_id in full_flavors:
+                    instance.full_flavor = full_flavors[flavor_id]
+                else:
+                    instance.full_flavor = api.nova.flavor_get(request,
+                                                               flavor_id)
+            except Exception:
+                exceptions.handle(request,
+                                  _('Unable to retrieve flavor information '
+                                    'for instance "%s".') % instance.id,
+                                  ignore=True)
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
+
+        # Instances the list left out, e.g. because they are past its first
+        # page or they are gone, are looked up one by one.
+        found = set(instance.id for instance in instances)
+        missing = [instance_id for instance_id in instance_ids
+                   if instance_id not in found]
+        if missing:
+            instances.extend(super(UpdateRow, self).get_data_for_ids(
+                request, missing))
+        return instances
+
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "start"
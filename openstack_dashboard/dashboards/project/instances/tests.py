@@ -32,6 +32,7 @@ from django.utils import encoding
 from django.utils.http import urlencode
 from mox3.mox import IgnoreArg  # noqa
 from mox3.mox import IsA  # noqa
+from novaclient import exceptions as nova_exceptions
 import six
 
 from horizon import exceptions
@@ -56,6 +57,10 @@ SNAPSHOT_SEARCH_OPTS = dict(status=AVAILABLE)
 
 
 class InstanceTests(helpers.TestCase):
+    @property
+    def image_map(self):
+        return dict((image.id, image) for image in self.images.list())
+
     @helpers.create_stubs({
         api.nova: (
             'flavor_list',
@@ -63,7 +68,7 @@ class InstanceTests(helpers.TestCase):
             'tenant_absolute_limits',
             'extension_supported',
         ),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: (
             'floating_ip_simple_associate_supported',
             'floating_ip_supported',
@@ -79,8 +84,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -127,7 +132,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'flavor_get',
                    'tenant_absolute_limits', 'extension_supported',),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: ('floating_ip_simple_associate_supported',
                       'floating_ip_supported',
                       'servers_update_addresses',),
@@ -147,8 +152,8 @@ class InstanceTests(helpers.TestCase):
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndRaise(self.exceptions.nova)
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         for server in servers:
             api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
                 AndReturn(full_flavors[server.flavor["id"]])
@@ -171,7 +176,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'tenant_absolute_limits',
                    'extension_supported',),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: ('floating_ip_simple_associate_supported',
                       'floating_ip_supported',
                       'servers_update_addresses',),
@@ -190,8 +195,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -240,7 +245,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_list',
                                       'flavor_list',
                                       'server_delete',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_terminate_instance(self):
         servers = self.servers.list()
@@ -251,8 +256,8 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers)
         api.nova.flavor_list(IgnoreArg()).AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.server_delete(IsA(http.HttpRequest), server.id)
         self.mox.ReplayAll()
 
@@ -264,7 +269,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_list',
                                       'flavor_list',
                                       'server_delete',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_terminate_instance_exception(self):
         servers = self.servers.list()
@@ -275,8 +280,8 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers)
         api.nova.flavor_list(IgnoreArg()).AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.server_delete(IsA(http.HttpRequest), server.id) \
             .AndRaise(self.exceptions.nova)
 
@@ -291,7 +296,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_pause_instance(self):
         servers = self.servers.list()
@@ -302,8 +307,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -321,7 +326,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_pause_instance_exception(self):
         servers = self.servers.list()
@@ -332,8 +337,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -352,7 +357,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_unpause_instance(self):
         servers = self.servers.list()
@@ -363,8 +368,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -382,7 +387,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_unpause_instance_exception(self):
         servers = self.servers.list()
@@ -394,8 +399,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -413,15 +418,15 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_reboot',
                                       'server_list',
                                       'flavor_list',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_reboot_instance(self):
         servers = self.servers.list()
         server = servers[0]
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -439,7 +444,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_reboot',
                                       'server_list',
                                       'flavor_list',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_reboot_instance_exception(self):
         servers = self.servers.list()
@@ -447,8 +452,8 @@ class InstanceTests(helpers.TestCase):
 
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -467,7 +472,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_reboot',
                                       'server_list',
                                       'flavor_list',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_soft_reboot_instance(self):
         servers = self.servers.list()
@@ -475,8 +480,8 @@ class InstanceTests(helpers.TestCase):
 
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -495,7 +500,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_suspend_instance(self):
         servers = self.servers.list()
@@ -506,8 +511,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -526,7 +531,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_suspend_instance_exception(self):
         servers = self.servers.list()
@@ -537,8 +542,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -557,7 +562,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_resume_instance(self):
         servers = self.servers.list()
@@ -569,8 +574,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -588,7 +593,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_resume_instance_exception(self):
         servers = self.servers.list()
@@ -600,8 +605,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -621,7 +626,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_shelve_instance(self):
         servers = self.servers.list()
@@ -631,8 +636,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -650,7 +655,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_shelve_instance_exception(self):
         servers = self.servers.list()
@@ -660,8 +665,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -681,7 +686,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_unshelve_instance(self):
         servers = self.servers.list()
@@ -692,8 +697,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -712,7 +717,7 @@ class InstanceTests(helpers.TestCase):
                                       'server_list',
                                       'flavor_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_unshelve_instance_exception(self):
         servers = self.servers.list()
@@ -723,8 +728,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -743,7 +748,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_lock',
                                       'server_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_lock_instance(self):
         servers = self.servers.list()
@@ -751,8 +756,8 @@ class InstanceTests(helpers.TestCase):
 
         api.nova.extension_supported('AdminActions', IsA(
             http.HttpRequest)).MultipleTimes().AndReturn(True)
-        api.glance.image_list_detailed(IgnoreArg()).AndReturn((
-            self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(
             IsA(http.HttpRequest),
@@ -770,7 +775,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_lock',
                                       'server_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_lock_instance_exception(self):
         servers = self.servers.list()
@@ -778,8 +783,8 @@ class InstanceTests(helpers.TestCase):
 
         api.nova.extension_supported('AdminActions', IsA(
             http.HttpRequest)).MultipleTimes().AndReturn(True)
-        api.glance.image_list_detailed(IgnoreArg()).AndReturn((
-            self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(
             IsA(http.HttpRequest),
@@ -798,15 +803,15 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_unlock',
                                       'server_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_unlock_instance(self):
         servers = self.servers.list()
         server = servers[0]
         api.nova.extension_supported('AdminActions', IsA(
             http.HttpRequest)).MultipleTimes().AndReturn(True)
-        api.glance.image_list_detailed(IgnoreArg()).AndReturn((
-            self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(
             IsA(http.HttpRequest),
@@ -824,7 +829,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_unlock',
                                       'server_list',
                                       'extension_supported',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_unlock_instance_exception(self):
         servers = self.servers.list()
@@ -832,8 +837,8 @@ class InstanceTests(helpers.TestCase):
 
         api.nova.extension_supported('AdminActions', IsA(
             http.HttpRequest)).MultipleTimes().AndReturn(True)
-        api.glance.image_list_detailed(IgnoreArg()).AndReturn((
-            self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(
             IsA(http.HttpRequest),
@@ -1259,7 +1264,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'tenant_absolute_limits',
                    'extension_supported',),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: ('floating_ip_simple_associate_supported',
                       'floating_ip_supported',
                       'servers_update_addresses',),
@@ -1273,8 +1278,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -1480,12 +1485,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -1703,12 +1708,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -1812,12 +1817,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -1961,11 +1966,11 @@ class InstanceTests(helpers.TestCase):
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        filters={'is_public': True,
                                                 'status': 'active'}) \
-                  .AndReturn([self.images.list(), False, False])
+                  .InAnyOrder().AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2140,12 +2145,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2283,12 +2288,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2412,11 +2417,11 @@ class InstanceTests(helpers.TestCase):
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        filters={'is_public': True,
                                                 'status': 'active'}) \
-            .AndReturn([[], False, False])
+            .InAnyOrder().AndReturn([[], False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2542,12 +2547,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2674,11 +2679,11 @@ class InstanceTests(helpers.TestCase):
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        filters={'is_public': True,
                                                 'status': 'active'}) \
-            .AndReturn([[], False, False])
+            .InAnyOrder().AndReturn([[], False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2760,12 +2765,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2855,12 +2860,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -2982,12 +2987,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -3089,12 +3094,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -3214,12 +3219,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -3356,12 +3361,13 @@ class InstanceTests(helpers.TestCase):
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'is_public': True,
-                     'status': 'active'}).AndReturn(
+                     'status': 'active'}).InAnyOrder().AndReturn(
             [self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}).AndReturn([[], False, False])
+                     'status': 'active'}) \
+            .InAnyOrder().AndReturn([[], False, False])
         api.neutron.network_list(
             IsA(http.HttpRequest),
             tenant_id=self.tenant.id,
@@ -3477,12 +3483,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -3578,7 +3584,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'tenant_absolute_limits',
                    'extension_supported',),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: ('floating_ip_simple_associate_supported',
                       'floating_ip_supported',
                       'servers_update_addresses',),
@@ -3595,8 +3601,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -3677,12 +3683,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -3753,7 +3759,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'tenant_absolute_limits',
                    'extension_supported',),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: ('floating_ip_simple_associate_supported',
                       'floating_ip_supported',
                       'servers_update_addresses',),
@@ -3769,8 +3775,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndReturn([servers, False])
@@ -3811,12 +3817,12 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -3869,7 +3875,7 @@ class InstanceTests(helpers.TestCase):
                                          'tenant_floating_ip_allocate',
                                          'floating_ip_associate',
                                          'servers_update_addresses',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.nova: ('server_list',
                                       'flavor_list')})
     def test_associate_floating_ip(self):
@@ -3882,8 +3888,8 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers)
         api.nova.flavor_list(IgnoreArg()).AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.network.floating_ip_target_get_by_instance(
             IsA(http.HttpRequest),
             server.id).AndReturn(server.id)
@@ -3903,7 +3909,7 @@ class InstanceTests(helpers.TestCase):
                                          'tenant_floating_ip_list',
                                          'floating_ip_disassociate',
                                          'servers_update_addresses',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.nova: ('server_list',
                                       'flavor_list')})
     def test_disassociate_floating_ip(self):
@@ -3917,8 +3923,8 @@ class InstanceTests(helpers.TestCase):
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers)
         api.nova.flavor_list(IgnoreArg()).AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.network.floating_ip_target_list_by_instance(
             IsA(http.HttpRequest),
             server.id).AndReturn([server.id, ])
@@ -4096,12 +4102,12 @@ class InstanceTests(helpers.TestCase):
         server = self.servers.first()
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.nova.extension_supported('DiskConfig',
                                      IsA(http.HttpRequest)) \
@@ -4152,12 +4158,12 @@ class InstanceTests(helpers.TestCase):
 
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.nova.extension_supported('DiskConfig',
                                      IsA(http.HttpRequest)) \
@@ -4184,12 +4190,12 @@ class InstanceTests(helpers.TestCase):
 
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.nova.extension_supported('DiskConfig',
                                      IsA(http.HttpRequest)) \
@@ -4218,12 +4224,12 @@ class InstanceTests(helpers.TestCase):
 
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.nova.extension_supported('DiskConfig',
                                      IsA(http.HttpRequest)) \
@@ -4244,12 +4250,12 @@ class InstanceTests(helpers.TestCase):
 
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.nova.extension_supported('DiskConfig',
                                      IsA(http.HttpRequest)) \
@@ -4277,12 +4283,12 @@ class InstanceTests(helpers.TestCase):
 
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.nova.extension_supported('DiskConfig',
                                      IsA(http.HttpRequest)) \
@@ -4306,7 +4312,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({
         api.nova: ('flavor_list', 'server_list', 'tenant_absolute_limits',
                    'extension_supported',),
-        api.glance: ('image_list_detailed',),
+        api.glance: ('image_get_by_ids',),
         api.network: ('floating_ip_simple_associate_supported',
                       'floating_ip_supported',
                       'servers_update_addresses',),
@@ -4325,8 +4331,8 @@ class InstanceTests(helpers.TestCase):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .MultipleTimes().AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .MultipleTimes().AndReturn(self.image_map)
 
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
@@ -4370,7 +4376,7 @@ class InstanceTests(helpers.TestCase):
     @helpers.create_stubs({api.nova: ('server_list',
                                       'flavor_list',
                                       'server_delete',),
-                           api.glance: ('image_list_detailed',),
+                           api.glance: ('image_get_by_ids',),
                            api.network: ('servers_update_addresses',)})
     def test_terminate_instance_with_pagination(self):
         """Instance should be deleted from
@@ -4386,8 +4392,8 @@ class InstanceTests(helpers.TestCase):
         api.network.servers_update_addresses(IsA(http.HttpRequest),
                                              servers[page_size:])
         api.nova.flavor_list(IgnoreArg()).AndReturn(self.flavors.list())
-        api.glance.image_list_detailed(IgnoreArg()) \
-            .AndReturn((self.images.list(), False, False))
+        api.glance.image_get_by_ids(IgnoreArg(), IgnoreArg()) \
+            .AndReturn(self.image_map)
         api.nova.server_delete(IsA(http.HttpRequest), server.id)
         self.mox.ReplayAll()
 
@@ -4574,6 +4580,84 @@ class InstanceAjaxTests(helpers.TestCase):
         self.assertContains(res, server.name)
         self.assertContains(res, "Not available")
 
+    @helpers.create_stubs({api.nova: ("server_list",
+                                      "server_get",
+                                      "flavor_list",
+                                      "extension_supported"),
+                           api.neutron: ("is_extension_supported",)})
+    def test_rows_update(self):
+        servers = self.servers.list()
+        server, other_server = servers[:2]
+
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group')\
+            .MultipleTimes().AndReturn(True)
+        api.nova.server_list(IsA(http.HttpRequest),
+                             search_opts={'paginate': True},
+                             all_tenants=False)\
+            .InAnyOrder().AndReturn([servers, False])
+        api.nova.flavor_list(IsA(http.HttpRequest))\
+            .InAnyOrder().AndReturn(self.flavors.list())
+        # Instances missing from the list are looked up one by one
+        api.nova.server_get(IsA(http.HttpRequest), 'gone')\
+            .AndRaise(nova_exceptions.NotFound(404))
+
+        self.mox.ReplayAll()
+
+        params = {'action': 'rows_update',
+                  'table': 'instances',
+                  'obj_id': [server.id, other_server.id, 'gone'],
+                  }
+        res = self.client.get('?'.join((INDEX_URL,
+                                        urlencode(params, doseq=True))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(['gone'], data['deleted'])
+        self.assertEqual(2, len(data['rows']))
+        self.assertIn(server.name, data['rows'][0])
+        self.assertIn(other_server.name, data['rows'][1])
+
+    @helpers.create_stubs({api.nova: ("server_get",
+                                      "flavor_get",
+                                      "extension_supported"),
+                           api.neutron: ("is_extension_supported",)})
+    def test_rows_update_few_ids(self):
+        server = self.servers.first()
+        flavor = self.flavors.first()
+
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(True)
+        api.nova.extension_supported('Shelve', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group')\
+            .MultipleTimes().AndReturn(True)
+        # Too few instances are polled to list them
+        api.nova.server_get(IsA(http.HttpRequest), server.id)\
+            .InAnyOrder().AndReturn(server)
+        api.nova.flavor_get(IsA(http.HttpRequest), server.flavor['id'])\
+            .AndReturn(flavor)
+        api.nova.server_get(IsA(http.HttpRequest), 'gone')\
+            .InAnyOrder().AndRaise(nova_exceptions.NotFound(404))
+
+        self.mox.ReplayAll()
+
+        params = {'action': 'rows_update',
+                  'table': 'instances',
+                  'obj_id': [server.id, 'gone'],
+                  }
+        res = self.client.get('?'.join((INDEX_URL,
+                                        urlencode(params, doseq=True))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(['gone'], data['deleted'])
+        self.assertEqual(1, len(data['rows']))
+        self.assertIn(server.name, data['rows'][0])
+
 
 class ConsoleManagerTests(helpers.TestCase):
 
@@ -4839,12 +4923,12 @@ class ConsoleManagerTests(helpers.TestCase):
             .AndReturn(self.availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         api.neutron.network_list(IsA(http.HttpRequest),
                                  tenant_id=self.tenant.id,
@@ -20,6 +20,7 @@
 Views for managing instances.
 """
 from collections import OrderedDict
+import functools
 import logging
 
 from django.core.urlresolvers import reverse
@@ -35,6 +36,7 @@ from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
+from horizon.utils import parallel
 from horizon import workflows
 
 from openstack_dashboard import api
@@ -65,11 +67,15 @@ class IndexView(tables.DataTableView):
         marker = self.request.GET.get(
             project_tables.InstancesTable._meta.pagination_param, None)
         search_opts = self.get_filters({'marker': marker, 'paginate': True})
-        # Gather our instances
+        # Gather our instances and flavors at the same time
+        results = parallel.call_parallel({
+            'instances': functools.partial(api.nova.server_list,
+                                           self.request,
+                                           search_opts=search_opts),
+            'flavors': functools.partial(api.nova.flavor_list, self.request),
+        })
         try:
-            instances, self._more = api.nova.server_list(
-                self.request,
-                search_opts=search_opts)
+            instances, self._more = results['instances'].get()
         except Exception:
             self._more = False
             instances = []
@@ -77,33 +83,40 @@ class IndexView(tables.DataTableView):
                               _('Unable to retrieve instances.'))
 
         if instances:
+            # Only the images used by this page of instances are needed
+            image_ids = [instance.image['id'] for instance in instances
+                         if isinstance(getattr(instance, 'image', None), dict)
+                         and instance.image.get('id')]
+            results.update(parallel.call_parallel({
+                'addresses': functools.partial(
+                    api.network.servers_update_addresses,
+                    self.request, instances),
+                'images': functools.partial(api.glance.image_get_by_ids,
+                                            self.request, image_ids),
+            }))
             try:
-                api.network.servers_update_addresses(self.request, instances)
+                results['addresses'].get()
             except Exception:
                 exceptions.handle(
                     self.request,
                     message=_('Unable to retrieve IP addresses from Neutron.'),
                     ignore=True)
 
-            # Gather our flavors and images and correlate our instances to them
+            # Correlate our instances to the flavors and images
             try:
-                flavors = api.nova.flavor_list(self.request)
+                flavors = results['flavors'].get()
             except Exception:
                 flavors = []
                 exceptions.handle(self.request, ignore=True)
 
             try:
-                # TODO(gabriel): Handle pagination.
-                images, more, prev = api.glance.image_list_detailed(
-                    self.request)
+                image_map = results['images'].get()
             except Exception:
-                images = []
+                image_map = {}
                 exceptions.handle(self.request, ignore=True)
 
             full_flavors = OrderedDict([(str(flavor.id), flavor)
                                        for flavor in flavors])
-            image_map = OrderedDict([(str(image.id), image)
-                                    for image in images])
 
             # Loop through instances to get flavor info.
             for instance in instances:
@@ -945,6 +945,7 @@ class LaunchInstance(workflows.Workflow):
                                    admin_pass=context['admin_pass'],
                                    disk_config=context.get('disk_config'),
                                    config_drive=context.get('config_drive'))
+            quotas.invalidate_tenant_quota_usages(request)
             return True
         except Exception:
             if port_profiles_supported:
@@ -21,6 +21,8 @@ import django.test
 from mox3.mox import IsA  # noqa
 
 from openstack_dashboard import api
+from openstack_dashboard.dashboards.project.instances import\
+    console as i_console
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.usage import quotas
 
@@ -76,7 +78,7 @@ class NetworkTopologyTests(test.TestCase):
 
         res = self.client.get(JSON_URL)
         self.assertEqual('text/json', res['Content-Type'])
-        data = json.loads(res.content)
+        data = json.loads(b''.join(res.streaming_content))
 
         # servers
         # result_server_urls = [(server['id'], server['url'])
@@ -154,6 +156,73 @@ class NetworkTopologyTests(test.TestCase):
                  'fixed_ips': []})
         self.assertEqual(expect_port_urls, data['ports'])
 
+    def _stub_json_view_console(self, requests=1):
+        for i in range(requests):
+            api.nova.server_list(
+                IsA(http.HttpRequest)).AndReturn([self.servers.list(), False])
+            api.neutron.network_list_for_tenant(
+                IsA(http.HttpRequest), self.tenant.id).AndReturn([])
+            api.neutron.port_list(IsA(http.HttpRequest)).AndReturn([])
+
+    def _get_json_view_consoles(self):
+        res = self.client.get(JSON_URL)
+        data = json.loads(b''.join(res.streaming_content))
+        return dict((server['id'], server.get('console'))
+                    for server in data['servers'])
+
+    def _expected_consoles(self, console):
+        return dict((server.id,
+                     console if server.status == 'ACTIVE' else None)
+                    for server in self.servers.list())
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+        CONSOLE_TYPE='AUTO')
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list'),
+                        i_console: ('get_console',)})
+    def test_json_view_console_auto(self):
+        self._stub_json_view_console(requests=2)
+        active = [server for server in self.servers.list()
+                  if server.status == 'ACTIVE']
+        # The console type is checked on a single server, and only once.
+        i_console.get_console(IsA(http.HttpRequest), 'AUTO', active[0]) \
+            .AndReturn(('SPICE', 'http://spice/%s' % active[0].id))
+        self.mox.ReplayAll()
+
+        expected = self._expected_consoles('spice')
+        self.assertEqual(expected, self._get_json_view_consoles())
+        self.assertEqual(expected, self._get_json_view_consoles())
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+        CONSOLE_TYPE='VNC')
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list'),
+                        i_console: ('get_console',)})
+    def test_json_view_console_type_set(self):
+        self._stub_json_view_console()
+        self.mox.ReplayAll()
+
+        self.assertEqual(self._expected_consoles('vnc'),
+                         self._get_json_view_consoles())
+
+    @django.test.utils.override_settings(
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False},
+        CONSOLE_TYPE=None)
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'port_list'),
+                        i_console: ('get_console',)})
+    def test_json_view_console_disabled(self):
+        self._stub_json_view_console()
+        self.mox.ReplayAll()
+
+        self.assertEqual(self._expected_consoles(None),
+                         self._get_json_view_consoles())
+
 
 class NetworkTopologyCreateTests(test.TestCase):
 
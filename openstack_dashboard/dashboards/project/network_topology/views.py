@@ -16,19 +16,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import json
+import functools
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
-from django.http import HttpResponse  # noqa
+from django.http import StreamingHttpResponse  # noqa
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View  # noqa
 
 from horizon import exceptions
+from horizon.utils import parallel
 from horizon import views
 
 from openstack_dashboard import api
+from openstack_dashboard.api.rest import utils as rest_utils
 from openstack_dashboard.usage import quotas
 
 from openstack_dashboard.dashboards.project.network_topology.instances \
@@ -44,6 +47,8 @@ from openstack_dashboard.dashboards.project.network_topology.subnets \
 
 from openstack_dashboard.dashboards.project.instances import\
     console as i_console
+from openstack_dashboard.dashboards.project.instances import\
+    tables as i_tables
 from openstack_dashboard.dashboards.project.instances import\
     views as i_views
 from openstack_dashboard.dashboards.project.instances.workflows import\
@@ -62,6 +67,10 @@ from openstack_dashboard.dashboards.project.routers import\
     views as r_views
 
 
+# The types of console the hypervisors support rarely change.
+CONSOLE_TYPE_CACHE_TIMEOUT = 3600
+
+
 class NTAddInterfaceView(p_views.AddInterfaceView):
     success_url = "horizon:project:network_topology:index"
     failure_url = "horizon:project:network_topology:index"
@@ -204,6 +213,37 @@ class JSONView(View):
                 return True
         return False
 
+    def _get_console_type(self, request, servers):
+        """Return the type of console to link the servers to.
+
+        A specific ``CONSOLE_TYPE`` is used as is. With ``AUTO``, the types
+        of console available are checked on a single server and the result
+        is cached for the region, instead of asking Nova for the console of
+        every server on each refresh. The console itself is only retrieved
+        when it is opened.
+        """
+        console_type = getattr(settings, 'CONSOLE_TYPE', 'AUTO')
+        if not console_type:
+            return None
+        if console_type != 'AUTO':
+            if console_type not in i_console.CONSOLES:
+                return None
+            return console_type
+        if not servers:
+            return None
+
+        cache_key = ('network_topology:console_type:%s'
+                     % request.user.services_region)
+        console_type = cache.get(cache_key)
+        if console_type is None:
+            try:
+                console_type = i_console.get_console(
+                    request, 'AUTO', servers[0])[0]
+            except exceptions.NotAvailable:
+                return None
+            cache.set(cache_key, console_type, CONSOLE_TYPE_CACHE_TIMEOUT)
+        return console_type
+
     def _get_servers(self, request):
         # Get nova data
         try:
@@ -211,14 +251,17 @@ class JSONView(View):
         except Exception:
             servers = []
         data = []
-        console_type = getattr(settings, 'CONSOLE_TYPE', 'AUTO')
-        # lowercase of the keys will be used at the end of the console URL.
+        # Consoles are only available for running instances.
+        running = [server for server in servers
+                   if server.status in i_tables.ACTIVE_STATES and
+                   not i_tables.is_deleting(server)]
+        console_type = self._get_console_type(request, running)
+        running_ids = set(server.id for server in running)
         for server in servers:
-            try:
-                console = i_console.get_console(
-                    request, console_type, server)[0].lower()
-            except exceptions.NotAvailable:
-                console = None
+            console = None
+            # lowercase of the keys will be used at the end of the console URL.
+            if console_type and server.id in running_ids:
+                console = console_type.lower()
 
             server_data = {'name': server.name,
                            'status': server.status,
@@ -349,10 +392,21 @@ class JSONView(View):
             ports.append(fake_port)
 
     def get(self, request, *args, **kwargs):
-        data = {'servers': self._get_servers(request),
-                'networks': self._get_networks(request),
-                'ports': self._get_ports(request),
-                'routers': self._get_routers(request)}
+        results = parallel.call_parallel({
+            'servers': functools.partial(self._get_servers, request),
+            'networks': functools.partial(self._get_networks, request),
+            'ports': functools.partial(self._get_ports, request),
+            'routers': functools.partial(self._get_routers, request)})
+        data = {}
+        for key, result in results.items():
+            # API errors are already turned into empty lists by the
+            # methods above; treat a call which timed out the same way.
+            try:
+                data[key] = result.get()
+            except exceptions.Timeout:
+                data[key] = []
         self._prepare_gateway_ports(data['routers'], data['ports'])
-        json_string = json.dumps(data, ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+        # Large topologies are encoded while they are sent.
+        return StreamingHttpResponse(
+            rest_utils.iter_json(data, ensure_ascii=False),
+            content_type='text/json')
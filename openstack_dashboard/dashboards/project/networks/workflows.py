@@ -27,6 +27,7 @@ from horizon import workflows
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.networks.subnets import utils
+from openstack_dashboard.usage import quotas
 
 
 LOG = logging.getLogger(__name__)
@@ -474,6 +475,7 @@ class CreateNetwork(workflows.Workflow):
             if api.neutron.is_port_profiles_supported():
                 params['net_profile_id'] = data['net_profile_id']
             network = api.neutron.network_create(request, **params)
+            quotas.invalidate_tenant_quota_usages(request)
             self.context['net_id'] = network.id
             msg = (_('Network "%s" was successfully created.') %
                    network.name_or_id)
@@ -548,6 +550,7 @@ class CreateNetwork(workflows.Workflow):
             self._setup_subnet_parameters(params, data)
 
             subnet = api.neutron.subnet_create(request, **params)
+            quotas.invalidate_tenant_quota_usages(request, tenant_id)
             self.context['subnet_id'] = subnet.id
             msg = _('Subnet "%s" was successfully created.') % data['cidr']
             LOG.debug(msg)
@@ -569,6 +572,7 @@ class CreateNetwork(workflows.Workflow):
         """Delete the created network when subnet creation failed."""
         try:
             api.neutron.network_delete(request, network.id)
+            quotas.invalidate_tenant_quota_usages(request)
             msg = _('Delete the created network "%s" '
                     'due to subnet creation failure.') % network.name
             LOG.debug(msg)
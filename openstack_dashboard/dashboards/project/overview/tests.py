@@ -184,7 +184,11 @@ class UsageViewTests(test.TestCase):
         res = self.client.get(reverse('horizon:project:overview:index') +
                               "?format=csv")
         self.assertTemplateUsed(res, 'project/overview/usage.csv')
+        self.assertTrue(res.streaming)
         self.assertTrue(isinstance(res.context['usage'], usage.ProjectUsage))
+        hdr = ('Instance Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours),'
+               'Time since created (Seconds),State')
+        self.assertContains(res, '%s\r\n' % hdr)
 
     def test_usage_exception_usage(self):
         self._stub_nova_api_calls(stu_exception=self.exceptions.nova)
@@ -27,7 +27,7 @@ from horizon import views
 from openstack_dashboard import usage
 
 
-class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
+class ProjectUsageCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Instance Name"), _("VCPUs"), _("RAM (MB)"),
                _("Disk (GB)"), _("Usage (Hours)"),
@@ -35,7 +35,7 @@ class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
 
     def get_row_data(self):
 
-        for inst in self.context['usage'].get_instances():
+        for inst in self.context['usage'].iter_instances():
             yield (inst['name'],
                    inst['vcpus'],
                    inst['memory_mb'],
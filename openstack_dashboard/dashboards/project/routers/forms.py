@@ -27,6 +27,7 @@ from horizon import forms
 from horizon import messages
 
 from openstack_dashboard import api
+from openstack_dashboard.usage import quotas
 
 LOG = logging.getLogger(__name__)
 
@@ -99,6 +100,7 @@ class CreateForm(forms.SelfHandlingForm):
             if (self.ha_allowed and data['ha'] != 'server_default'):
                 params['ha'] = (data['ha'] == 'enabled')
             router = api.neutron.router_create(request, **params)
+            quotas.invalidate_tenant_quota_usages(request)
             message = _('Router %s was successfully created.') % data['name']
             messages.success(request, message)
             return router
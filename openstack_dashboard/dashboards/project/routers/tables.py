@@ -54,6 +54,7 @@ class DeleteRouter(policy.PolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("network", "delete_router"),)
 
     def delete(self, request, obj_id):
+        router = self.table.get_object_by_id(obj_id)
         try:
             # detach all interfaces before attempting to delete the router
             search_opts = {'device_owner': 'network:router_interface',
@@ -63,6 +64,8 @@ class DeleteRouter(policy.PolicyTargetMixin, tables.DeleteAction):
                 api.neutron.router_remove_interface(request, obj_id,
                                                     port_id=port.id)
             api.neutron.router_delete(request, obj_id)
+            quotas.invalidate_tenant_quota_usages(
+                request, getattr(router, 'tenant_id', None))
         except q_ext.NeutronClientException as e:
             msg = _('Unable to delete router "%s"') % e
             LOG.info(msg)
@@ -70,8 +73,7 @@ class DeleteRouter(policy.PolicyTargetMixin, tables.DeleteAction):
             redirect = reverse(self.redirect_url)
             raise exceptions.Http302(redirect, message=msg)
         except Exception:
-            obj = self.table.get_object_by_id(obj_id)
-            name = self.table.get_object_display(obj)
+            name = self.table.get_object_display(router)
             msg = _('Unable to delete router "%s"') % name
             LOG.info(msg)
             exceptions.handle(request, msg)
@@ -25,6 +25,7 @@ from openstack_dashboard import api
 from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 
 from openstack_dashboard.dashboards.project.volumes \
     .volumes import tables as volume_tables
@@ -71,7 +72,12 @@ class DeleteVolumeSnapshot(policy.PolicyTargetMixin, tables.DeleteAction):
                             'os-extended-snapshot-attributes:project_id'),)
 
     def delete(self, request, obj_id):
+        snapshot = self.table.get_object_by_id(obj_id)
         api.cinder.volume_snapshot_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(
+            request,
+            getattr(snapshot, 'os-extended-snapshot-attributes:project_id',
+                    None))
 
 
 class EditVolumeSnapshot(policy.PolicyTargetMixin, tables.LinkAction):
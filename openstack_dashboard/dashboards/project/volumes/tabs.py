@@ -18,6 +18,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import tabs
+from horizon.utils import parallel
 
 from openstack_dashboard import api
 
@@ -30,39 +31,72 @@ from openstack_dashboard.dashboards.project.volumes.volumes \
 
 
 class VolumeTableMixIn(object):
+    _has_more_data = False
+    _has_prev_data = False
+
+    def _get_marker(self):
+        prev_marker = self.request.GET.get(
+            volume_tables.VolumesTable._meta.prev_pagination_param, None)
+        if prev_marker is not None:
+            return prev_marker, "asc"
+        marker = self.request.GET.get(
+            volume_tables.VolumesTable._meta.pagination_param, None)
+        return marker, "desc"
+
     def _get_volumes(self, search_opts=None):
         try:
-            return api.cinder.volume_list(self.request,
-                                          search_opts=search_opts)
+            marker, sort_dir = self._get_marker()
+            volumes, self._has_more_data, self._has_prev_data = \
+                api.cinder.volume_list_paged(self.request,
+                                             marker=marker,
+                                             search_opts=search_opts,
+                                             sort_dir=sort_dir,
+                                             paginate=True)
+            if sort_dir == "asc":
+                volumes.reverse()
+            return volumes
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve volume list.'))
             return []
 
-    def _get_instances(self, search_opts=None):
+    def _get_instances(self, volumes):
+        # Only the instances the volumes are attached to are needed.
+        instance_ids = set(att.get('server_id') for volume in volumes
+                           for att in volume.attachments)
+        instance_ids.discard(None)
+        if not instance_ids:
+            return []
         try:
-            instances, has_more = api.nova.server_list(self.request,
-                                                       search_opts=search_opts)
-            return instances
+            return api.nova.server_get_by_ids(self.request,
+                                              instance_ids).values()
         except Exception:
             exceptions.handle(self.request,
                               _("Unable to retrieve volume/instance "
                                 "attachment information"))
             return []
 
-    def _get_volumes_ids_with_snapshots(self, search_opts=None):
-        try:
-            volume_ids = []
-            snapshots = api.cinder.volume_snapshot_list(
-                self.request, search_opts=search_opts)
-            if snapshots:
-                # extract out the volume ids
-                volume_ids = set([(s.volume_id) for s in snapshots])
-        except Exception:
-            exceptions.handle(self.request,
-                              _("Unable to retrieve snapshot list."))
+    def _get_volumes_ids_with_snapshots(self, volumes, search_opts=None):
+        # Cinder filters snapshots by a single volume ID, so the volumes
+        # shown are queried concurrently instead of listing every snapshot.
+        def get_snapshots(volume_id):
+            opts = dict(search_opts or {}, volume_id=volume_id)
+            return api.cinder.volume_snapshot_list(self.request,
+                                                   search_opts=opts)
+
+        volume_ids = [volume.id for volume in volumes]
+        results = parallel.map_parallel(get_snapshots, volume_ids)
+        volume_ids_with_snapshots = set()
+        for volume_id, result in zip(volume_ids, results):
+            try:
+                if result.get():
+                    volume_ids_with_snapshots.add(volume_id)
+            except Exception:
+                exceptions.handle(self.request,
+                                  _("Unable to retrieve snapshot list."))
+                break
 
-        return volume_ids
+        return volume_ids_with_snapshots
 
     # set attachment string and if volume has snapshots
     def _set_volume_attributes(self,
@@ -88,12 +122,19 @@ class VolumeTab(tabs.TableTab, VolumeTableMixIn):
 
     def get_volumes_data(self):
         volumes = self._get_volumes()
-        instances = self._get_instances()
-        volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots()
+        instances = self._get_instances(volumes)
+        volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots(
+            volumes)
         self._set_volume_attributes(
             volumes, instances, volume_ids_with_snapshots)
         return volumes
 
+    def has_prev_data(self, table):
+        return self._has_prev_data
+
+    def has_more_data(self, table):
+        return self._has_more_data
+
 
 class SnapshotTab(tabs.TableTab):
     table_classes = (vol_snapshot_tables.VolumeSnapshotsTable,)
@@ -29,24 +29,31 @@ VOLUME_BACKUPS_TAB_URL = reverse('horizon:project:volumes:backups_tab')
 class VolumeAndSnapshotsTests(test.TestCase):
     @test.create_stubs({api.cinder: ('tenant_absolute_limits',
                                      'volume_list',
+                                     'volume_list_paged',
                                      'volume_snapshot_list',
                                      'volume_backup_supported',
                                      'volume_backup_list',
                                      ),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get_by_ids',)})
     def _test_index(self, backup_supported=True):
         vol_backups = self.cinder_volume_backups.list()
         vol_snaps = self.cinder_volume_snapshots.list()
         volumes = self.cinder_volumes.list()
+        servers = dict((s.id, s) for s in self.servers.list()[:2])
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)).\
             MultipleTimes().AndReturn(backup_supported)
-        api.cinder.volume_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn(volumes)
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
-        api.cinder.volume_snapshot_list(
-            IsA(http.HttpRequest), search_opts=None).AndReturn(vol_snaps)
+        api.cinder.volume_list_paged(
+            IsA(http.HttpRequest), marker=None, search_opts=None,
+            sort_dir='desc', paginate=True).\
+            AndReturn([volumes, False, False])
+        api.nova.server_get_by_ids(IsA(http.HttpRequest), set(servers)).\
+            AndReturn(servers)
+        for volume in volumes:
+            api.cinder.volume_snapshot_list(
+                IsA(http.HttpRequest), search_opts={'volume_id': volume.id}).\
+                InAnyOrder().AndReturn(
+                    [s for s in vol_snaps if s.volume_id == volume.id])
         api.cinder.volume_snapshot_list(IsA(http.HttpRequest)).\
             AndReturn(vol_snaps)
         api.cinder.volume_list(IsA(http.HttpRequest)).AndReturn(volumes)
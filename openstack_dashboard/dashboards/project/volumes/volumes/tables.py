@@ -31,6 +31,7 @@ from horizon import tables
 from openstack_dashboard import api
 from openstack_dashboard.api import cinder
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 
 
 DELETABLE_STATES = ("available", "error", "error_extending")
@@ -82,7 +83,10 @@ class DeleteVolume(VolumePolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("volume", "volume:delete"),)
 
     def delete(self, request, obj_id):
+        volume = self.table.get_object_by_id(obj_id)
         cinder.volume_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(
+            request, getattr(volume, 'os-vol-tenant-attr:tenant_id', None))
 
     def allowed(self, request, volume=None):
         if volume:
@@ -296,11 +300,49 @@ class DeleteTransfer(VolumePolicyTargetMixin, tables.Action):
 
 class UpdateRow(tables.Row):
     ajax = True
+    all_tenants = False
+    # Fewer polled volumes than this are looked up one by one rather than
+    # by listing a page of volumes.
+    min_ids_to_list = 3
 
     def get_data(self, request, volume_id):
         volume = cinder.volume_get(request, volume_id)
         return volume
 
+    def get_data_for_ids(self, request, volume_ids):
+        if len(volume_ids) < self.min_ids_to_list:
+            return super(UpdateRow, self).get_data_for_ids(request,
+                                                           volume_ids)
+
+        search_opts = {'all_tenants': True} if self.all_tenants else None
+        volumes, has_more, has_prev = cinder.volume_list_paged(
+            request, search_opts=search_opts, paginate=True)
+        volumes = [volume for volume in volumes if volume.id in volume_ids]
+
+        instance_ids = set(attachment.get('server_id') for volume in volumes
+                           for attachment in volume.attachments)
+        instance_ids.discard(None)
+        if instance_ids:
+            try:
+                instances = api.nova.server_get_by_ids(request, instance_ids)
+            except Exception:
+                instances = {}
+                exceptions.handle(request, ignore=True)
+            for volume in volumes:
+                for attachment in volume.attachments:
+                    attachment['instance'] = instances.get(
+                        attachment.get('server_id'))
+
+        # Volumes the list left out, e.g. because they are past its first
+        # page or they are gone, are looked up one by one.
+        found = set(volume.id for volume in volumes)
+        missing = [volume_id for volume_id in volume_ids
+                   if volume_id not in found]
+        if missing:
+            volumes.extend(super(UpdateRow, self).get_data_for_ids(
+                request, missing))
+        return volumes
+
 
 def get_size(volume):
     return _("%sGB") % volume.size
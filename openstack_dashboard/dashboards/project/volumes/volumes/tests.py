@@ -16,6 +16,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+from cinderclient import exceptions as cinder_exceptions
 import django
 from django.core.urlresolvers import reverse
 from django.forms import widgets
@@ -39,6 +42,28 @@ SEARCH_OPTS = dict(status=api.cinder.VOLUME_STATE_AVAILABLE)
 
 
 class VolumeViewTests(test.TestCase):
+    def _stub_volumes_tab(self, volumes, marker=None, sort_dir='desc',
+                          has_more=False, has_prev=False):
+        # The volumes tab loads a page of volumes, only the instances they
+        # are attached to and, for each volume, whether it has snapshots.
+        servers = dict((s.id, s) for s in self.servers.list())
+        server_ids = set(att.get('server_id') for volume in volumes
+                         for att in volume.attachments)
+        server_ids.discard(None)
+        cinder.volume_list_paged(IsA(http.HttpRequest), marker=marker,
+                                 search_opts=None, sort_dir=sort_dir,
+                                 paginate=True).\
+            AndReturn([list(volumes), has_more, has_prev])
+        if server_ids:
+            api.nova.server_get_by_ids(IsA(http.HttpRequest), server_ids).\
+                AndReturn(dict((server_id, servers[server_id])
+                               for server_id in server_ids
+                               if server_id in servers))
+        for volume in volumes:
+            cinder.volume_snapshot_list(IsA(http.HttpRequest),
+                                        search_opts={'volume_id': volume.id}).\
+                InAnyOrder().AndReturn([])
+
     @test.create_stubs({cinder: ('volume_create',
                                  'volume_snapshot_list',
                                  'volume_type_list',
@@ -72,12 +97,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.availability_zone_list(IsA(http.HttpRequest)).AndReturn(
             self.cinder_availability_zones.list())
@@ -142,12 +167,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.availability_zone_list(IsA(http.HttpRequest)).AndReturn(
             self.cinder_availability_zones.list())
@@ -208,12 +233,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.volume_list(IsA(
             http.HttpRequest),
@@ -337,12 +362,12 @@ class VolumeViewTests(test.TestCase):
             self.cinder_availability_zones.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
 
         cinder.volume_create(IsA(http.HttpRequest),
@@ -396,12 +421,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.volume_list(IsA(
             http.HttpRequest),
@@ -566,12 +591,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.volume_list(IsA(
             http.HttpRequest),
@@ -747,12 +772,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.volume_list(IsA(
             http.HttpRequest),
@@ -804,12 +829,12 @@ class VolumeViewTests(test.TestCase):
             AndReturn(self.cinder_volume_snapshots.list())
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
-            filters={'is_public': True, 'status': 'active'}) \
+            filters={'is_public': True, 'status': 'active'}).InAnyOrder() \
             .AndReturn([self.images.list(), False, False])
         api.glance.image_list_detailed(
             IsA(http.HttpRequest),
             filters={'property-owner_id': self.tenant.id,
-                     'status': 'active'}) \
+                     'status': 'active'}).InAnyOrder() \
             .AndReturn([[], False, False])
         cinder.volume_list(IsA(
             http.HttpRequest),
@@ -831,11 +856,11 @@ class VolumeViewTests(test.TestCase):
         self.assertEqual(res.context['form'].errors['__all__'], expected_error)
 
     @test.create_stubs({cinder: ('tenant_absolute_limits',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',
                                  'volume_delete',),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get_by_ids',)})
     def test_delete_volume(self):
         volumes = self.cinder_volumes.list()
         volume = self.cinder_volumes.first()
@@ -844,21 +869,9 @@ class VolumeViewTests(test.TestCase):
 
         cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
+        self._stub_volumes_tab(volumes)
         cinder.volume_delete(IsA(http.HttpRequest), volume.id)
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
+        self._stub_volumes_tab(volumes)
         cinder.tenant_absolute_limits(IsA(http.HttpRequest)).MultipleTimes().\
             AndReturn(self.cinder_limits['absolute'])
 
@@ -892,6 +905,42 @@ class VolumeViewTests(test.TestCase):
         self.assertNotContains(res, 'Delete Volume')
         self.assertNotContains(res, 'delete')
 
+    @test.create_stubs({cinder: ('volume_list_paged',
+                                 'volume_get',
+                                 'tenant_absolute_limits'),
+                        api.nova: ('server_get_by_ids',)})
+    def test_rows_update(self):
+        volumes = self.cinder_volumes.list()
+        attached_volume = volumes[2]
+        volume = volumes[0]
+        server = self.servers.first()
+
+        cinder.volume_list_paged(IsA(http.HttpRequest), search_opts=None,
+                                 paginate=True).\
+            AndReturn([volumes, False, False])
+        api.nova.server_get_by_ids(IsA(http.HttpRequest), set(['1'])).\
+            AndReturn({'1': server})
+        # Volumes missing from the list are looked up one by one
+        cinder.volume_get(IsA(http.HttpRequest), 'gone').\
+            AndRaise(cinder_exceptions.NotFound(404))
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)).MultipleTimes().\
+            AndReturn(self.cinder_limits['absolute'])
+
+        self.mox.ReplayAll()
+
+        url = (VOLUME_INDEX_URL +
+               "?action=rows_update&table=volumes&obj_id=%s&obj_id=%s"
+               "&obj_id=gone" % (attached_volume.id, volume.id))
+        res = self.client.get(url, {}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(res.status_code, 200)
+        data = json.loads(res.content.decode('utf-8'))
+        self.assertEqual(['gone'], data['deleted'])
+        self.assertEqual(2, len(data['rows']))
+        self.assertIn(volume.id, data['rows'][0])
+        self.assertIn(attached_volume.id, data['rows'][1])
+        self.assertIn(server.name, data['rows'][1])
+
     @test.create_stubs({cinder: ('volume_get',), api.nova: ('server_list',)})
     @override_settings(OPENSTACK_HYPERVISOR_FEATURES={'can_set_mount_point':
                                                       True})
@@ -1029,10 +1078,50 @@ class VolumeViewTests(test.TestCase):
             msg_prefix="The create snapshot button is not disabled")
 
     @test.create_stubs({cinder: ('tenant_absolute_limits',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get_by_ids',)})
+    def test_index_paginated(self):
+        volumes = self.cinder_volumes.list()
+        cinder.volume_backup_supported(IsA(http.HttpRequest)).\
+            MultipleTimes().AndReturn(False)
+        self._stub_volumes_tab(volumes[:2], has_more=True)
+        self._stub_volumes_tab(volumes[2:4], marker=volumes[1].id,
+                               has_more=True, has_prev=True)
+        # Going back, the previous page is requested in reverse order
+        self._stub_volumes_tab(volumes[1::-1], marker=volumes[2].id,
+                               sort_dir='asc', has_more=True)
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)).\
+            MultipleTimes().AndReturn(self.cinder_limits['absolute'])
+        self.mox.ReplayAll()
+
+        res = self.client.get(VOLUME_INDEX_URL)
+        table = res.context['volumes_table']
+        self.assertItemsEqual(volumes[:2], table.data)
+        self.assertTrue(table.has_more_data())
+        self.assertFalse(table.has_prev_data())
+        self.assertContains(res, 'marker=%s' % volumes[1].id)
+
+        res = self.client.get(VOLUME_INDEX_URL,
+                              {'marker': volumes[1].id})
+        table = res.context['volumes_table']
+        self.assertItemsEqual(volumes[2:4], table.data)
+        self.assertTrue(table.has_more_data())
+        self.assertTrue(table.has_prev_data())
+
+        res = self.client.get(VOLUME_INDEX_URL,
+                              {'prev_marker': volumes[2].id})
+        table = res.context['volumes_table']
+        self.assertEqual(volumes[:2], table.data)
+        self.assertTrue(table.has_more_data())
+        self.assertFalse(table.has_prev_data())
+
+    @test.create_stubs({cinder: ('tenant_absolute_limits',
+                                 'volume_list_paged',
+                                 'volume_snapshot_list',
+                                 'volume_backup_supported',),
+                        api.nova: ('server_get_by_ids',)})
     def test_create_button_disabled_when_quota_exceeded(self):
         limits = self.cinder_limits['absolute']
         limits['totalVolumesUsed'] = limits['maxTotalVolumes']
@@ -1040,13 +1129,7 @@ class VolumeViewTests(test.TestCase):
 
         api.cinder.volume_backup_supported(IsA(http.HttpRequest)). \
             MultipleTimes().AndReturn(True)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn([self.servers.list(), False])
+        self._stub_volumes_tab(volumes)
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(limits)
         self.mox.ReplayAll()
@@ -1439,11 +1522,11 @@ class VolumeViewTests(test.TestCase):
     def test_encryption_true(self):
         self._test_encryption(True)
 
-    @test.create_stubs({cinder: ('volume_list',
+    @test.create_stubs({cinder: ('volume_list_paged',
                                  'volume_snapshot_list',
                                  'volume_backup_supported',
                                  'tenant_absolute_limits'),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get_by_ids',)})
     def _test_encryption(self, encryption):
         volumes = self.volumes.list()
         for volume in volumes:
@@ -1452,13 +1535,7 @@ class VolumeViewTests(test.TestCase):
 
         cinder.volume_backup_supported(IsA(http.HttpRequest))\
             .MultipleTimes('backup_supported').AndReturn(False)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(self.volumes.list())
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn(self.cinder_volume_snapshots.list())
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn([self.servers.list(), False])
+        self._stub_volumes_tab(self.volumes.list())
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
             .MultipleTimes('limits').AndReturn(limits)
 
@@ -1504,22 +1581,16 @@ class VolumeViewTests(test.TestCase):
                              "have 80GB of your quota available.")
 
     @test.create_stubs({cinder: ('volume_backup_supported',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'tenant_absolute_limits'),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get_by_ids',)})
     def test_create_transfer_availability(self):
         limits = self.cinder_limits['absolute']
 
         cinder.volume_backup_supported(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(False)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(self.volumes.list())
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None)\
-                .AndReturn([self.servers.list(), False])
+        self._stub_volumes_tab(self.volumes.list())
         cinder.tenant_absolute_limits(IsA(http.HttpRequest))\
               .MultipleTimes().AndReturn(limits)
 
@@ -1556,11 +1627,11 @@ class VolumeViewTests(test.TestCase):
         self.assertNoFormErrors(res)
 
     @test.create_stubs({cinder: ('volume_backup_supported',
-                                 'volume_list',
+                                 'volume_list_paged',
                                  'volume_snapshot_list',
                                  'transfer_delete',
                                  'tenant_absolute_limits'),
-                        api.nova: ('server_list',)})
+                        api.nova: ('server_get_by_ids',)})
     def test_delete_transfer(self):
         transfer = self.cinder_volume_transfers.first()
         volumes = []
@@ -1576,14 +1647,8 @@ class VolumeViewTests(test.TestCase):
 
         cinder.volume_backup_supported(IsA(http.HttpRequest))\
             .MultipleTimes().AndReturn(False)
-        cinder.volume_list(IsA(http.HttpRequest), search_opts=None)\
-            .AndReturn(volumes)
-        cinder.volume_snapshot_list(IsA(http.HttpRequest),
-                                    search_opts=None).\
-            AndReturn([])
+        self._stub_volumes_tab(volumes)
         cinder.transfer_delete(IsA(http.HttpRequest), transfer.id)
-        api.nova.server_list(IsA(http.HttpRequest), search_opts=None).\
-            AndReturn([self.servers.list(), False])
         cinder.tenant_absolute_limits(IsA(http.HttpRequest)).MultipleTimes().\
             AndReturn(self.cinder_limits['absolute'])
 
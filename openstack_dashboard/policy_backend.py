@@ -13,10 +13,15 @@
 
 """Policy engine for Horizon"""
 
+import collections
+import hashlib
+import json
 import logging
 import os.path
+import threading
 
 from django.conf import settings
+from django.core.cache import cache
 from openstack_auth import utils as auth_utils
 from oslo_config import cfg
 
@@ -35,6 +40,12 @@ CONF.policy_dirs = []
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
 
+PolicyCacheInfo = collections.namedtuple(
+    'PolicyCacheInfo', ['hits', 'shared_hits', 'misses', 'enforcements'])
+
+_STATS = collections.Counter()
+_STATS_LOCK = threading.Lock()
+
 
 def _get_enforcer():
     global _ENFORCER
@@ -59,6 +70,26 @@ def _get_enforcer():
 def reset():
     global _ENFORCER
     _ENFORCER = None
+    with _STATS_LOCK:
+        _STATS.clear()
+
+
+def cache_stats():
+    """Return how the policy decisions made so far were answered.
+
+    ``hits`` were answered from the decisions already made for the same
+    request, ``shared_hits`` from the cross-request tier (see
+    ``POLICY_DECISION_CACHE_TIMEOUT``), and ``misses`` had to be evaluated,
+    which took ``enforcements`` calls to the policy engine.
+    """
+    with _STATS_LOCK:
+        return PolicyCacheInfo(_STATS['hits'], _STATS['shared_hits'],
+                               _STATS['misses'], _STATS['enforcements'])
+
+
+def _count(name, value=1):
+    with _STATS_LOCK:
+        _STATS[name] += value
 
 
 def check(actions, request, target=None):
@@ -126,28 +157,139 @@ def check(actions, request, target=None):
 
     enforcer = _get_enforcer()
 
+    # Tables check the same few rules against every row they render, so the
+    # decisions are remembered for the rest of the request.
+    decisions = getattr(request, '_policy_decisions', None)
+    if not isinstance(decisions, dict):
+        decisions = {}
+        try:
+            request._policy_decisions = decisions
+        except AttributeError:
+            pass
+    try:
+        target_key = tuple(sorted(target.items()))
+        hash(target_key)
+    except TypeError:
+        # Unhashable values in the target; decide without caching.
+        target_key = None
+    fingerprint = _credentials_fingerprint(user, credentials)
+
     for action in actions:
         scope, action = action[0], action[1]
         if scope in enforcer:
-            # if any check fails return failure
-            if not enforcer[scope].enforce(action, target, credentials):
-                # to match service implementations, if a rule is not found,
-                # use the default rule for that service policy
-                #
-                # waiting to make the check because the first call to
-                # enforce loads the rules
-                if action not in enforcer[scope].rules:
-                    if not enforcer[scope].enforce('default',
-                                                   target, credentials):
-                        return False
+            if target_key is None:
+                allowed = _enforce(enforcer[scope], action, target,
+                                   credentials)
+            else:
+                key = (scope, action, target_key, fingerprint)
+                allowed = decisions.get(key)
+                if allowed is None:
+                    allowed = _cached_enforce(enforcer[scope], scope,
+                                              action, target, credentials,
+                                              fingerprint)
+                    decisions[key] = allowed
                 else:
-                    return False
+                    _count('hits')
+            # if any check fails return failure
+            if not allowed:
+                return False
         # if no policy for scope, allow action, underlying API will
         # ultimately block the action if not permitted, treat as though
         # allowed
     return True
 
 
+def _enforce(enforcer, action, target, credentials):
+    _count('misses')
+    _count('enforcements')
+    if enforcer.enforce(action, target, credentials):
+        return True
+    # to match service implementations, if a rule is not found,
+    # use the default rule for that service policy
+    #
+    # waiting to make the check because the first call to
+    # enforce loads the rules
+    if action not in enforcer.rules:
+        _count('enforcements')
+        return bool(enforcer.enforce('default', target, credentials))
+    return False
+
+
+def _cached_enforce(enforcer, scope, action, target, credentials,
+                    fingerprint):
+    """Decide ``action``, sharing the decision between requests if possible.
+
+    Rules which only look at the credentials (roles, ``is_admin`` and the
+    like) give the same answer for every target, so their decisions can be
+    kept in Django's cache for ``POLICY_DECISION_CACHE_TIMEOUT`` seconds.
+    """
+    timeout = getattr(settings, 'POLICY_DECISION_CACHE_TIMEOUT', 0)
+    if not timeout:
+        return _enforce(enforcer, action, target, credentials)
+
+    key = 'policy:%s:%s:%s' % (scope, hashlib.md5(action.encode('utf-8'))
+                               .hexdigest(), fingerprint)
+    allowed = cache.get(key)
+    if allowed is not None:
+        _count('shared_hits')
+        return allowed
+    allowed = _enforce(enforcer, action, target, credentials)
+    if not _rule_uses_target(enforcer, action):
+        cache.set(key, allowed, timeout)
+    return allowed
+
+
+def _rule_uses_target(enforcer, action):
+    """Whether the decision for ``action`` can depend on the target."""
+    # The rules have been loaded by the enforce() call deciding the action.
+    names = [action]
+    if action not in enforcer.rules:
+        names.append('default')
+    for name in names:
+        try:
+            rule = enforcer.rules[name]
+        except KeyError:
+            # Missing rules fail closed whatever the target is.
+            continue
+        if _check_uses_target(enforcer, rule, (name,)):
+            return True
+    return False
+
+
+def _check_uses_target(enforcer, rule, seen):
+    if isinstance(rule, policy.RuleCheck):
+        if rule.match in seen:
+            return True
+        try:
+            referenced = enforcer.rules[rule.match]
+        except KeyError:
+            return False
+        return _check_uses_target(enforcer, referenced,
+                                  seen + (rule.match,))
+    if isinstance(rule, policy.NotCheck):
+        return _check_uses_target(enforcer, rule.rule, seen)
+    if isinstance(rule, (policy.AndCheck, policy.OrCheck)):
+        return any(_check_uses_target(enforcer, r, seen) for r in rule.rules)
+    if isinstance(rule, policy.Check):
+        # Only the match of a check is interpolated with the target, but
+        # http checks send the whole target to the remote server.
+        return rule.kind == 'http' or '%(' in rule.match
+    # The "@" and "!" checks always and never pass.
+    return str(rule) not in ('@', '!')
+
+
+def _credentials_fingerprint(user, credentials):
+    if not hasattr(user, "_credentials_fingerprint"):
+        # The token is left out: it changes on every login but no sensible
+        # rule looks at it, and including it would defeat the shared tier.
+        data = dict((k, v) for k, v in credentials.items() if k != 'token')
+        data['roles'] = sorted(data.get('roles') or [])
+        user._credentials_fingerprint = hashlib.md5(
+            json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+    return user._credentials_fingerprint
+
+
 def _user_to_credentials(request, user):
     if not hasattr(user, "_credentials"):
         roles = [role['name'] for role in user.roles]
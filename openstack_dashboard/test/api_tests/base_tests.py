@@ -19,6 +19,8 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+from django.test.utils import override_settings
+import mock
 
 from horizon import exceptions
 
@@ -283,3 +285,71 @@ class QuotaSetTests(test.TestCase):
     def test_quotaset_add_with_wrong_type(self):
         quota_set = api_base.QuotaSet({'foo': 1, 'bar': 10})
         self.assertRaises(ValueError, quota_set.add, {'test': 7})
+
+
+class ApiCacheTests(test.TestCase):
+
+    def setUp(self):
+        super(ApiCacheTests, self).setUp()
+        self.calls = []
+
+        @api_base.cached_api_call('test.call', scope=('project',))
+        def call(request, arg):
+            self.calls.append(arg)
+            return [arg, len(self.calls)]
+        self.call = call
+
+    def _request(self, project_id='1', region='RegionOne'):
+        request = mock.Mock()
+        request.user.project_id = project_id
+        request.user.services_region = region
+        request.user.roles = [{'name': 'member'}]
+        return request
+
+    def test_cached_across_requests(self):
+        self.assertEqual(['a', 1], self.call(self._request(), 'a'))
+        self.assertEqual(['a', 1], self.call(self._request(), 'a'))
+        self.assertEqual(['a'], self.calls)
+
+    def test_cached_per_argument_region_and_scope(self):
+        self.call(self._request(), 'a')
+        self.call(self._request(), 'b')
+        self.call(self._request(project_id='2'), 'a')
+        self.call(self._request(region='RegionTwo'), 'a')
+        self.assertEqual(['a', 'b', 'a', 'a'], self.calls)
+
+    def test_cached_per_endpoint(self):
+        @api_base.cached_api_call('test.service_call', service='image')
+        def call(request):
+            self.calls.append(request.endpoint)
+            return len(self.calls)
+
+        for endpoint in ('http://image-a', 'http://image-a',
+                         'http://image-b'):
+            request = self._request()
+            request.endpoint = endpoint
+            with mock.patch.object(api_base, 'url_for',
+                                   return_value=endpoint):
+                call(request)
+        self.assertEqual(['http://image-a', 'http://image-b'], self.calls)
+
+    def test_invalidate(self):
+        self.call(self._request(), 'a')
+        self.call(self._request(project_id='2'), 'a')
+        api_base.invalidate_api_cache(self._request(), 'test.call')
+        self.assertEqual(['a', 3], self.call(self._request(), 'a'))
+        self.assertEqual(['a', 4], self.call(self._request(project_id='2'),
+                                             'a'))
+
+    def test_invalidate_other_region(self):
+        self.call(self._request(), 'a')
+        api_base.invalidate_api_cache(self._request(region='RegionTwo'),
+                                      'test.call')
+        self.call(self._request(), 'a')
+        self.assertEqual(['a'], self.calls)
+
+    @override_settings(API_RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.call(self._request(), 'a')
+        self.call(self._request(), 'a')
+        self.assertEqual(['a', 'a'], self.calls)
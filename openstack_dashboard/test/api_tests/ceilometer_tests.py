@@ -13,6 +13,7 @@
 # under the License.
 
 from django import http
+from django.test.utils import override_settings
 
 from mox3.mox import IsA  # noqa
 
@@ -319,3 +320,43 @@ class CeilometerApiTests(test.APITestCase):
                          vars(statistic_obj))
 
         self.assertEqual(len(resources), len(data))
+
+    def test_update_list_with_statistics(self):
+        resources = [api.ceilometer.Resource(r)
+                     for r in self.resources.list()[:2]]
+        statistics = self.statistics.list()
+
+        ceilometerclient = self.stub_ceilometerclient()
+        ceilometerclient.statistics = self.mox.CreateMockAnything()
+        # one job per resource and meter; the second meter fails
+        for resource in resources:
+            ceilometerclient.statistics.list(
+                meter_name='fake.meter_1', period=None,
+                q=resource.query).InAnyOrder().AndReturn(statistics)
+            ceilometerclient.statistics.list(
+                meter_name='fake.meter_2', period=None,
+                q=resource.query).InAnyOrder().AndRaise(
+                    self.exceptions.ceilometer)
+        self.mox.ReplayAll()
+
+        ceilometer_usage = api.ceilometer.CeilometerUsage(http.HttpRequest)
+        ret = ceilometer_usage.update_list_with_statistics(
+            resources, meter_names=['fake.meter_1', 'fake.meter_2'],
+            stats_attr='max')
+
+        self.assertEqual(resources, ret)
+        for resource in resources:
+            self.assertEqual(9, resource.get_meter('fake_meter_1'))
+            self.assertIsNone(resource.get_meter('fake_meter_2'))
+
+    @override_settings(CEILOMETER_STATISTICS_MAX_WORKERS=3)
+    def test_statistics_executor_is_shared_and_bounded(self):
+        old_executor = api.ceilometer._STATISTICS_EXECUTOR
+        api.ceilometer._STATISTICS_EXECUTOR = None
+        try:
+            executor = api.ceilometer._statistics_executor()
+            self.assertIs(executor, api.ceilometer._statistics_executor())
+            self.assertEqual(3, executor._max_workers)
+        finally:
+            api.ceilometer._STATISTICS_EXECUTOR = old_executor
+            executor.shutdown(wait=False)
@@ -24,9 +24,26 @@ from openstack_dashboard.test import helpers as test
 class CinderApiTests(test.APITestCase):
 
     def test_volume_list(self):
+        search_opts = {'all_tenants': 1}
+        volumes = self.cinder_volumes.list()
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.list(search_opts=search_opts,).AndReturn(volumes)
+        # No volume is awaiting a transfer, so transfers are not listed.
+        cinderclient.transfers = self.mox.CreateMockAnything()
+        self.mox.ReplayAll()
+
+        api_volumes = api.cinder.volume_list(self.request,
+                                             search_opts=search_opts)
+        self.assertEqual(len(volumes), len(api_volumes))
+        for volume in api_volumes:
+            self.assertIsNone(volume.transfer)
+
+    def test_volume_list_awaiting_transfer(self):
         search_opts = {'all_tenants': 1}
         detailed = True
         volumes = self.cinder_volumes.list()
+        volumes[0].status = 'awaiting-transfer'
         volume_transfers = self.cinder_volume_transfers.list()
         cinderclient = self.stub_cinderclient()
         cinderclient.volumes = self.mox.CreateMockAnything()
@@ -37,8 +54,49 @@ class CinderApiTests(test.APITestCase):
             search_opts=search_opts,).AndReturn(volume_transfers)
         self.mox.ReplayAll()
 
-        # No assertions are necessary. Verification is handled by mox.
-        api.cinder.volume_list(self.request, search_opts=search_opts)
+        api_volumes = api.cinder.volume_list(self.request,
+                                             search_opts=search_opts)
+        self.assertEqual(volume_transfers[0].id, api_volumes[0].transfer.id)
+        self.assertIsNone(api_volumes[1].transfer)
+
+    def _test_volume_list_paged(self, marker=None, sort_dir='desc',
+                                page_size=2):
+        search_opts = {'all_tenants': 1}
+        volumes = self.cinder_volumes.list()[:page_size + 1]
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.list(search_opts=search_opts,
+                                  limit=page_size + 1,
+                                  marker=marker,
+                                  sort='created_at:' + sort_dir)\
+            .AndReturn(volumes)
+        self.mox.ReplayAll()
+
+        with self.settings(API_RESULT_PAGE_SIZE=page_size):
+            return api.cinder.volume_list_paged(self.request,
+                                                search_opts=search_opts,
+                                                marker=marker,
+                                                paginate=True,
+                                                sort_dir=sort_dir)
+
+    def test_volume_list_paged_first_page(self):
+        volumes, has_more, has_prev = self._test_volume_list_paged()
+        self.assertEqual(2, len(volumes))
+        self.assertTrue(has_more)
+        self.assertFalse(has_prev)
+
+    def test_volume_list_paged_middle_page(self):
+        volumes, has_more, has_prev = self._test_volume_list_paged(
+            marker='nonsense')
+        self.assertEqual(2, len(volumes))
+        self.assertTrue(has_more)
+        self.assertTrue(has_prev)
+
+    def test_volume_list_paged_last_page(self):
+        volumes, has_more, has_prev = self._test_volume_list_paged(
+            marker='nonsense', page_size=10)
+        self.assertFalse(has_more)
+        self.assertTrue(has_prev)
 
     def test_volume_snapshot_list(self):
         search_opts = {'all_tenants': 1}
@@ -69,7 +69,7 @@ class ImagesRestTestCase(test.TestCase):
 
         response = glance.Images().get(request)
         self.assertStatusCode(response, 200)
-        self.assertEqual(response.content,
+        self.assertEqual(self.get_response_content(response),
                          '{"items": [{"name": "fedora"}, {"name": "cirros"}]'
                          ', "has_more_data": false, "has_prev_data": false}')
         gc.image_list_detailed.assert_called_once_with(request,
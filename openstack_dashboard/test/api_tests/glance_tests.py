@@ -16,9 +16,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+import time
+
 from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.utils import override_settings
 
+from glanceclient import exc as glance_exceptions
+from glanceclient.v1 import images
+from mox3.mox import IsA  # noqa
+
+from horizon import exceptions
+
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -247,3 +257,158 @@ class GlanceApiTests(test.APITestCase):
         self.mox.ReplayAll()
         image = api.glance.image_get(self.request, 'empty')
         self.assertIsNone(image.name)
+
+    def test_image_get_by_ids(self):
+        image1, image2 = self.images.list()[:2]
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.get(image1.id).InAnyOrder().AndReturn(image1)
+        glanceclient.images.get('deleted').InAnyOrder() \
+            .AndRaise(glance_exceptions.HTTPNotFound())
+        glanceclient.images.get(image2.id).AndReturn(image2)
+        self.mox.ReplayAll()
+
+        images = api.glance.image_get_by_ids(self.request,
+                                             [image1.id, 'deleted', image1.id])
+        self.assertEqual([image1.id], list(images))
+        self.assertEqual(image1.name, images[image1.id].name)
+
+        # Both the found and the deleted image are remembered, so only the
+        # new image is fetched.
+        images = api.glance.image_get_by_ids(self.request,
+                                             [image1.id, 'deleted', image2.id])
+        self.assertItemsEqual([image1.id, image2.id], list(images))
+        self.assertEqual(image2.name, images[image2.id].name)
+
+    def test_image_get_by_ids_cleared_for_all_projects(self):
+        image = self.images.first()
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.get(image.id).AndReturn(image)
+        glanceclient.images.delete(image.id)
+        glanceclient.images.get(image.id) \
+            .AndRaise(glance_exceptions.HTTPNotFound())
+        self.mox.ReplayAll()
+
+        images = api.glance.image_get_by_ids(self.request, [image.id])
+        self.assertEqual([image.id], list(images))
+
+        # An admin scoped to another project deletes the image.
+        request = self.factory.get('/')
+        request.user = copy.copy(self.request.user)
+        request.user.tenant_id = request.user.project_id = 'other'
+        api.glance.image_delete(request, image.id)
+
+        images = api.glance.image_get_by_ids(self.request, [image.id])
+        self.assertEqual({}, images)
+
+    def test_image_get_by_ids_error(self):
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.get('some-image') \
+            .AndRaise(glance_exceptions.CommunicationError())
+        self.mox.ReplayAll()
+
+        self.assertRaises(glance_exceptions.CommunicationError,
+                          api.glance.image_get_by_ids,
+                          self.request, ['some-image'])
+
+    def test_public_image_list_detailed_cached(self):
+        public_images = [image for image in self.images.list()
+                         if image.is_public]
+        limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.resource_class = images.Image
+        glanceclient.images.list(page_size=limit,
+                                 limit=limit,
+                                 filters={'is_public': True,
+                                          'status': 'active'},
+                                 sort_dir='desc',
+                                 sort_key='created_at') \
+            .AndReturn(iter(public_images))
+        glanceclient.images.delete(public_images[0].id)
+        glanceclient.images.list(page_size=limit,
+                                 limit=limit,
+                                 filters={'is_public': True,
+                                          'status': 'active'},
+                                 sort_dir='desc',
+                                 sort_key='created_at') \
+            .AndReturn(iter(public_images[1:]))
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            ret = api.glance.public_image_list_detailed(
+                self.request, filters={'status': 'active'})
+            self.assertEqual([image.id for image in public_images],
+                             [image.id for image in ret])
+            self.assertEqual(public_images[0].name, ret[0].name)
+
+        # Changing an image discards the cached list.
+        api.glance.image_delete(self.request, public_images[0].id)
+        ret = api.glance.public_image_list_detailed(
+            self.request, filters={'status': 'active'})
+        self.assertEqual(len(public_images) - 1, len(ret))
+
+    def _wait_for_upload(self, image_id):
+        for i in range(50):
+            progress = api.glance.image_upload_progress(image_id)
+            if progress['status'] in ('finished', 'failed'):
+                return progress
+            time.sleep(0.1)
+        self.fail('The upload of image %s did not finish.' % image_id)
+
+    def test_image_create_uploads_data_in_background(self):
+        image = self.images.first()
+        data = SimpleUploadedFile('image.img', b'x' * 200000)
+
+        def read_all(image_id, data, purge_props):
+            chunks = iter(lambda: data.read(1024 * 1024), b'')
+            self.assertTrue(all(len(chunk) <= api.glance.UPLOAD_CHUNK_SIZE
+                                for chunk in chunks))
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create(name='image').AndReturn(image)
+        glanceclient.images.update(
+            image.id, data=IsA(api.glance._UploadProgressFile),
+            purge_props=False).WithSideEffects(read_all)
+        self.mox.ReplayAll()
+
+        ret_val = api.glance.image_create(self.request, name='image',
+                                          data=data)
+        self.assertEqual(image, ret_val)
+        self.assertEqual({'status': 'finished', 'transferred': 200000,
+                          'size': 200000},
+                         self._wait_for_upload(image.id))
+
+    def test_image_create_records_failed_upload(self):
+        image = self.images.first()
+        data = SimpleUploadedFile('image.img', b'x' * 100)
+
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create(name='image').AndReturn(image)
+        glanceclient.images.update(
+            image.id, data=IsA(api.glance._UploadProgressFile),
+            purge_props=False).AndRaise(glance_exceptions.CommunicationError)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(self.request, name='image', data=data)
+        self.assertEqual('failed', self._wait_for_upload(image.id)['status'])
+
+    def test_image_create_rejected_when_uploads_saturated(self):
+        executor, slots = api.glance._upload_executor()
+        taken = 0
+        while slots.acquire(False):
+            taken += 1
+        try:
+            # Glance is not called: no image is left behind without data.
+            self.assertRaises(exceptions.NotAvailable,
+                              api.glance.image_create, self.request,
+                              name='image',
+                              data=SimpleUploadedFile('image.img', b'x'))
+        finally:
+            for i in range(taken):
+                slots.release()
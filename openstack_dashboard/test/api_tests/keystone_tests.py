@@ -18,7 +18,10 @@
 
 from __future__ import absolute_import
 
+from django import http
+from keystoneclient import exceptions as keystone_exceptions
 from keystoneclient.v2_0 import client as keystone_client
+from mox3.mox import IsA  # noqa
 import six
 
 from openstack_dashboard import api
@@ -84,6 +87,66 @@ class RoleAPITests(test.APITestCase):
         role = api.keystone.get_default_role(self.request)
 
 
+class TenantAPITests(test.APITestCase):
+    def _new_request(self):
+        request = http.HttpRequest()
+        request.user = self.request.user
+        return request
+
+    @test.create_stubs({api.keystone: ('tenant_get',)})
+    def test_tenant_names_get(self):
+        tenants = self.tenants.list()[:2]
+        for tenant in tenants:
+            api.keystone.tenant_get(IsA(http.HttpRequest), tenant.id,
+                                    admin=True).InAnyOrder().AndReturn(tenant)
+        api.keystone.tenant_get(IsA(http.HttpRequest), 'deleted',
+                                admin=True).InAnyOrder() \
+            .AndRaise(keystone_exceptions.NotFound(404))
+        self.mox.ReplayAll()
+
+        project_ids = [tenants[0].id, tenants[1].id, tenants[0].id, 'deleted']
+        names = api.keystone.tenant_names_get(self.request, project_ids)
+        self.assertEqual(dict((t.id, t.name) for t in tenants), names)
+        # The names are cached; asking again doesn't hit the API
+        # (it would show up in mox as an unexpected method call).
+        names = api.keystone.tenant_names_get(self._new_request(),
+                                              [tenants[1].id])
+        self.assertEqual({tenants[1].id: tenants[1].name}, names)
+
+    @test.create_stubs({api.keystone: ('tenant_get',)})
+    def test_tenant_names_get_error(self):
+        tenant = self.tenants.first()
+        api.keystone.tenant_get(IsA(http.HttpRequest), tenant.id,
+                                admin=True).InAnyOrder().AndReturn(tenant)
+        api.keystone.tenant_get(IsA(http.HttpRequest), 'broken',
+                                admin=True).InAnyOrder() \
+            .AndRaise(self.exceptions.keystone)
+        self.mox.ReplayAll()
+
+        self.assertRaises(keystone_exceptions.ClientException,
+                          api.keystone.tenant_names_get,
+                          self.request, [tenant.id, 'broken'])
+
+    @test.create_stubs({api.keystone: ('tenant_get',)})
+    def test_tenant_update_invalidates_tenant_names(self):
+        tenant = self.tenants.first()
+        keystoneclient = self.stub_keystoneclient()
+        keystoneclient.projects = self.mox.CreateMockAnything()
+        api.keystone.tenant_get(IsA(http.HttpRequest), tenant.id,
+                                admin=True).AndReturn(tenant)
+        keystoneclient.projects.update(tenant.id, name='renamed',
+                                       description=None, enabled=None,
+                                       domain=None).AndReturn(tenant)
+        api.keystone.tenant_get(IsA(http.HttpRequest), tenant.id,
+                                admin=True).AndReturn(tenant)
+        self.mox.ReplayAll()
+
+        api.keystone.tenant_names_get(self.request, [tenant.id])
+        api.keystone.tenant_update(self._new_request(), tenant.id,
+                                   name='renamed')
+        api.keystone.tenant_names_get(self._new_request(), [tenant.id])
+
+
 class ServiceAPITests(test.APITestCase):
     def test_service_wrapper(self):
         catalog = self.service_catalog
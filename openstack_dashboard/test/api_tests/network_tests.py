@@ -288,8 +288,6 @@ class NetworkApiNeutronTests(NetworkApiNeutronTestBase):
                 .AndReturn({'ports': self.api_ports.list()})
         self.qclient.list_networks(id=set(server_network_ids)) \
             .AndReturn({'networks': server_networks})
-        self.qclient.list_subnets() \
-            .AndReturn({'subnets': self.api_subnets.list()})
         self.mox.ReplayAll()
 
         api.network.servers_update_addresses(self.request, servers)
@@ -727,9 +725,6 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
                                                self.api_routers.list()})
         self.qclient.list_networks(shared=True).AndReturn({'networks':
                                                            shared_nets})
-        shared_subs = [s for s in self.api_subnets.list()
-                       if s['id'] in shared_subnet_ids]
-        self.qclient.list_subnets().AndReturn({'subnets': shared_subs})
         self.qclient.list_vips().AndReturn({'vips': self.vips.list()})
 
         self.mox.ReplayAll()
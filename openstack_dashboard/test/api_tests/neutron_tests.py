@@ -16,6 +16,7 @@ import copy
 import uuid
 
 from django.test.utils import override_settings
+from mox3 import mox
 
 from neutronclient.common import exceptions as neutron_exc
 
@@ -27,16 +28,34 @@ from openstack_dashboard.test import helpers as test
 class NeutronApiTests(test.APITestCase):
     def test_network_list(self):
         networks = {'networks': self.api_networks.list()}
-        subnets = {'subnets': self.api_subnets.list()}
+        subnet_ids = [s for n in self.api_networks.list()
+                      for s in n['subnets']]
+        subnets = {'subnets': [s for s in self.api_subnets.list()
+                               if s['id'] in subnet_ids]}
 
         neutronclient = self.stub_neutronclient()
         neutronclient.list_networks().AndReturn(networks)
-        neutronclient.list_subnets().AndReturn(subnets)
+        neutronclient.list_subnets(id=mox.SameElementsAs(subnet_ids)) \
+            .AndReturn(subnets)
         self.mox.ReplayAll()
 
         ret_val = api.neutron.network_list(self.request)
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Network)
+            for s in n.subnets:
+                self.assertIsInstance(s, api.neutron.Subnet)
+
+    def test_network_list_without_subnet_expansion(self):
+        networks = {'networks': self.api_networks.list()}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks(shared=True).AndReturn(networks)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list(self.request, shared=True,
+                                           expand_subnet=False)
+        self.assertEqual([n['subnets'] for n in self.api_networks.list()],
+                         [n.subnets for n in ret_val])
 
     def test_network_get(self):
         network = {'network': self.api_networks.first()}
@@ -569,9 +588,10 @@ class NeutronApiTests(test.APITestCase):
         neutronclient = self.stub_neutronclient()
         uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
         neutronclient.list_ports(id=port_ids).AndRaise(uri_len_exc)
+        # The chunks are listed concurrently.
         for i in range(0, 10, 4):
             neutronclient.list_ports(id=port_ids[i:i + 4]) \
-                .AndReturn({'ports': ports[i:i + 4]})
+                .InAnyOrder().AndReturn({'ports': ports[i:i + 4]})
         self.mox.ReplayAll()
 
         ret_val = api.neutron.list_resources_with_long_filters(
@@ -579,3 +599,60 @@ class NeutronApiTests(test.APITestCase):
             request=self.request)
         self.assertEqual(10, len(ret_val))
         self.assertEqual(port_ids, [p.id for p in ret_val])
+
+    def test_list_resources_with_long_filters_learned_length(self):
+        ports = [{'id': str(uuid.uuid4()),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(10)]
+        port_ids = [port['id'] for port in ports]
+
+        neutronclient = self.stub_neutronclient()
+        uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
+        neutronclient.list_ports(id=port_ids).AndRaise(uri_len_exc)
+        for i in range(0, 10, 4):
+            neutronclient.list_ports(id=port_ids[i:i + 4]) \
+                .InAnyOrder('first').AndReturn({'ports': ports[i:i + 4]})
+        # The second time, the filter is split without trying it whole.
+        for i in range(0, 10, 4):
+            neutronclient.list_ports(id=port_ids[i:i + 4]) \
+                .InAnyOrder('second').AndReturn({'ports': ports[i:i + 4]})
+        # A short enough filter is still sent in a single request.
+        neutronclient.list_ports(id=port_ids[:4]) \
+            .AndReturn({'ports': ports[:4]})
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            ret_val = api.neutron.list_resources_with_long_filters(
+                api.neutron.port_list, 'id', port_ids,
+                request=self.request)
+            self.assertEqual(port_ids, [p.id for p in ret_val])
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids[:4],
+            request=self.request)
+        self.assertEqual(port_ids[:4], [p.id for p in ret_val])
+
+    def test_list_resources_with_long_filters_learned_per_endpoint(self):
+        ports = [{'id': str(uuid.uuid4()),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(10)]
+        port_ids = [port['id'] for port in ports]
+
+        neutronclient = self.stub_neutronclient()
+        uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
+        neutronclient.list_ports(id=port_ids).AndRaise(uri_len_exc)
+        for i in range(0, 10, 4):
+            neutronclient.list_ports(id=port_ids[i:i + 4]) \
+                .InAnyOrder().AndReturn({'ports': ports[i:i + 4]})
+        # The length learned from one endpoint isn't used for another.
+        neutronclient.list_ports(id=port_ids).AndReturn({'ports': ports})
+        self.mox.ReplayAll()
+
+        api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids, request=self.request)
+        with override_settings(OPENSTACK_ENDPOINT_TYPE='internalURL'):
+            ret_val = api.neutron.list_resources_with_long_filters(
+                api.neutron.port_list, 'id', port_ids,
+                request=self.request)
+        self.assertEqual(port_ids, [p.id for p in ret_val])
@@ -217,7 +217,7 @@ class NovaRestTestCase(test.TestCase):
         ]
         response = nova.Flavors().get(request)
         self.assertStatusCode(response, 200)
-        self.assertEqual(response.content,
+        self.assertEqual(self.get_response_content(response),
                          '{"items": [{"id": "1"}, {"id": "2"}]}')
         nc.flavor_list.assert_called_once_with(request, is_public=is_public,
                                                get_extras=False)
@@ -247,11 +247,11 @@ class NovaRestTestCase(test.TestCase):
         response = nova.Flavors().get(request)
         self.assertStatusCode(response, 200)
         if get_extras:
-            self.assertEqual(response.content,
+            self.assertEqual(self.get_response_content(response),
                              '{"items": [{"extras": {}, "id": "1"}, '
                              '{"extras": {}, "id": "2"}]}')
         else:
-            self.assertEqual(response.content,
+            self.assertEqual(self.get_response_content(response),
                              '{"items": [{"id": "1"}, {"id": "2"}]}')
         nc.flavor_list.assert_called_once_with(request, is_public=None,
                                                get_extras=get_extras)
@@ -25,6 +25,7 @@ from django.test.utils import override_settings
 
 from mox3.mox import IsA  # noqa
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import flavors
 from novaclient.v2 import servers
 import six
 
@@ -212,6 +213,35 @@ class ComputeApiTests(test.APITestCase):
         ret_val = api.nova.server_get(self.request, server.id)
         self.assertIsInstance(ret_val, api.nova.Server)
 
+    def test_server_get_by_ids(self):
+        server = self.servers.first()
+
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.servers.get(server.id).InAnyOrder().AndReturn(server)
+        novaclient.servers.get('gone').InAnyOrder() \
+            .AndRaise(nova_exceptions.NotFound(404))
+        self.mox.ReplayAll()
+
+        ret_val = api.nova.server_get_by_ids(self.request,
+                                             [server.id, 'gone', server.id])
+        self.assertEqual([server.id], list(ret_val))
+        self.assertIsInstance(ret_val[server.id], api.nova.Server)
+
+    def test_server_get_by_ids_error(self):
+        server = self.servers.first()
+
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.servers.get(server.id).InAnyOrder().AndReturn(server)
+        novaclient.servers.get('broken').InAnyOrder() \
+            .AndRaise(self.exceptions.nova)
+        self.mox.ReplayAll()
+
+        self.assertRaises(nova_exceptions.ClientException,
+                          api.nova.server_get_by_ids,
+                          self.request, [server.id, 'broken'])
+
     def _test_absolute_limits(self, values, expected_results):
         limits = self.mox.CreateMockAnything()
         limits.absolute = []
@@ -347,3 +377,42 @@ class ComputeApiTests(test.APITestCase):
         ret_val = api.nova.migrate_host(self.request, "host", True, True,
                                         True)
         self.assertTrue(ret_val)
+
+    def _stub_flavor_list(self):
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.resource_class = flavors.Flavor
+        novaclient.flavors.list(is_public=True) \
+            .AndReturn(self.flavors.list())
+        return novaclient
+
+    def _new_request(self):
+        request = http.HttpRequest()
+        request.user = self.request.user
+        return request
+
+    def test_flavor_list_cached_across_requests(self):
+        self._stub_flavor_list()
+        self.mox.ReplayAll()
+
+        ret_val = api.nova.flavor_list(self.request)
+        cached = api.nova.flavor_list(self._new_request())
+        self.assertEqual([f.to_dict() for f in ret_val],
+                         [f.to_dict() for f in cached])
+        for flavor in cached:
+            self.assertIsInstance(flavor, flavors.Flavor)
+
+    def test_flavor_create_invalidates_flavor_list(self):
+        flavor = self.flavors.first()
+        novaclient = self._stub_flavor_list()
+        novaclient.flavors.create(flavor.name, flavor.ram, flavor.vcpus,
+                                  flavor.disk, flavorid='auto', ephemeral=0,
+                                  swap=0, is_public=True).AndReturn(flavor)
+        novaclient.flavors.list(is_public=True) \
+            .AndReturn(self.flavors.list())
+        self.mox.ReplayAll()
+
+        api.nova.flavor_list(self.request)
+        api.nova.flavor_create(self._new_request(), flavor.name, flavor.ram,
+                               flavor.vcpus, flavor.disk)
+        api.nova.flavor_list(self._new_request())
@@ -11,6 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+
+import mock
+from oslo_serialization import jsonutils
+
 from openstack_dashboard.api.rest import json_encoder
 from openstack_dashboard.api.rest import utils
 from openstack_dashboard.test import helpers as test
@@ -169,6 +174,46 @@ class RestUtilsTestCase(test.TestCase):
         self.assertDictEqual({}, output_filters)
 
 
+class StreamingJSONTestCase(test.TestCase):
+    data = {'items': [{'id': str(i), 'name': u'\u4e91 %d' % i, 'size': i}
+                      for i in range(100)],
+            'has_more_data': False}
+
+    def _assert_same_as_dumps(self, data, **kwargs):
+        chunks = list(utils.iter_json(data, **kwargs))
+        self.assertEqual(jsonutils.dumps(data), ''.join(chunks))
+        return chunks
+
+    def test_iter_json_dict_of_lists(self):
+        self._assert_same_as_dumps(self.data)
+
+    def test_iter_json_list(self):
+        self._assert_same_as_dumps(self.data['items'])
+
+    def test_iter_json_other_data(self):
+        self._assert_same_as_dumps('ok')
+        self._assert_same_as_dumps({1: ['non-string key']})
+        self._assert_same_as_dumps({})
+
+    def test_iter_json_buffers_chunks(self):
+        chunks = self._assert_same_as_dumps(self.data, buffer_size=100)
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(all(len(chunk) >= 100 for chunk in chunks[:-1]))
+
+    def test_api_streaming(self):
+        @utils.ajax(stream=True)
+        def f(self, request):
+            return self.data
+
+        request = self.mock_rest_request()
+        response = f(self, request)
+        self.assertStatusCode(response, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['content-type'], 'application/json')
+        self.assertEqual(self.data,
+                         json.loads(self.get_response_content(response)))
+
+
 class JSONEncoderTestCase(test.TestCase):
     # NOTE(tsufiev): NaN numeric is "conventional" in a sense that the custom
     # NaNJSONEncoder encoder translates it to the same token that the standard
@@ -248,3 +293,15 @@ class JSONEncoderTestCase(test.TestCase):
 
         self.assertNotEqual(default_encoder_response.content,
                             custom_encoder_response.content)
+
+    def test_custom_encoder_uses_c_encoder_without_nan(self):
+        data = {'key1': 'string', 'key2': 10.5, 'key4': [1, 'some']}
+        with mock.patch.object(json.encoder, '_make_iterencode') as m:
+            content = json_encoder.NaNJSONEncoder().encode(data)
+        self.assertFalse(m.called)
+        self.assertEqual(json.dumps(data), content)
+
+    def test_custom_encoder_on_nested_nan(self):
+        content = json_encoder.NaNJSONEncoder().encode(
+            {'key': [1, {'inf': self.data_inf}, self.data_nan]})
+        self.assertEqual('{"key": [1, {"inf": 1e+999}, NaN]}', content)
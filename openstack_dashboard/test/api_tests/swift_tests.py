@@ -32,8 +32,7 @@ class SwiftApiTests(test.APITestCase):
         cont_data = [c._apidict for c in containers]
         swift_api = self.stub_swiftclient()
         swift_api.get_account(limit=1001,
-                              marker=None,
-                              full_listing=True).AndReturn([{}, cont_data])
+                              marker=None).AndReturn([{}, cont_data])
         self.mox.ReplayAll()
 
         (conts, more) = api.swift.swift_get_containers(self.request)
@@ -114,8 +113,7 @@ class SwiftApiTests(test.APITestCase):
                                 limit=1001,
                                 marker=None,
                                 prefix=None,
-                                delimiter='/',
-                                full_listing=True).AndReturn([{}, objects])
+                                delimiter='/').AndReturn([{}, objects])
         self.mox.ReplayAll()
 
         (objs, more) = api.swift.swift_get_objects(self.request,
@@ -123,6 +121,151 @@ class SwiftApiTests(test.APITestCase):
         self.assertEqual(len(objects), len(objs))
         self.assertFalse(more)
 
+    def test_swift_get_objects_more(self):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=None,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[:2]])
+        self.mox.ReplayAll()
+
+        (objs, more) = api.swift.swift_get_objects(self.request,
+                                                   container.name,
+                                                   limit=1)
+        self.assertEqual([objects[0].name], [o.name for o in objs])
+        self.assertTrue(more)
+
+    def test_swift_iter_objects(self):
+        container = self.containers.first()
+        objects = self.objects.list()[:4]
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=None,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[:2]])
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=objects[1].name,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[2:4]])
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=objects[3].name,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, []])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_iter_objects(self.request, container.name,
+                                            page_size=2)
+        self.assertEqual([o.name for o in objects], [o.name for o in objs])
+
+    def test_swift_iter_objects_stops_early(self):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=1,
+                                marker=None,
+                                prefix=None,
+                                delimiter='/').AndReturn([{}, objects[:1]])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_iter_objects(self.request, container.name,
+                                            page_size=1)
+        self.assertEqual(objects[0].name, next(objs).name)
+
+    def test_swift_filter_objects_prefix(self):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=1000,
+                                marker=None,
+                                prefix=u'test_object',
+                                delimiter='/').AndReturn([{}, objects[:2]])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request, u'test_object*t',
+                                              container.name)
+        self.assertEqual([objects[1].name], [o.name for o in objs])
+
+    def test_swift_filter_objects_in_folder(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        folder = u'folder/'
+        item = dict(obj._apidict, name=folder + obj.name)
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=1000,
+                                marker=None,
+                                prefix=folder,
+                                delimiter='/').AndReturn([{}, [item]])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request, u'*object',
+                                              container.name, prefix=folder)
+        self.assertEqual([folder + obj.name], [o.name for o in objs])
+
+    @test.update_settings(API_RESULT_LIMIT=1)
+    def test_swift_filter_objects_stops_when_filled(self):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=1,
+                                marker=None,
+                                prefix=u'',
+                                delimiter='/').AndReturn([{}, objects[1:2]])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request, u'nothing *two',
+                                              container.name)
+        self.assertEqual([objects[1].name], [o.name for o in objs])
+
+    def test_swift_delete_object(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=None,
+                                prefix=obj.name,
+                                delimiter='/').AndReturn([{}, [obj]])
+        swift_api.delete_object(container.name, obj.name)
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.swift.swift_delete_object(self.request,
+                                                      container.name,
+                                                      obj.name))
+
+    def test_swift_delete_nonempty_pseudo_folder(self):
+        container = self.containers.first()
+        folder = self.folder.first()
+        objects = self.objects.list()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                limit=2,
+                                marker=None,
+                                prefix=folder.name,
+                                delimiter='/').AndReturn([{}, objects[:2]])
+        self.mox.ReplayAll()
+
+        with self.assertRaises(exceptions.Conflict):
+            api.swift.swift_delete_object(self.request, container.name,
+                                          folder.name)
+
     def test_swift_get_object_with_data_non_chunked(self):
         container = self.containers.first()
         object = self.objects.first()
@@ -279,9 +279,16 @@ class TestCase(horizon_helpers.TestCase):
                                                 response.content))
 
     def assertItemsCollectionEqual(self, response, items_list):
-        self.assertEqual(response.content,
+        self.assertEqual(self.get_response_content(response),
                          '{"items": ' + json.dumps(items_list) + "}")
 
+    @staticmethod
+    def get_response_content(response):
+        """Returns the body of a regular or a streaming response."""
+        if response.streaming:
+            return b''.join(response.streaming_content)
+        return response.content
+
     @staticmethod
     def mock_rest_request(**args):
         mock_args = {
@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django import http
 from django.test.utils import override_settings
 
 from openstack_dashboard import policy
@@ -69,6 +70,76 @@ class PolicyBackendTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    def test_decisions_cached_per_request(self):
+        policy_backend.reset()
+        for i in range(3):
+            value = policy_backend.check((("identity", "admin_required"),),
+                                         request=self.request)
+            self.assertFalse(value)
+        stats = policy_backend.cache_stats()
+        self.assertEqual(1, stats.misses)
+        self.assertEqual(2, stats.hits)
+
+        # A new request decides again.
+        policy_backend.check((("identity", "admin_required"),),
+                             request=http.HttpRequest())
+        self.assertEqual(2, policy_backend.cache_stats().misses)
+
+    def test_decisions_cached_per_target(self):
+        policy_backend.reset()
+        rule = (("compute", "compute_extension:admin_actions:pause"),)
+        own = {'project_id': self.tenant.id}
+        other = {'project_id': 'other-project'}
+        self.assertTrue(policy_backend.check(rule, self.request, dict(own)))
+        self.assertFalse(policy_backend.check(rule, self.request,
+                                              dict(other)))
+        self.assertTrue(policy_backend.check(rule, self.request, dict(own)))
+        stats = policy_backend.cache_stats()
+        self.assertEqual(2, stats.misses)
+        self.assertEqual(1, stats.hits)
+
+    def test_missing_rule_decided_once(self):
+        policy_backend.reset()
+        for i in range(2):
+            self.assertFalse(policy_backend.check(
+                (("identity", "i_dont_exist"),), request=self.request))
+        stats = policy_backend.cache_stats()
+        # The rule and the default rule, only for the first check.
+        self.assertEqual(2, stats.enforcements)
+        self.assertEqual(1, stats.hits)
+
+    def test_unhashable_target_not_cached(self):
+        policy_backend.reset()
+        target = {'project_id': self.tenant.id, 'tags': ['a']}
+        for i in range(2):
+            policy_backend.check((("identity", "admin_required"),),
+                                 self.request, dict(target))
+        stats = policy_backend.cache_stats()
+        self.assertEqual(2, stats.misses)
+        self.assertEqual(0, stats.hits)
+
+    @override_settings(POLICY_DECISION_CACHE_TIMEOUT=60)
+    def test_target_independent_decisions_shared(self):
+        policy_backend.reset()
+        for request in (self.request, http.HttpRequest()):
+            self.assertFalse(policy_backend.check(
+                (("identity", "admin_required"),), request))
+        stats = policy_backend.cache_stats()
+        self.assertEqual(1, stats.misses)
+        self.assertEqual(1, stats.shared_hits)
+
+    @override_settings(POLICY_DECISION_CACHE_TIMEOUT=60)
+    def test_target_dependent_decisions_not_shared(self):
+        policy_backend.reset()
+        rule = (("compute", "compute_extension:admin_actions:pause"),)
+        self.assertTrue(policy_backend.check(
+            rule, self.request, {'project_id': self.tenant.id}))
+        self.assertFalse(policy_backend.check(
+            rule, http.HttpRequest(), {'project_id': 'other-project'}))
+        stats = policy_backend.cache_stats()
+        self.assertEqual(2, stats.misses)
+        self.assertEqual(0, stats.shared_hits)
+
 
 class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
     @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
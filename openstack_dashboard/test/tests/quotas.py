@@ -19,6 +19,8 @@
 
 from __future__ import absolute_import
 
+import copy
+
 from django import http
 from mox3.mox import IsA  # noqa
 
@@ -51,12 +53,14 @@ class QuotaTests(test.APITestCase):
 
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
-                                   'tenant_quota_get',),
+                                   'tenant_quota_get',
+                                   'tenant_absolute_limits',),
                         api.network: ('tenant_floating_ip_list',
                                       'floating_ip_supported'),
                         api.base: ('is_service_enabled',),
                         cinder: ('volume_list', 'volume_snapshot_list',
-                                 'tenant_quota_get',)})
+                                 'tenant_quota_get',
+                                 'tenant_absolute_limits',)})
     def test_tenant_quota_usages(self):
         servers = [s for s in self.servers.list()
                    if s.tenant_id == self.request.user.tenant_id]
@@ -65,6 +69,8 @@ class QuotaTests(test.APITestCase):
                                     'volume').AndReturn(True)
         api.base.is_service_enabled(IsA(http.HttpRequest),
                                     'network').AndReturn(False)
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True).AndReturn({})
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
         api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
@@ -77,6 +83,7 @@ class QuotaTests(test.APITestCase):
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
                              all_tenants=True) \
             .AndReturn([servers, False])
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)).AndReturn({})
         opts = {'all_tenants': 1, 'project_id': self.request.user.tenant_id}
         cinder.volume_list(IsA(http.HttpRequest), opts) \
             .AndReturn(self.volumes.list())
@@ -95,7 +102,8 @@ class QuotaTests(test.APITestCase):
 
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
-                                   'tenant_quota_get',),
+                                   'tenant_quota_get',
+                                   'tenant_absolute_limits',),
                         api.network: ('tenant_floating_ip_list',
                                       'floating_ip_supported'),
                         api.base: ('is_service_enabled',)})
@@ -107,6 +115,8 @@ class QuotaTests(test.APITestCase):
                                     'volume').AndReturn(False)
         api.base.is_service_enabled(IsA(http.HttpRequest),
                                     'network').AndReturn(False)
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True).AndReturn({})
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
         api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
@@ -135,7 +145,8 @@ class QuotaTests(test.APITestCase):
 
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
-                                   'tenant_quota_get',),
+                                   'tenant_quota_get',
+                                   'tenant_absolute_limits',),
                         api.network: ('tenant_floating_ip_list',
                                       'floating_ip_supported'),
                         api.base: ('is_service_enabled',)})
@@ -144,6 +155,8 @@ class QuotaTests(test.APITestCase):
                                     'volume').AndReturn(False)
         api.base.is_service_enabled(IsA(http.HttpRequest),
                                     'network').AndReturn(False)
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True).AndReturn({})
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
         api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
@@ -173,12 +186,14 @@ class QuotaTests(test.APITestCase):
 
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
-                                   'tenant_quota_get',),
+                                   'tenant_quota_get',
+                                   'tenant_absolute_limits',),
                         api.network: ('tenant_floating_ip_list',
                                       'floating_ip_supported'),
                         api.base: ('is_service_enabled',),
                         cinder: ('volume_list', 'volume_snapshot_list',
-                                 'tenant_quota_get',)})
+                                 'tenant_quota_get',
+                                 'tenant_absolute_limits',)})
     def test_tenant_quota_usages_unlimited_quota(self):
         inf_quota = self.quotas.first()
         inf_quota['ram'] = -1
@@ -189,6 +204,8 @@ class QuotaTests(test.APITestCase):
                                     'volume').AndReturn(True)
         api.base.is_service_enabled(IsA(http.HttpRequest),
                                     'network').AndReturn(False)
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True).AndReturn({})
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
         api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
@@ -201,6 +218,7 @@ class QuotaTests(test.APITestCase):
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
                              all_tenants=True) \
             .AndReturn([servers, False])
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)).AndReturn({})
         opts = {'all_tenants': 1, 'project_id': self.request.user.tenant_id}
         cinder.volume_list(IsA(http.HttpRequest), opts) \
             .AndReturn(self.volumes.list())
@@ -222,12 +240,14 @@ class QuotaTests(test.APITestCase):
 
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
-                                   'tenant_quota_get',),
+                                   'tenant_quota_get',
+                                   'tenant_absolute_limits',),
                         api.network: ('tenant_floating_ip_list',
                                       'floating_ip_supported'),
                         api.base: ('is_service_enabled',),
                         cinder: ('volume_list', 'volume_snapshot_list',
-                                 'tenant_quota_get',)})
+                                 'tenant_quota_get',
+                                 'tenant_absolute_limits',)})
     def test_tenant_quota_usages_neutron_fip_disabled(self):
         servers = [s for s in self.servers.list()
                    if s.tenant_id == self.request.user.tenant_id]
@@ -236,6 +256,8 @@ class QuotaTests(test.APITestCase):
                                     'volume').AndReturn(True)
         api.base.is_service_enabled(IsA(http.HttpRequest),
                                     'network').AndReturn(False)
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True).AndReturn({})
         api.nova.flavor_list(IsA(http.HttpRequest)) \
             .AndReturn(self.flavors.list())
         api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
@@ -246,6 +268,7 @@ class QuotaTests(test.APITestCase):
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
                              all_tenants=True) \
             .AndReturn([servers, False])
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)).AndReturn({})
         opts = {'all_tenants': 1, 'project_id': self.request.user.tenant_id}
         cinder.volume_list(IsA(http.HttpRequest), opts) \
             .AndReturn(self.volumes.list())
@@ -263,3 +286,181 @@ class QuotaTests(test.APITestCase):
 
         # Compare internal structure of usages to expected.
         self.assertItemsEqual(expected_output, quota_usages.usages)
+
+    @test.create_stubs({api.nova: ('tenant_quota_get',
+                                   'tenant_absolute_limits',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',),
+                        cinder: ('tenant_quota_get',
+                                 'tenant_absolute_limits',)})
+    def test_tenant_quota_usages_from_absolute_limits(self):
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(True)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(False)
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True) \
+            .AndReturn({'totalInstancesUsed': 2,
+                        'totalCoresUsed': 2,
+                        'totalRAMUsed': 1024})
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+        cinder.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.cinder_quotas.first())
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)) \
+            .AndReturn({'totalVolumesUsed': 4,
+                        'totalSnapshotsUsed': 3,
+                        'totalGigabytesUsed': 120})
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        expected_output = self.get_usages()
+
+        for name in ('instances', 'cores', 'ram',
+                     'volumes', 'snapshots', 'gigabytes'):
+            self.assertEqual(expected_output[name],
+                             quota_usages.usages[name])
+
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',
+                                   'tenant_absolute_limits',),
+                        api.neutron: ('is_extension_supported',
+                                      'is_quotas_extension_supported',
+                                      'tenant_quota_get',
+                                      'tenant_quota_detail_get',),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_from_neutron_quota_details(self):
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == self.request.user.tenant_id]
+
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(False)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group').AndReturn(True)
+        api.neutron.is_quotas_extension_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.neutron.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.neutron_quotas.first())
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True).AndReturn({})
+        search_opts = {'tenant_id': self.request.user.tenant_id}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=True) \
+            .AndReturn([servers, False])
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'quota_details').AndReturn(True)
+        details = dict((name, {'limit': 10, 'used': used, 'reserved': 0})
+                       for name, used in (('floatingip', 1),
+                                          ('security_group', 2),
+                                          ('network', 3),
+                                          ('subnet', 4),
+                                          ('router', 5)))
+        api.neutron.tenant_quota_detail_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(details)
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+
+        # Nothing is listed from Neutron, the reported usage is used as is.
+        self.assertEqual(1, quota_usages['floating_ips']['used'])
+        self.assertEqual(2, quota_usages['security_groups']['used'])
+        self.assertEqual(3, quota_usages['networks']['used'])
+        self.assertEqual(4, quota_usages['subnets']['used'])
+        self.assertEqual(5, quota_usages['routers']['used'])
+
+    @test.create_stubs({api.nova: ('tenant_quota_get',
+                                   'tenant_absolute_limits',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_cached(self):
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(False)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(False)
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        reserved=True) \
+            .AndReturn({'totalInstancesUsed': 2,
+                        'totalCoresUsed': 2,
+                        'totalRAMUsed': 1024})
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+
+        # A later request of the same user is answered from the cache.
+        request = self.factory.get('/')
+        request.user = self.request.user
+        cached_usages = quotas.tenant_quota_usages(request)
+
+        self.assertEqual(quota_usages.usages, cached_usages.usages)
+
+    @test.create_stubs({api.nova: ('tenant_quota_get',
+                                   'tenant_absolute_limits',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_invalidated(self):
+        for used in (2, 3):
+            api.base.is_service_enabled(IsA(http.HttpRequest),
+                                        'volume').AndReturn(False)
+            api.base.is_service_enabled(IsA(http.HttpRequest),
+                                        'network').AndReturn(False)
+            api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+                .AndReturn(self.quotas.first())
+            api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                            reserved=True) \
+                .AndReturn({'totalInstancesUsed': used,
+                            'totalCoresUsed': used,
+                            'totalRAMUsed': 1024})
+            api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+                .AndReturn(True)
+            api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+                .AndReturn(self.floating_ips.list())
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        self.assertEqual(2, quota_usages['instances']['used'])
+
+        # Creating an instance discards the cached usage.
+        quotas.invalidate_tenant_quota_usages(self.request)
+        request = self.factory.get('/')
+        request.user = self.request.user
+        quota_usages = quotas.tenant_quota_usages(request)
+        self.assertEqual(3, quota_usages['instances']['used'])
+
+    def test_invalidate_tenant_quota_usages_of_another_project(self):
+        admin_request = self.factory.get('/')
+        admin_request.user = copy.copy(self.request.user)
+        admin_request.user.project_id = '2'
+        cache_keys = [quotas._tenant_quota_usages_cache_key(request, '1')
+                      for request in (self.request, admin_request)]
+
+        # An admin acting on project 1 from project 2 reaches the usage
+        # cached by the users scoped to project 1 as well as its own.
+        quotas.invalidate_tenant_quota_usages(admin_request, '1')
+        for request, cache_key in zip((self.request, admin_request),
+                                      cache_keys):
+            self.assertNotEqual(
+                cache_key, quotas._tenant_quota_usages_cache_key(request, '1'))
@@ -16,6 +16,11 @@
 import datetime
 import uuid
 
+from django import http
+from django.test.utils import override_settings
+from mox3.mox import IsA  # noqa
+
+from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.utils import filters
 from openstack_dashboard.utils import metering
@@ -63,3 +68,92 @@ class UtilsMeteringTests(test.TestCase):
     def test_calc_date_args_invalid(self):
         self.assertRaises(
             ValueError, metering.calc_date_args, object, object, "other")
+
+    @override_settings(METERING_RESOURCE_NAME_LIST_THRESHOLD=3)
+    @test.create_stubs({api.nova: ('server_list', 'server_get')})
+    def test_get_resource_names_lists_once(self):
+        servers = self.servers.list()
+        api.nova.server_list(IsA(http.HttpRequest), all_tenants=True) \
+            .AndReturn([servers, False])
+        api.nova.server_get(IsA(http.HttpRequest), 'gone') \
+            .AndRaise(self.exceptions.nova)
+        self.mox.ReplayAll()
+
+        resources = [(servers[0].id, 'cpu_util'),
+                     (servers[1].id, 'instance:m1.tiny'),
+                     ('gone', 'cpu')]
+        names = metering.get_resource_names(self.request, resources)
+        self.assertEqual({servers[0].id: servers[0].name,
+                          servers[1].id: servers[1].name}, names)
+
+        # The names found are cached, the missing one is tried again.
+        self.mox.ResetAll()
+        api.nova.server_get(IsA(http.HttpRequest), 'gone') \
+            .AndRaise(self.exceptions.nova)
+        self.mox.ReplayAll()
+        self.assertEqual(names, metering.get_resource_names(self.request,
+                                                            resources))
+
+    @test.create_stubs({api.nova: ('server_get',)})
+    def test_get_resource_names_few(self):
+        # Too few names are missing to list the servers (mox fails on the
+        # unexpected server_list call).
+        servers = self.servers.list()[:2]
+        for server in servers:
+            api.nova.server_get(IsA(http.HttpRequest), server.id) \
+                .InAnyOrder().AndReturn(server)
+        self.mox.ReplayAll()
+
+        names = metering.get_resource_names(
+            self.request, [(server.id, 'cpu_util') for server in servers])
+        self.assertEqual(dict((server.id, server.name) for server in servers),
+                         names)
+
+    @test.create_stubs({api.glance: ('image_get',)})
+    def test_get_resource_name_single(self):
+        image = self.images.first()
+        api.glance.image_get(IsA(http.HttpRequest), image.id) \
+            .AndReturn(image)
+        self.mox.ReplayAll()
+
+        self.assertEqual(image.name, metering.get_resource_name(
+            self.request, image.id, 'resource_id', 'image'))
+        self.assertEqual('unknown', metering.get_resource_name(
+            self.request, 'unknown', 'resource_id', 'memory'))
+
+    def _series(self, values, unit=''):
+        start = datetime.datetime(2015, 1, 1)
+        data = [{'x': (start + datetime.timedelta(minutes=10 * i))
+                 .strftime("%Y-%m-%dT%H:%M:%S"), 'y': value}
+                for i, value in enumerate(values)]
+        return [{'unit': unit, 'name': 'test', 'meter': 'test',
+                 'data': data}]
+
+    def test_downsample_series(self):
+        values = [float(i % 7) for i in range(1000)]
+        values[500] = 100.0
+        series = metering.downsample_series(self._series(values),
+                                            max_points=50)
+        data = series[0]['data']
+        self.assertEqual(50, len(data))
+        self.assertEqual('2015-01-01T00:00:00', data[0]['x'])
+        self.assertEqual(values[-1], data[-1]['y'])
+        # The peak shapes the line the most, so it is kept.
+        self.assertIn(100.0, [d['y'] for d in data])
+        self.assertEqual(sorted(d['x'] for d in data),
+                         [d['x'] for d in data])
+
+    def test_downsample_series_short_or_disabled(self):
+        values = [float(i) for i in range(10)]
+        series = metering.downsample_series(self._series(values),
+                                            max_points=50)
+        self.assertEqual(values, [d['y'] for d in series[0]['data']])
+        with self.settings(METERING_MAX_POINTS_PER_SERIES=0):
+            series = metering.downsample_series(self._series(values * 100))
+        self.assertEqual(1000, len(series[0]['data']))
+
+    def test_normalize_series_by_unit(self):
+        series = self._series([5 * 1024 * 1024, 1536 * 1024, 0], unit='B')
+        series = metering.normalize_series_by_unit(series)
+        self.assertEqual('MB', series[0]['unit'])
+        self.assertEqual([5, 1.5, 0], [d['y'] for d in series[0]['data']])
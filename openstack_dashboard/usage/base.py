@@ -51,9 +51,12 @@ class BaseUsage(object):
         return timezone.make_aware(end, timezone.utc)
 
     def get_instances(self):
-        instance_list = []
-        [instance_list.extend(u.server_usages) for u in self.usage_list]
-        return instance_list
+        return list(self.iter_instances())
+
+    def iter_instances(self):
+        for u in self.usage_list:
+            for instance in u.server_usages:
+                yield instance
 
     def get_date_range(self):
         if not hasattr(self, "start") or not hasattr(self, "end"):
@@ -13,7 +13,10 @@
 from collections import defaultdict
 import itertools
 import logging
+import uuid
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -59,6 +62,22 @@ NEUTRON_QUOTA_FIELDS = ("network",
 
 QUOTA_FIELDS = NOVA_QUOTA_FIELDS + CINDER_QUOTA_FIELDS + NEUTRON_QUOTA_FIELDS
 
+# Usage reported by the services themselves, as (quota, reported name) pairs:
+# the absolute limits of Nova and Cinder, and Neutron's quota details.
+NOVA_USAGE_LIMITS = (("instances", "totalInstancesUsed"),
+                     ("cores", "totalCoresUsed"),
+                     ("ram", "totalRAMUsed"),)
+
+CINDER_USAGE_LIMITS = (("volumes", "totalVolumesUsed"),
+                       ("snapshots", "totalSnapshotsUsed"),
+                       ("gigabytes", "totalGigabytesUsed"),)
+
+NEUTRON_USAGE_QUOTAS = (("floating_ips", "floatingip"),
+                        ("security_groups", "security_group"),
+                        ("networks", "network"),
+                        ("subnets", "subnet"),
+                        ("routers", "router"),)
+
 QUOTA_NAMES = {
     "metadata_items": _('Metadata Items'),
     "cores": _('VCPUs'),
@@ -258,7 +277,28 @@ def get_disabled_quotas(request):
     return disabled_quotas
 
 
+def _get_reported_usages(limits, usage_limits):
+    """Returns the usages found in ``limits``, or {} if any is missing."""
+    if all(name in limits for quota, name in usage_limits):
+        return dict((quota, limits[name]) for quota, name in usage_limits)
+    return {}
+
+
 def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
+    # The absolute limits describe the project the token is scoped to.
+    if tenant_id == request.user.project_id:
+        try:
+            limits = nova.tenant_absolute_limits(request, reserved=True)
+        except Exception:
+            limits = {}
+            LOG.exception("Unable to retrieve the compute usage from the "
+                          "absolute limits, counting instances instead.")
+        reported = _get_reported_usages(limits, NOVA_USAGE_LIMITS)
+        if reported:
+            for name, used in reported.items():
+                usages.tally(name, used)
+            return
+
     if tenant_id:
         # determine if the user has permission to view across projects
         # there are cases where an administrator wants to check the quotas
@@ -296,33 +336,56 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         usages.tally('ram', 0)
 
 
-def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
-    floating_ips = []
+def _get_neutron_usages(request, disabled_quotas, tenant_id):
+    if ('network' in disabled_quotas or
+            not neutron.is_extension_supported(request, 'quota_details')):
+        return {}
     try:
-        if network.floating_ip_supported(request):
-            floating_ips = network.tenant_floating_ip_list(request)
+        details = neutron.tenant_quota_detail_get(request, tenant_id)
     except Exception:
-        pass
-    usages.tally('floating_ips', len(floating_ips))
+        LOG.exception("Unable to retrieve the Neutron quota details, "
+                      "counting network resources instead.")
+        return {}
+    return dict((quota, details[name]['used'])
+                for quota, name in NEUTRON_USAGE_QUOTAS
+                if name in details and name not in disabled_quotas)
 
-    if 'security_group' not in disabled_quotas:
+
+def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
+    # Only list the resources Neutron doesn't report the usage of.
+    reported = _get_neutron_usages(request, disabled_quotas, tenant_id)
+    for name, used in reported.items():
+        usages.tally(name, used)
+
+    if 'floating_ips' not in reported:
+        floating_ips = []
+        try:
+            if network.floating_ip_supported(request):
+                floating_ips = network.tenant_floating_ip_list(request)
+        except Exception:
+            pass
+        usages.tally('floating_ips', len(floating_ips))
+
+    if ('security_group' not in disabled_quotas and
+            'security_groups' not in reported):
         security_groups = []
         security_groups = network.security_group_list(request)
         usages.tally('security_groups', len(security_groups))
 
-    if 'network' not in disabled_quotas:
+    if 'network' not in disabled_quotas and 'networks' not in reported:
         networks = []
-        networks = neutron.network_list(request, shared=False)
+        networks = neutron.network_list(request, shared=False,
+                                        expand_subnet=False)
         if tenant_id:
             networks = filter(lambda net: net.tenant_id == tenant_id, networks)
         usages.tally('networks', len(networks))
 
-    if 'subnet' not in disabled_quotas:
+    if 'subnet' not in disabled_quotas and 'subnets' not in reported:
         subnets = []
         subnets = neutron.subnet_list(request)
         usages.tally('subnets', len(subnets))
 
-    if 'router' not in disabled_quotas:
+    if 'router' not in disabled_quotas and 'routers' not in reported:
         routers = []
         routers = neutron.router_list(request)
         if tenant_id:
@@ -332,6 +395,19 @@ def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
 
 def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
     if 'volumes' not in disabled_quotas:
+        # The absolute limits describe the project the token is scoped to.
+        if tenant_id == request.user.project_id:
+            try:
+                limits = cinder.tenant_absolute_limits(request)
+            except Exception:
+                limits = {}
+                LOG.exception("Unable to retrieve the volume usage from the "
+                              "absolute limits, counting volumes instead.")
+            reported = _get_reported_usages(limits, CINDER_USAGE_LIMITS)
+            if reported:
+                for name, used in reported.items():
+                    usages.tally(name, used)
+                return
         try:
             if tenant_id:
                 opts = {'all_tenants': 1, 'project_id': tenant_id}
@@ -348,17 +424,58 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
             exceptions.handle(request, msg)
 
 
+def _tenant_quota_usages_generation_key(request, tenant_id):
+    return 'quotas:usages-generation:%s:%s' % (request.user.services_region,
+                                               tenant_id)
+
+
+def _tenant_quota_usages_cache_key(request, tenant_id):
+    # The generation is shared by every project scope the usage of
+    # tenant_id is cached under, so invalidating it reaches them all.
+    generation_key = _tenant_quota_usages_generation_key(request, tenant_id)
+    generation = cache.get(generation_key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(generation_key, generation, None):
+            generation = cache.get(generation_key, generation)
+    return 'quotas:usages:%s:%s:%s:%s' % (request.user.services_region,
+                                          request.user.project_id, tenant_id,
+                                          generation)
+
+
+def invalidate_tenant_quota_usages(request, tenant_id=None):
+    """Discard the cached usage of a project whose resources changed.
+
+    ``tenant_id`` defaults to the project the user is scoped to; admin
+    actions pass the project that owns the resource.
+    """
+    if not tenant_id:
+        tenant_id = request.user.project_id
+    cache.set(_tenant_quota_usages_generation_key(request, tenant_id),
+              uuid.uuid4().hex, None)
+
+
 @memoized
 def tenant_quota_usages(request, tenant_id=None):
     """Get our quotas and construct our usage object.
     If no tenant_id is provided, a the request.user.project_id
-    is assumed to be used
+    is assumed to be used.
+
+    The usages are also kept in the cache for
+    ``QUOTA_USAGE_CACHE_TIMEOUT`` seconds, so opening one form after another
+    doesn't count everything again.
     """
     if not tenant_id:
         tenant_id = request.user.project_id
 
-    disabled_quotas = get_disabled_quotas(request)
     usages = QuotaUsage()
+    cache_key = _tenant_quota_usages_cache_key(request, tenant_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        usages.usages.update(cached)
+        return usages
+
+    disabled_quotas = get_disabled_quotas(request)
 
     for quota in get_tenant_quota_data(request,
                                        disabled_quotas=disabled_quotas,
@@ -370,6 +487,9 @@ def tenant_quota_usages(request, tenant_id=None):
     _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
     _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
 
+    timeout = getattr(settings, 'QUOTA_USAGE_CACHE_TIMEOUT', 10)
+    if timeout:
+        cache.set(cache_key, dict(usages.usages), timeout)
     return usages
 
 
@@ -386,14 +506,22 @@ def tenant_limit_usages(request):
 
     if base.is_service_enabled(request, 'volume'):
         try:
-            limits.update(cinder.tenant_absolute_limits(request))
-            volumes = cinder.volume_list(request)
-            snapshots = cinder.volume_snapshot_list(request)
-            total_size = sum([getattr(volume, 'size', 0) for volume
-                              in volumes])
-            limits['gigabytesUsed'] = total_size
-            limits['volumesUsed'] = len(volumes)
-            limits['snapshotsUsed'] = len(snapshots)
+            cinder_limits = cinder.tenant_absolute_limits(request)
+            limits.update(cinder_limits)
+            reported = _get_reported_usages(cinder_limits,
+                                            CINDER_USAGE_LIMITS)
+            if reported:
+                limits['gigabytesUsed'] = reported['gigabytes']
+                limits['volumesUsed'] = reported['volumes']
+                limits['snapshotsUsed'] = reported['snapshots']
+            else:
+                volumes = cinder.volume_list(request)
+                snapshots = cinder.volume_snapshot_list(request)
+                total_size = sum([getattr(volume, 'size', 0) for volume
+                                  in volumes])
+                limits['gigabytesUsed'] = total_size
+                limits['volumesUsed'] = len(volumes)
+                limits['snapshotsUsed'] = len(snapshots)
         except cinder.ClientException:
             msg = _("Unable to retrieve volume limit information.")
             exceptions.handle(request, msg)
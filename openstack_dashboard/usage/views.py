@@ -41,6 +41,15 @@ class UsageView(tables.DataTableView):
             return "text/csv"
         return "text/html"
 
+    def get(self, request, *args, **kwargs):
+        if self.request.GET.get('format', 'html') != 'csv':
+            return super(UsageView, self).get(request, *args, **kwargs)
+        # The CSV renderers write their rows straight from the usage data,
+        # so don't wrap every instance in a table row first.
+        self.get_data()
+        context = self.get_context_data(**kwargs)
+        return self.render_to_response(context)
+
     def get_data(self):
         try:
             project_id = self.kwargs.get('project_id',
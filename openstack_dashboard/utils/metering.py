@@ -10,13 +10,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import calendar
+import collections
 import datetime
+import functools
 import logging
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 import pytz
 
+from horizon.utils import functions
+from horizon.utils import parallel
 from horizon.utils import units
 
 from openstack_dashboard import api
@@ -89,46 +96,191 @@ def calc_date_args(date_from, date_to, date_options):
     return date_from, date_to
 
 
-def get_resource_name(request, resource_id, resource_name, meter_name):
-    resource = None
-    try:
-        if resource_name == "resource_id":
-            meter_name = 'instance' if "instance" in meter_name else meter_name
-            api_type = METER_API_MAPPINGS.get(meter_name, '')
-            if api_type == 'nova':
-                resource = api.nova.server_get(request, resource_id)
-            elif api_type == 'glance':
-                resource = api.glance.image_get(request, resource_id)
+def _resource_api_type(meter_name):
+    meter_name = 'instance' if "instance" in meter_name else meter_name
+    return METER_API_MAPPINGS.get(meter_name, '')
+
+
+def _resource_name_key(api_type, resource_id):
+    return 'metering:resource_name:%s:%s' % (api_type, resource_id)
+
+
+def _get_resource(request, api_type, resource_id):
+    if api_type == 'nova':
+        return api.nova.server_get(request, resource_id)
+    return api.glance.image_get(request, resource_id)
 
-    except Exception:
-        LOG.info(_("Failed to get the resource name: %s"), resource_id,
-                 exc_info=True)
-    return resource.name if resource else resource_id
+
+def _list_resources(request, api_type):
+    if api_type == 'nova':
+        resources, has_more = api.nova.server_list(request, all_tenants=True)
+    else:
+        resources, has_more, has_prev = api.glance.image_list_detailed(
+            request)
+    return resources
+
+
+def get_resource_names(request, resources):
+    """Returns a dict mapping resource IDs to the names of the resources.
+
+    ``resources`` is a list of ``(resource_id, meter_name)`` tuples. The IDs
+    are grouped by the service their meter belongs to. When at least
+    ``METERING_RESOURCE_NAME_LIST_THRESHOLD`` names of a service aren't
+    cached, they are looked up with a single listing call; the resources
+    that listing did not find, or all of them when there are fewer, are
+    fetched one by one, concurrently. Names are cached for
+    ``METERING_RESOURCE_NAME_CACHE_TIMEOUT`` seconds. Resources whose name
+    cannot be found are left out.
+    """
+    timeout = getattr(settings, 'METERING_RESOURCE_NAME_CACHE_TIMEOUT', 300)
+    list_threshold = getattr(settings,
+                             'METERING_RESOURCE_NAME_LIST_THRESHOLD', 20)
+    by_api_type = collections.defaultdict(set)
+    for resource_id, meter_name in resources:
+        api_type = _resource_api_type(meter_name)
+        if api_type:
+            by_api_type[api_type].add(resource_id)
+
+    names = {}
+    for api_type, resource_ids in by_api_type.items():
+        found = {}
+        if timeout:
+            keys = dict((_resource_name_key(api_type, resource_id),
+                         resource_id) for resource_id in resource_ids)
+            for key, name in cache.get_many(list(keys)).items():
+                names[keys[key]] = name
+        missing = resource_ids.difference(names)
+
+        # Listing returns up to API_RESULT_LIMIT resources of the whole
+        # cloud, which only pays off over fetching many of them one by one.
+        if len(missing) >= list_threshold:
+            try:
+                for resource in _list_resources(request, api_type):
+                    if resource.id in missing:
+                        found[resource.id] = resource.name
+            except Exception:
+                LOG.info(_("Failed to list the resources of %s"), api_type,
+                         exc_info=True)
+            missing = missing.difference(found)
+
+        missing = list(missing)
+        get = functools.partial(_get_resource, request, api_type)
+        for resource_id, result in zip(missing,
+                                       parallel.map_parallel(get, missing)):
+            try:
+                found[resource_id] = result.get().name
+            except Exception:
+                LOG.info(_("Failed to get the resource name: %s"),
+                         resource_id, exc_info=True)
+
+        if timeout and found:
+            cache.set_many(dict((_resource_name_key(api_type, resource_id),
+                                 name) for resource_id, name in found.items()),
+                           timeout)
+        names.update(found)
+    return names
+
+
+def get_resource_name(request, resource_id, resource_name, meter_name):
+    if resource_name == "resource_id":
+        names = get_resource_names(request, [(resource_id, meter_name)])
+        return names.get(resource_id) or resource_id
+    return resource_id
 
 
 def series_for_meter(request, aggregates, group_by, meter_id,
                      meter_name, stats_name, unit, label=None):
     """Construct datapoint series for a meter from resource aggregates."""
     series = []
+    aggregates = [resource for resource in aggregates
+                  if resource.get_meter(meter_name)]
+    resource_name = 'id' if group_by == "project" else 'resource_id'
+    names = {}
+    if not label and resource_name == 'resource_id':
+        # Resolve the names of all the resources of the chart at once.
+        names = get_resource_names(
+            request, [(resource.resource_id, meter_name)
+                      for resource in aggregates])
     for resource in aggregates:
-        if resource.get_meter(meter_name):
-            if label:
-                name = label
-            else:
-                resource_name = ('id' if group_by == "project"
-                                 else 'resource_id')
-                resource_id = getattr(resource, resource_name)
-                name = get_resource_name(request, resource_id,
-                                         resource_name, meter_name)
-            point = {'unit': unit,
-                     'name': name,
-                     'meter': meter_id,
-                     'data': []}
-            for statistic in resource.get_meter(meter_name):
-                date = statistic.duration_end[:19]
-                value = float(getattr(statistic, stats_name))
-                point['data'].append({'x': date, 'y': value})
-            series.append(point)
+        if label:
+            name = label
+        else:
+            resource_id = getattr(resource, resource_name)
+            name = names.get(resource_id) or resource_id
+        point = {'unit': unit,
+                 'name': name,
+                 'meter': meter_id,
+                 'data': []}
+        for statistic in resource.get_meter(meter_name):
+            date = statistic.duration_end[:19]
+            value = float(getattr(statistic, stats_name))
+            point['data'].append({'x': date, 'y': value})
+        series.append(point)
+    return series
+
+
+def _point_time(point, default):
+    try:
+        date = datetime.datetime.strptime(point['x'], "%Y-%m-%dT%H:%M:%S")
+    except (TypeError, ValueError):
+        return default
+    return calendar.timegm(date.timetuple())
+
+
+def _largest_triangle_three_buckets(xs, ys, threshold):
+    """Returns the indexes of the points which best keep a line's shape.
+
+    The first and last points are always kept; every other point kept is
+    the one of its bucket which forms the largest triangle with the point
+    kept before it and the average of the next bucket.
+    """
+    length = len(xs)
+    if threshold >= length or threshold < 3:
+        return list(range(length))
+
+    every = float(length - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, length)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / float(count)
+        avg_y = sum(ys[next_start:next_end]) / float(count)
+
+        best, best_area = None, -1
+        for j in range(int(i * every) + 1, next_start):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) -
+                       (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(length - 1)
+    return kept
+
+
+def downsample_series(series, max_points=None):
+    """Reduce every series to at most ``max_points`` data points.
+
+    Charts can't show more points than they are wide anyway, so rather than
+    sending the browser every statistic Ceilometer returned, the points
+    which shape the line the most are picked with the
+    largest-triangle-three-buckets algorithm. ``max_points`` defaults to
+    the ``METERING_MAX_POINTS_PER_SERIES`` setting; 0 disables it.
+    """
+    if max_points is None:
+        max_points = getattr(settings, 'METERING_MAX_POINTS_PER_SERIES', 400)
+    if not max_points:
+        return series
+    for point in series:
+        data = point['data']
+        if len(data) <= max_points:
+            continue
+        xs = [_point_time(d, i) for i, d in enumerate(data)]
+        ys = [d['y'] for d in data]
+        kept = _largest_triangle_three_buckets(xs, ys, max_points)
+        point['data'] = [data[i] for i in kept]
     return series
 
 
@@ -152,15 +304,16 @@ def normalize_series_by_unit(series):
     unit = units.normalize(maximum, source_unit)[1]
 
     # If unit needs to be changed, set the new unit for all data points
-    # and convert all values to that unit
+    # and convert all values to that unit. The supported units only differ
+    # by a factor, so it is worked out once rather than for every value.
     if units.is_larger(unit, target_unit):
         target_unit = unit
-        for i, point in enumerate(series[:]):
+        factor = units.convert(1, source_unit, target_unit)[0]
+        for point in series:
             if point['unit'] != target_unit:
-                series[i]['unit'] = target_unit
-                for j, d in enumerate(point['data'][:]):
-                    series[i]['data'][j]['y'] = units.convert(
-                        d['y'], source_unit, target_unit, fmt=True)[0]
+                point['unit'] = target_unit
+                for d in point['data']:
+                    d['y'] = functions.format_value(d['y'] * factor)
 
     return series
 